@@ -81,13 +81,14 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
         response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
         response.headers["Cross-Origin-Opener-Policy"] = "same-origin-allow-popups"
-        # CSP: allow self + Supabase realtime/auth + jsdelivr CDN for Supabase JS client
+        # CSP: same-origin scripts and API calls (live sync is /api/stream),
+        # plus Google Fonts
         csp = (
             "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' https://cdn.jsdelivr.net; "
+            "script-src 'self' 'unsafe-inline'; "
             "style-src 'self' 'unsafe-inline' https://fonts.googleapis.com; "
             "font-src 'self' https://fonts.gstatic.com; "
-            "connect-src 'self' https://*.supabase.co wss://*.supabase.co; "
+            "connect-src 'self'; "
             "img-src 'self' data: blob:; "
             "manifest-src 'self'; "
             "worker-src 'self';"
@@ -100,18 +101,32 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 app.add_middleware(SecurityHeadersMiddleware)
 
+
+# State freshness header - how old the household state behind this response is
+class StateAgeMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        from state_manager import StateManager
+        meta = StateManager.track_request(request.headers.get("x-client-id"))
+        response = await call_next(request)
+        if "state_age" in meta:
+            response.headers["X-State-Age"] = str(int(meta["state_age"]))
+        return response
+
+
+app.add_middleware(StateAgeMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "X-Household-Id"],
-    expose_headers=["X-Household-Id"],
+    allow_headers=["Authorization", "Content-Type", "X-Household-Id", "If-None-Match", "X-Response-Mode", "X-Client-Id"],
+    expose_headers=["X-Household-Id", "X-State-Age", "ETag"],
 )
 
 # Import routes (deferred after middleware setup)
 try:
-    from routes import auth, pantry, recipes, meal_plans, shopping_list, alerts, settings, households
+    from routes import auth, pantry, recipes, meal_plans, shopping_list, alerts, settings, households, stream
 except Exception as exc:
     # Defensive: if route import fails, log the error but keep the startup trace clear for the logs.
     logger.exception("Failed to import routes at startup. Check that backend routes exist and imports succeed.")
@@ -126,6 +141,7 @@ app.include_router(shopping_list.router)
 app.include_router(alerts.router)
 app.include_router(settings.router)
 app.include_router(households.router)
+app.include_router(stream.router)
 
 # --- Static frontend serving ---
 # Resolve the project root (one level up from backend/)
@@ -163,38 +179,25 @@ async def service_worker():
     return FileResponse(str(FRONTEND_DIR / "service-worker.js"), media_type="application/javascript")
 
 
-@app.get("/api/realtime/config")
-async def realtime_config():
-    """Return Supabase project URL and anon key for frontend Realtime subscriptions."""
-    supabase_url = os.getenv("SUPABASE_URL", "")
-    anon_key = os.getenv("SUPABASE_ANON_KEY", "")
-    if not supabase_url or not anon_key:
-        return JSONResponse(
-            status_code=503,
-            content={"error": "Realtime not configured. Set SUPABASE_URL and SUPABASE_ANON_KEY."}
-        )
-    return {"supabase_url": supabase_url, "anon_key": anon_key}
-
-
 @app.get("/health")
 async def health():
     """Health check endpoint"""
-    from utils.supabase_client import supabase
-    import redis
+    from db import get_async_db
 
     health_status = {
         "status": "healthy",
         "version": "5.0.0",
-        "supabase": "unknown",
+        "database": "unknown",
         "redis": "unknown"
     }
 
-    # Check Supabase
+    # Check the database (any provider; an uncached single-row lookup)
     try:
-        supabase.table('households').select('id').limit(1).execute()
-        health_status["supabase"] = "connected"
+        db = await get_async_db()
+        await db.recipes.get_by_id('00000000-0000-0000-0000-000000000000')
+        health_status["database"] = "connected"
     except Exception as e:
-        health_status["supabase"] = f"error: {str(e)}"
+        health_status["database"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
 
     # Check Redis
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark the household cache codecs on a synthetic large household.
+
+Compares the old path (model_dump(mode='json') + stdlib json +
+model_validate) with every installed serializer, with and without zstd,
+using trusted from_cache() reconstruction.
+
+Usage (from backend/):
+    python benchmarks/bench_cache_codec.py [--items 5000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.pantry import PantryItem, PantryLocation
+from models.recipe import Recipe, RecipeIngredient
+from models.meal_plan import MealPlan
+from models.shopping import ShoppingItem
+from utils import cache_codec
+from utils.cache_codec import CacheCodec, available_serializers
+
+UNITS = ["each", "cup", "g", "kg", "lb", "oz", "ml", "tbsp", "tsp", "can"]
+CATEGORIES = ["Produce", "Dairy", "Meat", "Pantry", "Frozen", "Spices", "Other"]
+LOCATIONS = ["Pantry", "Fridge", "Freezer", "Cellar"]
+
+
+def build_household(n_items: int, seed: int = 42) -> dict:
+    """Synthetic household: n_items pantry items, n/5 recipes, n/10 meals, n/25 manual items."""
+    rng = random.Random(seed)
+    hid = "household-bench"
+    today = date.today()
+    names = [f"ingredient {i}" for i in range(n_items)]
+
+    pantry = [
+        PantryItem(
+            id=f"p{i}", household_id=hid, name=names[i],
+            category=rng.choice(CATEGORIES), unit=rng.choice(UNITS),
+            min_threshold=rng.choice([0, 0, 1, 2]),
+            preferred_store=rng.choice([None, "Costco", "Aldi"]),
+            locations=[
+                PantryLocation(
+                    id=f"p{i}-l{j}", location=rng.choice(LOCATIONS),
+                    quantity=round(rng.uniform(0, 10), 2),
+                    expiration_date=rng.choice([None, today + timedelta(days=rng.randint(-5, 60))])
+                )
+                for j in range(rng.randint(1, 3))
+            ]
+        )
+        for i in range(n_items)
+    ]
+    recipes = [
+        Recipe(
+            id=f"r{i}", household_id=hid, name=f"recipe {i}",
+            tags=rng.sample(["Quick", "Dinner", "Vegan", "Italian", "Soup"], 2),
+            instructions="1. Chop\n2. Cook\n3. Serve" * 5,
+            ingredients=[
+                RecipeIngredient(name=rng.choice(names), quantity=rng.randint(1, 4), unit=rng.choice(UNITS))
+                for _ in range(8)
+            ]
+        )
+        for i in range(max(1, n_items // 5))
+    ]
+    meals = [
+        MealPlan(id=f"m{i}", household_id=hid, date=today + timedelta(days=rng.randint(0, 30)),
+                 recipe_id=rng.choice(recipes).id, serving_multiplier=rng.choice([1, 1.5, 2]))
+        for i in range(max(1, n_items // 10))
+    ]
+    manual = [
+        ShoppingItem(id=f"s{i}", name=f"manual {i}", quantity=1, unit="each", category="Other",
+                     source="Manual", household_id=hid, checked=bool(i % 2),
+                     checked_at=datetime.now() if i % 2 else None)
+        for i in range(max(1, n_items // 25))
+    ]
+    return {"pantry": (PantryItem, pantry), "recipes": (Recipe, recipes),
+            "meals": (MealPlan, meals), "manual": (ShoppingItem, manual)}
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def bench_legacy(household: dict, repeat: int):
+    def encode():
+        return {seg: json.dumps({"version": 1, "items": [m.model_dump(mode='json') for m in items]}).encode()
+                for seg, (_, items) in household.items()}
+
+    encode_ms, blobs = best_of(repeat, encode)
+
+    def decode():
+        return {seg: [model.model_validate(item) for item in json.loads(blobs[seg])["items"]]
+                for seg, (model, _) in household.items()}
+
+    decode_ms, decoded = best_of(repeat, decode)
+    return encode_ms, decode_ms, sum(len(b) for b in blobs.values()), decoded
+
+
+def bench_codec(codec: CacheCodec, household: dict, repeat: int):
+    def encode():
+        return {seg: codec.encode({"version": 1, "items": [m.model_dump() for m in items]})
+                for seg, (_, items) in household.items()}
+
+    encode_ms, blobs = best_of(repeat, encode)
+
+    def decode():
+        return {seg: [model.from_cache(item) for item in codec.decode(blobs[seg])["items"]]
+                for seg, (model, _) in household.items()}
+
+    decode_ms, decoded = best_of(repeat, decode)
+    return encode_ms, decode_ms, sum(len(b) for b in blobs.values()), decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--items", type=int, default=5000, help="pantry items in the synthetic household")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    household = build_household(args.items)
+    counts = ", ".join(f"{len(items)} {seg}" for seg, (_, items) in household.items())
+    print(f"Household: {counts}\n")
+
+    codecs = []
+    for serializer in available_serializers().values():
+        codecs.append(CacheCodec(serializer))
+        if cache_codec.zstandard is not None:
+            codecs.append(CacheCodec(serializer, compress=True))
+
+    print(f"{'codec':<16}{'encode ms':>12}{'decode ms':>12}{'size KB':>12}")
+    rows = [("legacy json", bench_legacy(household, args.repeat))]
+    rows += [(codec.name, bench_codec(codec, household, args.repeat)) for codec in codecs]
+
+    for name, (encode_ms, decode_ms, size, decoded) in rows:
+        for seg, (_, items) in household.items():
+            assert decoded[seg] == items, f"{name}: {seg} did not round-trip"
+        print(f"{name:<16}{encode_ms:>12.1f}{decode_ms:>12.1f}{size / 1024:>12.0f}")
+
+    if cache_codec.zstandard is None:
+        print("\n(zstandard not installed - compressed variants skipped)")
+
+
+if __name__ == "__main__":
+    main()
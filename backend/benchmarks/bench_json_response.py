@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark response encoding for the state-backed GET endpoints.
+
+Compares, per view, what a request used to cost (model_dump every row,
+then FastAPI's jsonable_encoder + json.dumps) with the pre-encoded path:
+the first request after a write (collections encoded once with
+utils/json_response.py) and every request after that (memoized bytes).
+
+Usage (from backend/):
+    python benchmarks/bench_json_response.py [--pantry 2000] [--recipes 500] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+
+from models.pantry import PantryItem, PantryLocation
+from models.recipe import Recipe, RecipeIngredient
+from models.meal_plan import MealPlan
+from state_manager import HouseholdState
+from routes.pantry import _build_pantry
+from routes.recipes import _build_recipes
+from routes.meal_plans import _build_meal_plans
+from routes.shopping_list import _build_shopping_list
+from utils import json_response
+
+UNITS = ["each", "cup", "g", "lb", "oz", "tbsp", "tsp", "can"]
+
+
+def build_state(n_pantry: int, n_recipes: int, seed: int = 42) -> HouseholdState:
+    """Synthetic household: 1-3 locations per item, recipes of 6-12 pantry ingredients."""
+    rng = random.Random(seed)
+    hid = "household-bench"
+    keys = [(f"ingredient {i}", rng.choice(UNITS)) for i in range(n_pantry)]
+
+    pantry = [
+        PantryItem(
+            id=f"p{i}", household_id=hid, name=name, unit=unit, category="Pantry",
+            min_threshold=rng.randint(1, 5) if rng.random() < 0.33 else 0,
+            locations=[
+                PantryLocation(id=f"p{i}-l{j}", location=rng.choice(["Pantry", "Fridge", "Freezer"]),
+                               quantity=rng.randint(0, 6),
+                               expiration_date=date.today() + timedelta(days=rng.randint(-5, 60)))
+                for j in range(rng.randint(1, 3))
+            ]
+        )
+        for i, (name, unit) in enumerate(keys)
+    ]
+    recipes = [
+        Recipe(
+            id=f"r{i}", household_id=hid, name=f"recipe {i}", tags=["dinner"],
+            instructions="Mix everything and cook until done.",
+            ingredients=[
+                RecipeIngredient(name=name, unit=unit, quantity=rng.randint(1, 4))
+                for name, unit in rng.sample(keys, rng.randint(6, 12))
+            ]
+        )
+        for i in range(n_recipes)
+    ]
+    meals = [
+        MealPlan(id=f"m{i}", household_id=hid, date=date.today() + timedelta(days=rng.randint(0, 14)),
+                 recipe_id=rng.choice(recipes).id)
+        for i in range(max(1, n_recipes // 10))
+    ]
+    return HouseholdState(hid, pantry, recipes, meals)
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pantry", type=int, default=2000, help="pantry items in the synthetic household")
+    parser.add_argument("--recipes", type=int, default=500, help="recipes in the synthetic household")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    state = build_state(args.pantry, args.recipes)
+    state.shopping_list, state.reserved_ingredients, state.ready_to_cook_recipe_ids  # derive once
+    encoder = "orjson" if json_response.orjson is not None else "json"
+    print(f"Household: {len(state.pantry_items)} pantry items, {len(state.recipes)} recipes, "
+          f"{len(state.meal_plans)} meals, {len(state.shopping_list)} shopping lines ({encoder})\n")
+
+    def dumped(name):
+        return [row.model_dump() for row in getattr(state, name)]
+
+    views = {
+        'pantry': (_build_pantry, lambda: {
+            "pantry_items": dumped('pantry_items'), "shopping_list": dumped('shopping_list'),
+            "ready_recipes": state.ready_to_cook_recipe_ids, "pantry_health": state.get_pantry_health(),
+            "last_updated": state.last_updated.isoformat()}),
+        'recipes': (_build_recipes, lambda: {
+            "recipes": dumped('recipes'), "ready_to_cook": state.ready_to_cook_recipe_ids}),
+        'meal_plans': (_build_meal_plans, lambda: {
+            "meal_plans": dumped('meal_plans'), "reserved_ingredients": state.reserved_ingredients,
+            "shopping_list": dumped('shopping_list')}),
+        'shopping_list': (_build_shopping_list, lambda: {
+            "shopping_list": dumped('shopping_list'), "last_updated": state.last_updated.isoformat(),
+            "total_items": len(state.shopping_list),
+            "checked_items": sum(1 for item in state.shopping_list if item.checked),
+            "unchecked_items": sum(1 for item in state.shopping_list if not item.checked)}),
+    }
+
+    print(f"{'view':<16}{'KB':>8}{'dump+encode ms':>16}{'first ms':>10}{'memoized ms':>13}")
+    for name, (build, payload) in views.items():
+        def before():
+            return json.dumps(jsonable_encoder(payload())).encode()
+
+        def first():
+            state._views.clear()
+            state._encoded.clear()
+            return state.view(name, build)
+
+        def memoized():
+            return state.view(name, build)
+
+        before_ms, expected = best_of(args.repeat, before)
+        first_ms, body = best_of(args.repeat, first)
+        memo_ms, _ = best_of(args.repeat, memoized)
+        assert json.loads(body) == json.loads(expected), f"{name}: encoded payload differs"
+        print(f"{name:<16}{len(body) / 1024:>8.0f}{before_ms:>16.1f}{first_ms:>10.1f}{memo_ms:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
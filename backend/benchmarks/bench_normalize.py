@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the ingredient normalization hot path.
+
+Normalizes the (name, unit) of every pantry item and recipe ingredient in
+a synthetic household — what indexing a state does — three ways:
+
+    raw        the normalizers without their memo (the old per-call cost)
+    memoized   utils.normalize with its bounded LRU memo, warm
+    norm_key   the key precomputed on the models at ingest
+
+Usage (from backend/):
+    python benchmarks/bench_normalize.py [--pantry 2000] [--recipes 500] [--repeat 7]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.pantry import PantryItem
+from models.recipe import RecipeIngredient
+from utils import normalize
+
+UNITS = ["each", "cups", "Cup", "g", "lbs", "oz", "tbsp", "tsp", "cans", "cloves", "slices"]
+NAMES = ["chicken breasts", "tomatoes", "berries", "loaves", "eggs", "onion", "garlic",
+         "potatoes", "carrots", "grass-fed butter", "olive oil", "flour", "sugar", "limes"]
+
+
+def build_models(n_pantry: int, n_recipes: int, seed: int = 42):
+    """Pantry items and recipe ingredients drawn from a shared vocabulary."""
+    rng = random.Random(seed)
+    vocabulary = [f"{rng.choice(NAMES)} {i}" if i else rng.choice(NAMES) for i in range(n_pantry)]
+    pantry = [
+        PantryItem(id=f"p{i}", household_id="household-bench", name=name.title(),
+                   category="Pantry", unit=rng.choice(UNITS))
+        for i, name in enumerate(vocabulary)
+    ]
+    ingredients = [
+        RecipeIngredient(name=rng.choice(vocabulary), quantity=1, unit=rng.choice(UNITS))
+        for _ in range(n_recipes * 9)
+    ]
+    return pantry + ingredients
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pantry", type=int, default=2000, help="pantry items")
+    parser.add_argument("--recipes", type=int, default=500, help="recipes (9 ingredients each)")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    models = build_models(args.pantry, args.recipes)
+    raw_name = normalize.normalize_name.__wrapped__
+    raw_unit = normalize.normalize_unit.__wrapped__
+
+    def raw():
+        return [(raw_name(m.name), raw_unit(m.unit)) for m in models]
+
+    def memoized():
+        return [normalize.normalize_ingredient(m.name, m.unit) for m in models]
+
+    def precomputed():
+        return [m.norm_key for m in models]
+
+    raw_ms, raw_keys = best_of(args.repeat, raw)
+    memo_ms, memo_keys = best_of(args.repeat, memoized)
+    key_ms, model_keys = best_of(args.repeat, precomputed)
+    assert raw_keys == memo_keys == model_keys, "normalizers disagree"
+
+    print(f"{len(models)} keys ({len(set(raw_keys))} distinct)\n")
+    print(f"{'':<12}{'ms':>8}{'ns/key':>10}")
+    for label, ms in (("raw", raw_ms), ("memoized", memo_ms), ("norm_key", key_ms)):
+        print(f"{label:<12}{ms:>8.2f}{ms * 1e6 / len(models):>10.0f}")
+    print(f"\nmemo: {normalize.normalize_ingredient.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark ready-to-cook calculation: per-recipe Python loop vs the
+vectorized recipe × ingredient matrix (utils/ready_engine.py).
+
+Reports the matrix cost with and without building the matrix (it is
+rebuilt only when recipes change), and checks that both engines agree on
+the ready set and on per-recipe availability.
+
+Usage (from backend/):
+    python benchmarks/bench_ready_engine.py [--recipes 5000] [--repeat 5]
+
+Needs NumPy.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.pantry import PantryItem, PantryLocation
+from models.recipe import Recipe, RecipeIngredient
+from models.meal_plan import MealPlan
+from state_manager import HouseholdState
+from utils import ready_engine
+
+UNITS = ["each", "cup", "g", "lb", "oz", "tbsp", "tsp", "can"]
+
+
+def build_state(n_recipes: int, seed: int = 42) -> HouseholdState:
+    """Synthetic household: n_recipes recipes of 6-12 ingredients over n/2 distinct ingredients."""
+    rng = random.Random(seed)
+    hid = "household-bench"
+    n_ingredients = max(10, n_recipes // 2)
+    ingredients = [(f"ingredient {i}", rng.choice(UNITS)) for i in range(n_ingredients)]
+
+    pantry = [
+        PantryItem(
+            id=f"p{i}", household_id=hid, name=name, unit=unit, category="Pantry",
+            locations=[PantryLocation(id=f"p{i}-l0", location="Pantry", quantity=rng.randint(0, 8))]
+        )
+        for i, (name, unit) in enumerate(ingredients)
+        if rng.random() < 0.9
+    ]
+    recipes = [
+        Recipe(
+            id=f"r{i}", household_id=hid, name=f"recipe {i}",
+            ingredients=[
+                RecipeIngredient(name=name, unit=unit, quantity=rng.randint(1, 4))
+                for name, unit in rng.sample(ingredients, rng.randint(6, 12))
+            ]
+        )
+        for i in range(n_recipes)
+    ]
+    meals = [
+        MealPlan(id=f"m{i}", household_id=hid, date=date.today() + timedelta(days=rng.randint(0, 14)),
+                 recipe_id=rng.choice(recipes).id)
+        for i in range(max(1, n_recipes // 100))
+    ]
+    return HouseholdState(hid, pantry, recipes, meals)
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--recipes", type=int, default=5000, help="recipes in the synthetic household")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    if not ready_engine.available():
+        sys.exit("NumPy is not installed - nothing to compare")
+
+    state = build_state(args.recipes)
+    state.reserved_ingredients  # computed once, shared by both engines
+    print(f"Household: {len(state.recipes)} recipes, {len(state.pantry_items)} pantry items, "
+          f"{len(state.meal_plans)} meals\n")
+
+    def loop():
+        return [r.id for r in state.recipes if state._recipe_is_ready(r.id)]
+
+    def matrix_cold():
+        state._recipe_matrix = None
+        matrix = state._get_recipe_matrix()
+        return matrix.ready_ids(matrix.supply_vector(state._available_for_key))
+
+    def matrix_warm():
+        matrix = state._get_recipe_matrix()
+        return matrix.ready_ids(matrix.supply_vector(state._available_for_key))
+
+    loop_ms, loop_ready = best_of(args.repeat, loop)
+    cold_ms, cold_ready = best_of(args.repeat, matrix_cold)
+    warm_ms, warm_ready = best_of(args.repeat, matrix_warm)
+    assert loop_ready == cold_ready == warm_ready, "engines disagree on ready recipes"
+
+    print(f"{'ready-to-cook':<28}{'ms':>10}")
+    print(f"{'python loop':<28}{loop_ms:>10.1f}")
+    print(f"{'matrix (incl. build)':<28}{cold_ms:>10.1f}")
+    print(f"{'matrix (prebuilt)':<28}{warm_ms:>10.1f}")
+
+    # Availability: force each engine
+    original = ready_engine.VECTORIZE_MIN_RECIPES
+    ready_engine.VECTORIZE_MIN_RECIPES = len(state.recipes) + 1
+    loop_ms, loop_availability = best_of(args.repeat, state.get_recipe_availability)
+    ready_engine.VECTORIZE_MIN_RECIPES = original
+    warm_ms, matrix_availability = best_of(args.repeat, state.get_recipe_availability)
+    assert loop_availability == matrix_availability, "engines disagree on availability"
+
+    print(f"\n{'availability':<28}{'ms':>10}")
+    print(f"{'python loop':<28}{loop_ms:>10.1f}")
+    print(f"{'matrix (prebuilt)':<28}{warm_ms:>10.1f}")
+    print(f"\n{len(loop_ready)} ready recipes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark /api/recipes/search: linear substring scan vs the full-text
+index (utils/recipe_search.py) as the number of recipes grows.
+
+The scan is what the route used to do (lowercase substring match on the
+name for every recipe). The index is measured per query once built;
+StateManager builds it in the background when a state is cached, and
+that cost is reported separately. Broad queries hit a quarter of the
+synthetic recipes, so returning all of them follows the number of hits;
+a 20-result page only scores the best tiers. Selective ones match a
+handful of fixed recipes and show the lookup itself.
+
+Usage (from backend/):
+    python benchmarks/bench_recipe_search.py [--sizes 500,2000,8000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.recipe import Recipe
+from state_manager import HouseholdState
+
+WORDS = ("chicken beef pork tofu salmon shrimp rice noodle pasta soup stew curry salad "
+         "roast grilled baked spicy garlic lemon honey ginger tomato potato mushroom "
+         "spinach cheese taco burrito pancake waffle omelette chili lentil coconut").split()
+STEPS = "chop simmer stir bake whisk season fold sear drain serve marinate toss".split()
+TAGS = ["dinner", "lunch", "breakfast", "vegan", "quick", "comfort", "spicy", "dessert"]
+BROAD = ["chicken", "chick", "chiken", "spicy curry", "pan", "garlic lemon salmon"]
+SPECIALS = ["Saffron Seafood Paella", "Gochujang Glazed Wings", "Tamarind Date Chutney"]
+SELECTIVE = ["saffron", "paela", "gochu", "zzzz"]
+
+
+def build_state(n_recipes: int, seed: int = 42) -> HouseholdState:
+    """Synthetic household: names of 2-4 food words, a few sentences of instructions, plus SPECIALS."""
+    rng = random.Random(seed)
+    recipes = [
+        Recipe(
+            id=f"r{i}", household_id="household-bench",
+            name=" ".join(rng.sample(WORDS, rng.randint(2, 4))).title(),
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+            instructions=". ".join(
+                f"{rng.choice(STEPS)} the {rng.choice(WORDS)}" for _ in range(rng.randint(3, 10))
+            )
+        )
+        for i in range(n_recipes)
+    ]
+    recipes += [Recipe(id=f"special{i}", household_id="household-bench", name=name)
+                for i, name in enumerate(SPECIALS)]
+    return HouseholdState("household-bench", [], recipes, [])
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="500,2000,8000", help="comma-separated recipe counts")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'':>8}{'':>10}{'broad (ms/query)':>34}{'selective (ms/query)':>24}")
+    print(f"{'recipes':>8}{'build ms':>10}{'scan':>10}{'index':>10}{'top 20':>14}{'scan':>10}{'index':>14}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        state = build_state(size)
+
+        def scan(queries):
+            return [[r for r in state.recipes if q.lower() in r.name.lower()] for q in queries]
+
+        def build():
+            state._search_index = None
+            return state.search_index()
+
+        def search(queries, limit=None):
+            return [state.search_recipes(q, limit=limit) for q in queries]
+
+        build_ms, _ = best_of(args.repeat, build)
+        row = [build_ms]
+        for queries, paged in ((BROAD, True), (SELECTIVE, False)):
+            row.append(best_of(args.repeat, lambda: scan(queries))[0] / len(queries))
+            row.append(best_of(args.repeat, lambda: search(queries))[0] / len(queries))
+            if paged:
+                row.append(best_of(args.repeat, lambda: search(queries, limit=20))[0] / len(queries))
+        print(f"{size:>8}{row[0]:>10.1f}{row[1]:>10.3f}{row[2]:>10.3f}{row[3]:>14.3f}{row[4]:>10.3f}{row[5]:>14.3f}")
+
+    print(f"\nbroad: {', '.join(BROAD)}\nselective: {', '.join(SELECTIVE)}")
+
+
+if __name__ == "__main__":
+    main()
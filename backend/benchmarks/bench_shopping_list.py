@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shopping list builder as the household grows.
+
+Scales pantry items, recipes and planned meals together up to the target
+size (default 10k pantry items / 500 meals) and reports the full build
+time per size and per input row. A keyed builder should show a flat
+per-row cost, i.e. linear scaling. Also reports the incremental path
+(one pantry edit patching a single key).
+
+Usage (from backend/):
+    python benchmarks/bench_shopping_list.py [--pantry 10000] [--meals 500] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.pantry import PantryItem, PantryLocation
+from models.recipe import Recipe, RecipeIngredient
+from models.meal_plan import MealPlan
+from state_manager import HouseholdState
+
+UNITS = ["each", "cup", "g", "lb", "oz", "tbsp", "tsp", "can"]
+
+
+def build_state(n_pantry: int, n_meals: int, seed: int = 42) -> HouseholdState:
+    """Synthetic household: a third of the pantry has a threshold, recipes use 6-12 pantry keys."""
+    rng = random.Random(seed)
+    hid = "household-bench"
+    keys = [(f"ingredient {i}", rng.choice(UNITS)) for i in range(n_pantry)]
+
+    pantry = [
+        PantryItem(
+            id=f"p{i}", household_id=hid, name=name, unit=unit, category=rng.choice(["Pantry", "Dairy", "Produce"]),
+            min_threshold=rng.randint(1, 5) if rng.random() < 0.33 else 0,
+            locations=[PantryLocation(id=f"p{i}-l0", location="Pantry", quantity=rng.randint(0, 6))]
+        )
+        for i, (name, unit) in enumerate(keys)
+    ]
+    recipes = [
+        Recipe(
+            id=f"r{i}", household_id=hid, name=f"recipe {i}",
+            ingredients=[
+                RecipeIngredient(name=name, unit=unit, quantity=rng.randint(1, 4))
+                for name, unit in rng.sample(keys, rng.randint(6, 12))
+            ]
+        )
+        for i in range(max(1, n_meals // 2))
+    ]
+    meals = [
+        MealPlan(id=f"m{i}", household_id=hid, date=date.today() + timedelta(days=rng.randint(0, 28)),
+                 recipe_id=rng.choice(recipes).id, serving_multiplier=rng.choice([1, 1, 1.5, 2]))
+        for i in range(n_meals)
+    ]
+    return HouseholdState(hid, pantry, recipes, meals)
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pantry", type=int, default=10000, help="pantry items at the largest size")
+    parser.add_argument("--meals", type=int, default=500, help="planned meals at the largest size")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    print(f"{'pantry':>8}{'meals':>7}{'lines':>7}{'build ms':>10}{'us/row':>9}{'1 edit ms':>11}")
+    for fraction in (0.125, 0.25, 0.5, 1.0):
+        n_pantry, n_meals = int(args.pantry * fraction), max(1, int(args.meals * fraction))
+        state = build_state(n_pantry, n_meals)
+        state.reserved_ingredients  # shared input, not part of the builder
+
+        build_ms, shopping = best_of(args.repeat, state._calculate_shopping_list)
+        state._derived['shopping_list'] = shopping
+
+        item = state.pantry_items[0]
+        edit_ms, _ = best_of(args.repeat, lambda: state.apply_pantry_change(
+            item.model_copy(update={"min_threshold": item.min_threshold + 1})))
+
+        rows = n_pantry + n_meals
+        print(f"{n_pantry:>8}{n_meals:>7}{len(shopping):>7}{build_ms:>10.1f}"
+              f"{build_ms * 1000 / rows:>9.2f}{edit_ms:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
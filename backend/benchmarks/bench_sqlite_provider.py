@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedded SQLite provider (db/sqlite_provider.py) on a
+synthetic household, in a temporary database file:
+
+    load (batch)     get_household_rows(): all segments, one read transaction
+    load (threads)   the per-segment queries fanned out to threads, as
+                     StateManager does for providers that can't batch
+    membership       get_memberships(), the lookup behind every request
+    pantry write     create_item() + create_location()
+
+Usage (from backend/):
+    python benchmarks/bench_sqlite_provider.py [--pantry 500] [--recipes 200] [--repeat 7]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db.sqlite_provider import SqliteDatabase, SqliteDatabaseProvider
+
+SEGMENTS = ['pantry', 'recipes', 'meals', 'manual']
+UNITS = ["each", "cups", "g", "lbs", "oz", "tbsp", "tsp", "cans"]
+NAMES = ["chicken breasts", "tomatoes", "berries", "eggs", "onion", "garlic",
+         "potatoes", "carrots", "butter", "olive oil", "flour", "sugar", "limes"]
+
+
+def populate(db: SqliteDatabaseProvider, n_pantry: int, n_recipes: int, seed: int = 42):
+    """A household with pantry items (1-2 locations), recipes, meals and manual items."""
+    rng = random.Random(seed)
+    household_id = db.households.create({'name': 'Bench'})[0]['id']
+    user_id = str(uuid.uuid4())
+    db.households.add_member({'household_id': household_id, 'user_id': user_id, 'role': 'owner'})
+
+    for i in range(n_pantry):
+        item = db.pantry.create_item({
+            'household_id': household_id, 'name': f"{rng.choice(NAMES)} {i}",
+            'category': 'Pantry', 'unit': rng.choice(UNITS), 'min_threshold': rng.randint(0, 3)
+        })[0]
+        for location in rng.sample(["Pantry", "Fridge", "Freezer"], rng.randint(1, 2)):
+            db.pantry.create_location({
+                'pantry_item_id': item['id'], 'location_name': location,
+                'quantity': rng.randint(1, 10), 'expiration_date': (date.today() + timedelta(days=i % 30)).isoformat()
+            })
+
+    recipe_ids = []
+    for i in range(n_recipes):
+        ingredients = [{'name': rng.choice(NAMES), 'quantity': rng.randint(1, 4), 'unit': rng.choice(UNITS)}
+                       for _ in range(9)]
+        recipe_ids.append(db.recipes.create({
+            'household_id': household_id, 'name': f"Recipe {i}", 'ingredients': ingredients, 'tags': ['bench']
+        })[0]['id'])
+
+    for i in range(28):
+        db.meal_plans.create({
+            'household_id': household_id, 'recipe_id': rng.choice(recipe_ids),
+            'planned_date': (date.today() + timedelta(days=i - 7)).isoformat(), 'is_cooked': i < 7
+        })
+    for i in range(30):
+        db.shopping.create_manual_item({
+            'household_id': household_id, 'name': f"{rng.choice(NAMES)} extra {i}",
+            'quantity': 1, 'unit': rng.choice(UNITS), 'category': 'Other'
+        })
+    return household_id, user_id
+
+
+def best_of(repeat: int, fn):
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pantry", type=int, default=500, help="pantry items")
+    parser.add_argument("--recipes", type=int, default=200, help="recipes (9 ingredients each)")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = SqliteDatabaseProvider(SqliteDatabase(os.path.join(tmp, "bench.db")), secret="bench")
+        household_id, user_id = populate(db, args.pantry, args.recipes)
+        today = date.today().isoformat()
+
+        queries = {
+            'pantry': lambda: db.pantry.get_items_with_locations(household_id),
+            'recipes': lambda: db.recipes.get_all(household_id),
+            'meals': lambda: db.meal_plans.get_active(household_id, today),
+            'manual': lambda: db.shopping.get_manual_items(household_id),
+        }
+
+        def batch():
+            return db.get_household_rows(household_id, SEGMENTS, today)
+
+        def threads():
+            with ThreadPoolExecutor(max_workers=len(SEGMENTS)) as executor:
+                futures = {seg: executor.submit(queries[seg]) for seg in SEGMENTS}
+                return {seg: future.result() for seg, future in futures.items()}
+
+        batch_ms, batch_rows = best_of(args.repeat, batch)
+        thread_ms, thread_rows = best_of(args.repeat, threads)
+        assert {s: len(r) for s, r in batch_rows.items()} == {s: len(r) for s, r in thread_rows.items()}, \
+            "batch and per-segment loads disagree"
+
+        lookups = 1000
+        member_ms, _ = best_of(args.repeat, lambda: [db.households.get_memberships(user_id) for _ in range(lookups)])
+
+        writes = 100
+
+        def write():
+            for i in range(writes):
+                item = db.pantry.create_item({'household_id': household_id, 'name': f"write {i}", 'unit': 'each'})[0]
+                db.pantry.create_location({'pantry_item_id': item['id'], 'location_name': 'Pantry', 'quantity': 1})
+
+        write_ms, _ = best_of(args.repeat, write)
+
+    print(f"household: {', '.join(f'{len(r)} {s}' for s, r in batch_rows.items())}\n")
+    print(f"{'':<16}{'ms':>10}{'per op':>12}")
+    print(f"{'load (batch)':<16}{batch_ms:>10.2f}")
+    print(f"{'load (threads)':<16}{thread_ms:>10.2f}")
+    print(f"{'membership':<16}{member_ms:>10.2f}{member_ms * 1000 / lookups:>10.1f}µs")
+    print(f"{'pantry write':<16}{write_ms:>10.2f}{write_ms * 1000 / writes:>10.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
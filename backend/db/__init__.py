@@ -2,24 +2,91 @@
 Database Provider Factory - Peachy Pantry
 
 Swap database backends without changing any route or business logic code.
-Currently uses Supabase. Future: direct PostgreSQL, SQLite, etc.
+DB_PROVIDER picks the backend:
+    supabase   (default) PostgREST over HTTP via the Supabase client
+    postgres   direct asyncpg connection pool to DATABASE_URL
+               (db/postgres_provider.py; auth stays with Supabase)
+    sqlite     embedded database file at SQLITE_PATH, local auth
+               (db/sqlite_provider.py; no Supabase needed)
+
+Set DB_CACHE=on to put CachingDatabaseProvider (db/caching_provider.py)
+in front of the provider for the hot membership/settings lookups.
 """
 
+import os
+
 from db.provider import DatabaseProvider
+from db.async_provider import AsyncDatabaseProvider
 
 _provider = None
+_async_provider = None
+
+
+def db_cache_enabled() -> bool:
+    """True if DB_CACHE asks for the caching provider wrapper."""
+    return os.getenv("DB_CACHE", "off").lower() in ("1", "on", "true", "yes")
 
 
 def get_db() -> DatabaseProvider:
     """
     Get the database provider singleton.
 
-    Currently uses Supabase. To switch providers,
-    change the implementation here.
+    The backend comes from DB_PROVIDER (see module docstring).
     """
     global _provider
     if _provider is None:
-        from db.supabase_provider import SupabaseDatabaseProvider
+        from db.supabase_provider import SupabaseDatabaseProvider, SupabaseAuthProvider
         from utils.supabase_client import get_supabase
-        _provider = SupabaseDatabaseProvider(get_supabase())
+        backend = os.getenv("DB_PROVIDER", "supabase").lower()
+        if backend == "postgres":
+            from db.postgres_provider import PostgresDatabase, PostgresDatabaseProvider
+            _provider = PostgresDatabaseProvider(
+                PostgresDatabase.from_env(), auth=SupabaseAuthProvider(get_supabase())
+            )
+        elif backend == "sqlite":
+            from db.sqlite_provider import SqliteDatabase, SqliteDatabaseProvider
+            _provider = SqliteDatabaseProvider(
+                SqliteDatabase.from_env(), secret=os.getenv("JWT_SECRET_KEY")
+            )
+        elif backend == "supabase":
+            _provider = SupabaseDatabaseProvider(get_supabase())
+        else:
+            raise RuntimeError(f"Unknown DB_PROVIDER: {backend}")
+        if db_cache_enabled():
+            from db.caching_provider import CachingDatabaseProvider
+            _provider = CachingDatabaseProvider(_provider)
     return _provider
+
+
+async def get_async_db() -> AsyncDatabaseProvider:
+    """
+    Get the async database provider singleton (request hot path).
+
+    Follows get_db(): Supabase and Postgres get their native async clients,
+    any other provider is served through worker threads. The caching wrapper
+    is applied the same way: around the native client, or inherited from
+    the sync provider the threads call.
+    """
+    global _async_provider
+    if _async_provider is None:
+        from db.supabase_provider import SupabaseDatabaseProvider
+        from db.postgres_provider import PostgresDatabaseProvider
+        provider = get_db()
+        base = getattr(provider, 'wrapped', provider)
+        native = None
+        if isinstance(base, SupabaseDatabaseProvider):
+            from db.async_supabase_provider import AsyncSupabaseDatabaseProvider
+            from utils.supabase_client import get_async_supabase
+            native = AsyncSupabaseDatabaseProvider(await get_async_supabase())
+        elif isinstance(base, PostgresDatabaseProvider):
+            native = base.async_provider()
+
+        if native is not None:
+            _async_provider = native
+            if base is not provider:
+                from db.caching_provider import AsyncCachingDatabaseProvider
+                _async_provider = AsyncCachingDatabaseProvider(_async_provider)
+        else:
+            from db.threaded_provider import ThreadedAsyncDatabaseProvider
+            _async_provider = ThreadedAsyncDatabaseProvider(provider)
+    return _async_provider
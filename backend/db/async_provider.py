@@ -0,0 +1,323 @@
+"""
+Async Database Provider Interface - Peachy Pantry
+
+Async twin of db/provider.py for the request hot path: household state
+loads, state mutations and the per-request auth lookups. Route handlers
+are async, so these calls must not block the event loop.
+
+Method names, arguments and return shapes match the sync interface
+exactly (plain dicts/lists) — only `await` is added. Account management
+(sign-up, invites, settings) stays on the sync provider.
+
+Implementations:
+    AsyncSupabaseDatabaseProvider  (native async Supabase client)
+    ThreadedAsyncDatabaseProvider  (any sync DatabaseProvider, run in threads)
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+
+# ===== AUTH =====
+
+class AsyncAuthProvider(ABC):
+    """Per-request authentication lookups."""
+
+    @abstractmethod
+    async def get_user(self, token: str) -> dict:
+        """Validate token and get user info.
+        Returns: {"user": {"id", "email", "role"} | None}
+        """
+        ...
+
+
+# ===== PANTRY =====
+
+class AsyncPantryProvider(ABC):
+    """Pantry item and location operations."""
+
+    @abstractmethod
+    async def get_items_with_locations(self, household_id: str) -> List[dict]:
+        """Get all pantry items with nested pantry_locations."""
+        ...
+
+    @abstractmethod
+    async def get_item_units(self, household_id: str) -> List[dict]:
+        """Get units used in pantry items. Returns [{"unit": str}, ...]"""
+        ...
+
+    @abstractmethod
+    async def create_item(self, data: dict) -> List[dict]:
+        """Create a pantry item. Returns [created_row]."""
+        ...
+
+    @abstractmethod
+    async def update_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        """Update a pantry item by id + household scope."""
+        ...
+
+    @abstractmethod
+    async def delete_item(self, item_id: str, household_id: str) -> None:
+        """Delete a pantry item."""
+        ...
+
+    @abstractmethod
+    async def find_by_name_ilike(self, household_id: str, name: str) -> List[dict]:
+        """Case-insensitive name search with nested locations."""
+        ...
+
+    @abstractmethod
+    async def find_by_name_and_unit(self, household_id: str, name: str, unit: str) -> List[dict]:
+        """Case-insensitive name + exact unit. Returns [{"id": str}]."""
+        ...
+
+    @abstractmethod
+    async def create_location(self, data: dict) -> List[dict]:
+        """Create a pantry location entry."""
+        ...
+
+    @abstractmethod
+    async def update_location(self, location_id: str, data: dict) -> List[dict]:
+        """Update a pantry location."""
+        ...
+
+    @abstractmethod
+    async def delete_locations_for_item(self, item_id: str) -> None:
+        """Delete all locations for a pantry item."""
+        ...
+
+    @abstractmethod
+    async def get_locations(self, item_id: str, limit: Optional[int] = None) -> List[dict]:
+        """Get locations for a pantry item."""
+        ...
+
+    # --- Bulk writes (see PantryProvider; defaults loop over the single-row methods) ---
+
+    async def create_locations(self, rows: List[dict]) -> List[dict]:
+        """Create several pantry locations."""
+        created = []
+        for row in rows:
+            created.extend(await self.create_location(row))
+        return created
+
+    async def update_locations(self, rows: List[dict]) -> List[dict]:
+        """Update several pantry locations (full rows, same keys)."""
+        updated = []
+        for row in rows:
+            data = {k: v for k, v in row.items() if k != 'id'}
+            updated.extend(await self.update_location(row['id'], data))
+        return updated
+
+    async def upsert_items(self, rows: List[dict]) -> List[dict]:
+        """Insert or update pantry items by id."""
+        written = []
+        for row in rows:
+            data = {k: v for k, v in row.items() if k != 'id'}
+            written.extend(await self.update_item(row['id'], row['household_id'], data)
+                           or await self.create_item(row))
+        return written
+
+
+# ===== RECIPES =====
+
+class AsyncRecipeProvider(ABC):
+    """Recipe operations."""
+
+    @abstractmethod
+    async def get_all(self, household_id: str) -> List[dict]:
+        """Get all recipes for a household."""
+        ...
+
+    @abstractmethod
+    async def get_by_id(self, recipe_id: str) -> List[dict]:
+        """Get a recipe by ID."""
+        ...
+
+    @abstractmethod
+    async def get_ingredients_only(self, household_id: str) -> List[dict]:
+        """Get just ingredients field. Returns [{"ingredients": [...]}, ...]"""
+        ...
+
+    @abstractmethod
+    async def create(self, data: dict) -> List[dict]:
+        """Create a recipe."""
+        ...
+
+    @abstractmethod
+    async def update(self, recipe_id: str, household_id: str, data: dict) -> List[dict]:
+        """Update a recipe."""
+        ...
+
+    @abstractmethod
+    async def delete(self, recipe_id: str, household_id: str) -> None:
+        """Delete a recipe."""
+        ...
+
+
+# ===== MEAL PLANS =====
+
+class AsyncMealPlanProvider(ABC):
+    """Meal plan operations."""
+
+    @abstractmethod
+    async def get_upcoming(self, household_id: str, from_date: str) -> List[dict]:
+        """Get meal plans from date onwards."""
+        ...
+
+    @abstractmethod
+    async def get_active(self, household_id: str, from_date: str) -> List[dict]:
+        """Get upcoming meal plans + any past uncooked meals.
+
+        Past meals should remain visible and cookable until the user
+        explicitly marks them cooked or deletes them.
+        """
+        ...
+
+    @abstractmethod
+    async def get_by_id(self, meal_id: str, household_id: str) -> List[dict]:
+        """Get a specific meal plan."""
+        ...
+
+    @abstractmethod
+    async def create(self, data: dict) -> List[dict]:
+        """Create a meal plan."""
+        ...
+
+    @abstractmethod
+    async def update(self, meal_id: str, household_id: str, data: dict) -> List[dict]:
+        """Update a meal plan with household scope."""
+        ...
+
+    @abstractmethod
+    async def update_by_id(self, meal_id: str, data: dict) -> List[dict]:
+        """Update a meal plan by ID only (no household filter)."""
+        ...
+
+    @abstractmethod
+    async def delete(self, meal_id: str, household_id: str) -> None:
+        """Delete a meal plan."""
+        ...
+
+    # --- Bulk writes (defaults loop; override with multi-row requests) ---
+
+    async def create_many(self, rows: List[dict]) -> List[dict]:
+        """Create several meal plans."""
+        created = []
+        for row in rows:
+            created.extend(await self.create(row))
+        return created
+
+    async def delete_many(self, meal_ids: List[str], household_id: str) -> None:
+        """Delete several meal plans of a household."""
+        for meal_id in meal_ids:
+            await self.delete(meal_id, household_id)
+
+
+# ===== SHOPPING =====
+
+class AsyncShoppingProvider(ABC):
+    """Manual shopping list operations."""
+
+    @abstractmethod
+    async def get_manual_items(self, household_id: str) -> List[dict]:
+        """Get all manual shopping items."""
+        ...
+
+    @abstractmethod
+    async def create_manual_item(self, data: dict) -> List[dict]:
+        """Create a manual shopping item."""
+        ...
+
+    @abstractmethod
+    async def update_manual_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        """Update a manual shopping item."""
+        ...
+
+    @abstractmethod
+    async def delete_manual_item(self, item_id: str, household_id: str) -> None:
+        """Delete a manual shopping item."""
+        ...
+
+    @abstractmethod
+    async def delete_checked_items(self, household_id: str) -> None:
+        """Delete all checked manual items."""
+        ...
+
+    # --- Bulk writes (defaults loop; override with multi-row requests) ---
+
+    async def create_many(self, rows: List[dict]) -> List[dict]:
+        """Create several manual shopping items."""
+        created = []
+        for row in rows:
+            created.extend(await self.create_manual_item(row))
+        return created
+
+    async def delete_many(self, item_ids: List[str], household_id: str) -> None:
+        """Delete several manual shopping items of a household."""
+        for item_id in item_ids:
+            await self.delete_manual_item(item_id, household_id)
+
+
+# ===== HOUSEHOLDS =====
+
+class AsyncHouseholdProvider(ABC):
+    """Membership lookups made on every request."""
+
+    @abstractmethod
+    async def get_memberships(self, user_id: str, fields: str = 'household_id') -> List[dict]:
+        """Get all household memberships for a user."""
+        ...
+
+
+# ===== MAIN PROVIDER =====
+
+class AsyncDatabaseProvider(ABC):
+    """
+    Main async database provider interface.
+
+    Usage: db = await get_async_db(); await db.pantry.get_items_with_locations(hid)
+    """
+
+    @property
+    @abstractmethod
+    def auth(self) -> AsyncAuthProvider:
+        ...
+
+    @property
+    @abstractmethod
+    def pantry(self) -> AsyncPantryProvider:
+        ...
+
+    @property
+    @abstractmethod
+    def recipes(self) -> AsyncRecipeProvider:
+        ...
+
+    @property
+    @abstractmethod
+    def meal_plans(self) -> AsyncMealPlanProvider:
+        ...
+
+    @property
+    @abstractmethod
+    def shopping(self) -> AsyncShoppingProvider:
+        ...
+
+    @property
+    @abstractmethod
+    def households(self) -> AsyncHouseholdProvider:
+        ...
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Calls awaited inside the block share one database transaction (see
+        DatabaseProvider.transaction). Await them one at a time — don't
+        gather calls inside the block.
+        """
+        yield
+
+    async def get_household_rows(self, household_id: str, segments, from_date: str) -> Optional[dict]:
+        """Rows of several state segments in one round-trip, or None (see DatabaseProvider)."""
+        return None
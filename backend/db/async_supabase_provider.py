@@ -0,0 +1,372 @@
+"""
+Async Supabase Implementation of AsyncDatabaseProvider - Peachy Pantry
+
+Same queries as db/supabase_provider.py, issued through the async Supabase
+client (httpx under the hood) so a slow query only parks its own request.
+"""
+
+from typing import List, Optional
+
+from db.async_provider import (
+    AsyncDatabaseProvider, AsyncAuthProvider, AsyncPantryProvider, AsyncRecipeProvider,
+    AsyncMealPlanProvider, AsyncShoppingProvider, AsyncHouseholdProvider
+)
+
+
+# ===== AUTH =====
+
+class AsyncSupabaseAuthProvider(AsyncAuthProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_user(self, token: str) -> dict:
+        response = await self._client.auth.get_user(token)
+        if response and response.user:
+            user = response.user
+            return {
+                "user": {
+                    "id": user.id,
+                    "email": user.email,
+                    "role": user.role if hasattr(user, 'role') else None
+                }
+            }
+        return {"user": None}
+
+
+# ===== PANTRY =====
+
+class AsyncSupabasePantryProvider(AsyncPantryProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_items_with_locations(self, household_id: str) -> List[dict]:
+        resp = await self._client.table('pantry_items')\
+            .select('*, pantry_locations(*)')\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def get_item_units(self, household_id: str) -> List[dict]:
+        resp = await self._client.table('pantry_items')\
+            .select('name, unit')\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def create_item(self, data: dict) -> List[dict]:
+        resp = await self._client.table('pantry_items').insert(data).execute()
+        return resp.data
+
+    async def update_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('pantry_items').update(data)\
+            .eq('id', item_id)\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def delete_item(self, item_id: str, household_id: str) -> None:
+        await self._client.table('pantry_items')\
+            .delete()\
+            .eq('id', item_id)\
+            .eq('household_id', household_id)\
+            .execute()
+
+    async def find_by_name_ilike(self, household_id: str, name: str) -> List[dict]:
+        resp = await self._client.table('pantry_items')\
+            .select('*, pantry_locations(*)')\
+            .eq('household_id', household_id)\
+            .ilike('name', name)\
+            .execute()
+        return resp.data
+
+    async def find_by_name_and_unit(self, household_id: str, name: str, unit: str) -> List[dict]:
+        resp = await self._client.table('pantry_items')\
+            .select('id')\
+            .eq('household_id', household_id)\
+            .ilike('name', name)\
+            .eq('unit', unit)\
+            .execute()
+        return resp.data
+
+    async def create_location(self, data: dict) -> List[dict]:
+        resp = await self._client.table('pantry_locations').insert(data).execute()
+        return resp.data
+
+    async def update_location(self, location_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('pantry_locations')\
+            .update(data)\
+            .eq('id', location_id)\
+            .execute()
+        return resp.data
+
+    async def delete_locations_for_item(self, item_id: str) -> None:
+        await self._client.table('pantry_locations')\
+            .delete()\
+            .eq('pantry_item_id', item_id)\
+            .execute()
+
+    async def get_locations(self, item_id: str, limit: Optional[int] = None) -> List[dict]:
+        query = self._client.table('pantry_locations')\
+            .select('*')\
+            .eq('pantry_item_id', item_id)
+        if limit:
+            query = query.limit(limit)
+        return (await query.execute()).data
+
+    # --- Bulk writes: one multi-row request each ---
+
+    async def create_locations(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = await self._client.table('pantry_locations')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    async def update_locations(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        # Upsert on the primary key: PostgREST has no multi-row PATCH
+        resp = await self._client.table('pantry_locations')\
+            .upsert(rows, on_conflict='id')\
+            .execute()
+        return resp.data
+
+    async def upsert_items(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = await self._client.table('pantry_items')\
+            .upsert(rows, on_conflict='id', default_to_null=False)\
+            .execute()
+        return resp.data
+
+
+# ===== RECIPES =====
+
+class AsyncSupabaseRecipeProvider(AsyncRecipeProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_all(self, household_id: str) -> List[dict]:
+        resp = await self._client.table('recipes')\
+            .select('*')\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def get_by_id(self, recipe_id: str) -> List[dict]:
+        resp = await self._client.table('recipes')\
+            .select('*')\
+            .eq('id', recipe_id)\
+            .execute()
+        return resp.data
+
+    async def get_ingredients_only(self, household_id: str) -> List[dict]:
+        resp = await self._client.table('recipes')\
+            .select('ingredients')\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def create(self, data: dict) -> List[dict]:
+        resp = await self._client.table('recipes').insert(data).execute()
+        return resp.data
+
+    async def update(self, recipe_id: str, household_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('recipes').update(data)\
+            .eq('id', recipe_id)\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def delete(self, recipe_id: str, household_id: str) -> None:
+        await self._client.table('recipes')\
+            .delete()\
+            .eq('id', recipe_id)\
+            .eq('household_id', household_id)\
+            .execute()
+
+
+# ===== MEAL PLANS =====
+
+class AsyncSupabaseMealPlanProvider(AsyncMealPlanProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_upcoming(self, household_id: str, from_date: str) -> List[dict]:
+        resp = await self._client.table('meal_plans')\
+            .select('*')\
+            .eq('household_id', household_id)\
+            .gte('planned_date', from_date)\
+            .execute()
+        return resp.data
+
+    async def get_active(self, household_id: str, from_date: str) -> List[dict]:
+        resp = await self._client.table('meal_plans')\
+            .select('*')\
+            .eq('household_id', household_id)\
+            .or_(f'planned_date.gte.{from_date},is_cooked.eq.false')\
+            .execute()
+        return resp.data
+
+    async def get_by_id(self, meal_id: str, household_id: str) -> List[dict]:
+        resp = await self._client.table('meal_plans')\
+            .select('*')\
+            .eq('id', meal_id)\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def create(self, data: dict) -> List[dict]:
+        resp = await self._client.table('meal_plans').insert(data).execute()
+        return resp.data
+
+    async def update(self, meal_id: str, household_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('meal_plans').update(data)\
+            .eq('id', meal_id)\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def update_by_id(self, meal_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('meal_plans').update(data)\
+            .eq('id', meal_id)\
+            .execute()
+        return resp.data
+
+    async def delete(self, meal_id: str, household_id: str) -> None:
+        await self._client.table('meal_plans')\
+            .delete()\
+            .eq('id', meal_id)\
+            .eq('household_id', household_id)\
+            .execute()
+
+    # --- Bulk writes: one multi-row request each ---
+
+    async def create_many(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = await self._client.table('meal_plans')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    async def delete_many(self, meal_ids: List[str], household_id: str) -> None:
+        if not meal_ids:
+            return
+        await self._client.table('meal_plans')\
+            .delete()\
+            .in_('id', meal_ids)\
+            .eq('household_id', household_id)\
+            .execute()
+
+
+# ===== SHOPPING =====
+
+class AsyncSupabaseShoppingProvider(AsyncShoppingProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_manual_items(self, household_id: str) -> List[dict]:
+        resp = await self._client.table('shopping_list_manual')\
+            .select('*')\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def create_manual_item(self, data: dict) -> List[dict]:
+        resp = await self._client.table('shopping_list_manual').insert(data).execute()
+        return resp.data
+
+    async def update_manual_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        resp = await self._client.table('shopping_list_manual')\
+            .update(data)\
+            .eq('id', item_id)\
+            .eq('household_id', household_id)\
+            .execute()
+        return resp.data
+
+    async def delete_manual_item(self, item_id: str, household_id: str) -> None:
+        await self._client.table('shopping_list_manual')\
+            .delete()\
+            .eq('id', item_id)\
+            .eq('household_id', household_id)\
+            .execute()
+
+    async def delete_checked_items(self, household_id: str) -> None:
+        await self._client.table('shopping_list_manual')\
+            .delete()\
+            .eq('household_id', household_id)\
+            .eq('checked', True)\
+            .execute()
+
+    # --- Bulk writes: one multi-row request each ---
+
+    async def create_many(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = await self._client.table('shopping_list_manual')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    async def delete_many(self, item_ids: List[str], household_id: str) -> None:
+        if not item_ids:
+            return
+        await self._client.table('shopping_list_manual')\
+            .delete()\
+            .in_('id', item_ids)\
+            .eq('household_id', household_id)\
+            .execute()
+
+
+# ===== HOUSEHOLDS =====
+
+class AsyncSupabaseHouseholdProvider(AsyncHouseholdProvider):
+    def __init__(self, client):
+        self._client = client
+
+    async def get_memberships(self, user_id: str, fields: str = 'household_id') -> List[dict]:
+        resp = await self._client.table('household_members')\
+            .select(fields)\
+            .eq('user_id', user_id)\
+            .execute()
+        return resp.data
+
+
+# ===== MAIN PROVIDER =====
+
+class AsyncSupabaseDatabaseProvider(AsyncDatabaseProvider):
+    """Async Supabase implementation — request hot path only."""
+
+    def __init__(self, client):
+        self._auth = AsyncSupabaseAuthProvider(client)
+        self._pantry = AsyncSupabasePantryProvider(client)
+        self._recipes = AsyncSupabaseRecipeProvider(client)
+        self._meal_plans = AsyncSupabaseMealPlanProvider(client)
+        self._shopping = AsyncSupabaseShoppingProvider(client)
+        self._households = AsyncSupabaseHouseholdProvider(client)
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @property
+    def pantry(self):
+        return self._pantry
+
+    @property
+    def recipes(self):
+        return self._recipes
+
+    @property
+    def meal_plans(self):
+        return self._meal_plans
+
+    @property
+    def shopping(self):
+        return self._shopping
+
+    @property
+    def households(self):
+        return self._households
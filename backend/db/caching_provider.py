@@ -0,0 +1,493 @@
+"""
+Caching Database Provider - Peachy Pantry
+
+Wraps any DatabaseProvider (or AsyncDatabaseProvider) and caches the
+read-mostly lookups made on nearly every request: memberships, household
+settings, household names and members, the active invite.
+
+Every cached read is filed under a tag — the user or household it is
+about. The write methods that can change it (add_member, remove_member,
+settings.update, ...) give the tag a new generation, and entries read
+under an older generation are misses from then on. Entries live in
+Redis, one hash per tag shared by all workers, and in a small in-process
+layer trusted for LOCAL_TTL seconds: a write on another worker is seen
+here after at most that long.
+
+Enabled with DB_CACHE=on (see get_db()). Everything not listed in
+CACHED_READS / INVALIDATING_WRITES passes straight through.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from db.async_provider import AsyncDatabaseProvider
+from db.provider import DatabaseProvider
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# How long an in-process entry is served without asking Redis
+LOCAL_TTL = 5
+# Tags kept in-process (least recently used are dropped first)
+LOCAL_MAX_TAGS = 4096
+# Idle lifetime of a tag's Redis hash; longer than any read TTL
+HASH_TTL = 3600
+
+GEN_FIELD = b"gen"
+
+
+class CachedRead:
+    """
+    Caching rule for one read method.
+
+    Args:
+        ttl: Seconds an entry is served
+        tag: Bound arguments -> tag the entry is filed under
+        ignore: Arguments left out of the cache key
+        still_valid: (result, arguments) -> False to treat an entry as a miss
+    """
+
+    def __init__(self, ttl: int, tag: Callable[[dict], str], ignore: Tuple[str, ...] = (),
+                 still_valid: Optional[Callable[[list, dict], bool]] = None):
+        self.ttl = ttl
+        self.tag = tag
+        self.ignore = ignore
+        self.still_valid = still_valid
+
+
+def _invite_unexpired(result: list, arguments: dict) -> bool:
+    """get_active_invite is keyed without now_iso; drop entries whose invite has expired since."""
+    now = _parse_time(arguments['now_iso'])
+    return all(_parse_time(invite['expires_at']) > now for invite in result if invite.get('expires_at'))
+
+
+def _parse_time(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _user(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def _household(household_id) -> str:
+    return f"household:{household_id}"
+
+
+def _settings(household_id) -> str:
+    return f"settings:{household_id}"
+
+
+# domain -> read method -> rule
+CACHED_READS = {
+    'households': {
+        'get_memberships': CachedRead(300, lambda a: _user(a['user_id'])),
+        'get_first_membership': CachedRead(300, lambda a: _user(a['user_id'])),
+        'get_members': CachedRead(300, lambda a: _household(a['household_id'])),
+        'check_membership': CachedRead(300, lambda a: _household(a['household_id'])),
+        'check_membership_with_role': CachedRead(300, lambda a: _household(a['household_id'])),
+        'get_by_id_single': CachedRead(600, lambda a: _household(a['household_id'])),
+        # Several households per call: one tag for all names
+        'get_by_ids': CachedRead(600, lambda a: "households"),
+        # Invites are used by code, not by household: one tag for all invites
+        'get_active_invite': CachedRead(60, lambda a: "invites", ignore=('now_iso',),
+                                        still_valid=_invite_unexpired),
+    },
+    'settings': {
+        'get': CachedRead(300, lambda a: _settings(a['household_id'])),
+    },
+}
+
+# domain -> write method -> bound arguments -> tags it invalidates
+INVALIDATING_WRITES = {
+    'households': {
+        'add_member': lambda a: [_user(a['data']['user_id']), _household(a['data']['household_id'])],
+        'remove_member': lambda a: [_user(a['user_id']), _household(a['household_id'])],
+        'update_name': lambda a: [_household(a['household_id']), "households"],
+        'create_invite': lambda a: ["invites"],
+        'mark_invite_used': lambda a: ["invites"],
+    },
+    'settings': {
+        'create': lambda a: [_settings(a['data']['household_id'])],
+        'update': lambda a: [_settings(a['household_id'])],
+    },
+}
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def _loads(raw: bytes):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _hash_key(tag: str) -> str:
+    return f"db_cache:{tag}"
+
+
+def _new_generation() -> bytes:
+    return uuid.uuid4().hex.encode()
+
+
+def _redis():
+    # Clients live in state_manager, which imports db — look them up at call time
+    import state_manager
+    return state_manager.redis_client
+
+
+def _async_redis():
+    import state_manager
+    return state_manager.async_redis_client
+
+
+class DatabaseCache:
+    """Two-level tag-generation cache shared by the sync and async wrappers."""
+
+    def __init__(self):
+        # tag -> {call key: (served until, encoded result)}
+        self._local: "OrderedDict[str, dict]" = OrderedDict()
+        # tag -> local invalidation count (guards stores racing a write)
+        self._epochs = {}
+        self._lock = threading.Lock()
+
+    # --- in-process layer ---
+
+    def _local_get(self, tag: str, key: str):
+        with self._lock:
+            entries = self._local.get(tag)
+            entry = entries.get(key) if entries else None
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del entries[key]
+                return None
+            self._local.move_to_end(tag)
+            return entry[1]
+
+    def _local_put(self, tag: str, key: str, epoch: int, until: float, raw: bytes):
+        with self._lock:
+            if self._epochs.get(tag, 0) != epoch:
+                return  # invalidated while we were loading
+            self._local.setdefault(tag, {})[key] = (until, raw)
+            self._local.move_to_end(tag)
+            while len(self._local) > LOCAL_MAX_TAGS:
+                self._local.popitem(last=False)
+
+    def _local_invalidate(self, tags: List[str]):
+        with self._lock:
+            for tag in tags:
+                self._local.pop(tag, None)
+                self._epochs[tag] = self._epochs.get(tag, 0) + 1
+
+    def _epoch(self, tag: str) -> int:
+        with self._lock:
+            return self._epochs.get(tag, 0)
+
+    def clear(self):
+        """Drop the in-process layer (Redis entries age out on their own)."""
+        with self._lock:
+            self._local.clear()
+            self._epochs.clear()
+
+    @staticmethod
+    def _decode_shared(raw: Optional[bytes], gen: Optional[bytes]):
+        """(expires_at, result) of a Redis entry if it is current, else None."""
+        if raw is None or gen is None:
+            return None
+        entry_gen, expires_at, result = _loads(raw)
+        if entry_gen != gen.decode() or expires_at <= time.time():
+            return None
+        return expires_at, result
+
+    @staticmethod
+    def _encode_shared(gen: bytes, expires_at: float, result) -> bytes:
+        return _dumps([gen.decode(), expires_at, result])
+
+    # --- reads ---
+
+    def read(self, tag: str, key: str, rule: CachedRead, arguments: dict, load: Callable):
+        """Cached result of load() for (tag, key)."""
+        raw = self._local_get(tag, key)
+        if raw is not None:
+            result = _loads(raw)
+            if rule.still_valid is None or rule.still_valid(result, arguments):
+                return result
+
+        epoch = self._epoch(tag)
+        redis = _redis()
+        gen = None
+        if redis is not None:
+            try:
+                hash_key = _hash_key(tag)
+                gen, raw = redis.hmget(hash_key, [GEN_FIELD, key])
+                shared = self._decode_shared(raw, gen)
+                if shared is not None and (rule.still_valid is None or rule.still_valid(shared[1], arguments)):
+                    self._local_put(tag, key, epoch, min(shared[0], time.time() + LOCAL_TTL), _dumps(shared[1]))
+                    return shared[1]
+                if gen is None:
+                    redis.hsetnx(hash_key, GEN_FIELD, _new_generation())
+                    gen = redis.hget(hash_key, GEN_FIELD)
+            except Exception as e:
+                logger.warning(f"DB cache read error: {e}")
+                redis = None
+
+        result = load()
+
+        expires_at = time.time() + rule.ttl
+        if redis is not None and gen is not None:
+            try:
+                with redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(_hash_key(tag), key, self._encode_shared(gen, expires_at, result))
+                    pipe.expire(_hash_key(tag), HASH_TTL)
+                    pipe.execute()
+            except Exception as e:
+                logger.warning(f"DB cache write error: {e}")
+            until = min(expires_at, time.time() + LOCAL_TTL)
+        else:
+            until = expires_at
+        self._local_put(tag, key, epoch, until, _dumps(result))
+        return result
+
+    async def aread(self, tag: str, key: str, rule: CachedRead, arguments: dict, load: Callable):
+        """Async read(); load is a coroutine function."""
+        raw = self._local_get(tag, key)
+        if raw is not None:
+            result = _loads(raw)
+            if rule.still_valid is None or rule.still_valid(result, arguments):
+                return result
+
+        epoch = self._epoch(tag)
+        redis = _async_redis()
+        gen = None
+        if redis is not None:
+            try:
+                hash_key = _hash_key(tag)
+                gen, raw = await redis.hmget(hash_key, [GEN_FIELD, key])
+                shared = self._decode_shared(raw, gen)
+                if shared is not None and (rule.still_valid is None or rule.still_valid(shared[1], arguments)):
+                    self._local_put(tag, key, epoch, min(shared[0], time.time() + LOCAL_TTL), _dumps(shared[1]))
+                    return shared[1]
+                if gen is None:
+                    await redis.hsetnx(hash_key, GEN_FIELD, _new_generation())
+                    gen = await redis.hget(hash_key, GEN_FIELD)
+            except Exception as e:
+                logger.warning(f"DB cache read error: {e}")
+                redis = None
+
+        result = await load()
+
+        expires_at = time.time() + rule.ttl
+        if redis is not None and gen is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(_hash_key(tag), key, self._encode_shared(gen, expires_at, result))
+                    pipe.expire(_hash_key(tag), HASH_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"DB cache write error: {e}")
+            until = min(expires_at, time.time() + LOCAL_TTL)
+        else:
+            until = expires_at
+        self._local_put(tag, key, epoch, until, _dumps(result))
+        return result
+
+    # --- invalidation ---
+
+    def invalidate(self, tags: List[str]):
+        """New generation for each tag: every entry filed under it becomes a miss."""
+        self._local_invalidate(tags)
+        redis = _redis()
+        if redis is None:
+            return
+        try:
+            with redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.hset(_hash_key(tag), GEN_FIELD, _new_generation())
+                    pipe.expire(_hash_key(tag), HASH_TTL)
+                pipe.execute()
+        except Exception as e:
+            logger.warning(f"DB cache invalidate error: {e}")
+
+    async def ainvalidate(self, tags: List[str]):
+        """Async invalidate()."""
+        self._local_invalidate(tags)
+        redis = _async_redis()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.hset(_hash_key(tag), GEN_FIELD, _new_generation())
+                    pipe.expire(_hash_key(tag), HASH_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"DB cache invalidate error: {e}")
+
+
+db_cache = DatabaseCache()
+
+
+class _CachingDomain:
+    """Wraps one domain provider (db.households, db.settings...) with the rules for its name."""
+
+    def __init__(self, domain, name: str):
+        self._domain = domain
+        self._reads = CACHED_READS.get(name, {})
+        self._writes = INVALIDATING_WRITES.get(name, {})
+        self._name = name
+
+    def __getattr__(self, name):
+        method = getattr(self._domain, name)
+        rule = self._reads.get(name)
+        tags_of = self._writes.get(name)
+        if rule is None and tags_of is None:
+            return method
+
+        signature = inspect.signature(method)
+        is_async = asyncio.iscoroutinefunction(method)
+        prefix = f"{self._name}.{name}:"
+
+        def bind(args, kwargs) -> dict:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return bound.arguments
+
+        def call_key(arguments: dict) -> str:
+            keyed = {k: v for k, v in arguments.items() if k not in rule.ignore}
+            return prefix + json.dumps(keyed, sort_keys=True, default=str)
+
+        if rule is not None and is_async:
+            async def wrapper(*args, **kwargs):
+                arguments = bind(args, kwargs)
+                return await db_cache.aread(rule.tag(arguments), call_key(arguments), rule, arguments,
+                                            lambda: method(*args, **kwargs))
+        elif rule is not None:
+            def wrapper(*args, **kwargs):
+                arguments = bind(args, kwargs)
+                return db_cache.read(rule.tag(arguments), call_key(arguments), rule, arguments,
+                                     lambda: method(*args, **kwargs))
+        elif is_async:
+            async def wrapper(*args, **kwargs):
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    await db_cache.ainvalidate(tags_of(bind(args, kwargs)))
+        else:
+            def wrapper(*args, **kwargs):
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    db_cache.invalidate(tags_of(bind(args, kwargs)))
+
+        wrapper.__name__ = name
+        # Build each wrapper once; later lookups find it on the instance
+        setattr(self, name, wrapper)
+        return wrapper
+
+
+class CachingDatabaseProvider(DatabaseProvider):
+    """DatabaseProvider that caches hot lookups of another provider."""
+
+    def __init__(self, provider: DatabaseProvider):
+        self.wrapped = provider
+        self._auth = _CachingDomain(provider.auth, 'auth')
+        self._pantry = _CachingDomain(provider.pantry, 'pantry')
+        self._recipes = _CachingDomain(provider.recipes, 'recipes')
+        self._meal_plans = _CachingDomain(provider.meal_plans, 'meal_plans')
+        self._shopping = _CachingDomain(provider.shopping, 'shopping')
+        self._settings = _CachingDomain(provider.settings, 'settings')
+        self._households = _CachingDomain(provider.households, 'households')
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @property
+    def pantry(self):
+        return self._pantry
+
+    @property
+    def recipes(self):
+        return self._recipes
+
+    @property
+    def meal_plans(self):
+        return self._meal_plans
+
+    @property
+    def shopping(self):
+        return self._shopping
+
+    @property
+    def settings(self):
+        return self._settings
+
+    @property
+    def households(self):
+        return self._households
+
+    def transaction(self):
+        return self.wrapped.transaction()
+
+    def get_household_rows(self, household_id: str, segments, from_date: str):
+        # State reads have their own cache (StateManager); nothing cached here
+        return self.wrapped.get_household_rows(household_id, segments, from_date)
+
+
+class AsyncCachingDatabaseProvider(AsyncDatabaseProvider):
+    """AsyncDatabaseProvider that caches hot lookups (same cache as the sync wrapper)."""
+
+    def __init__(self, provider: AsyncDatabaseProvider):
+        self.wrapped = provider
+        self._auth = _CachingDomain(provider.auth, 'auth')
+        self._pantry = _CachingDomain(provider.pantry, 'pantry')
+        self._recipes = _CachingDomain(provider.recipes, 'recipes')
+        self._meal_plans = _CachingDomain(provider.meal_plans, 'meal_plans')
+        self._shopping = _CachingDomain(provider.shopping, 'shopping')
+        self._households = _CachingDomain(provider.households, 'households')
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @property
+    def pantry(self):
+        return self._pantry
+
+    @property
+    def recipes(self):
+        return self._recipes
+
+    @property
+    def meal_plans(self):
+        return self._meal_plans
+
+    @property
+    def shopping(self):
+        return self._shopping
+
+    @property
+    def households(self):
+        return self._households
+
+    def transaction(self):
+        return self.wrapped.transaction()
+
+    async def get_household_rows(self, household_id: str, segments, from_date: str):
+        return await self.wrapped.get_household_rows(household_id, segments, from_date)
@@ -2,12 +2,14 @@
 Database Provider Interface - Peachy Pantry
 
 Abstract interface for all database operations.
-Implementations: SupabaseDatabaseProvider (current), PostgresDatabaseProvider (future).
+Implementations: SupabaseDatabaseProvider (default), PostgresDatabaseProvider,
+SqliteDatabaseProvider (see db/__init__.py).
 
 All data methods return plain dicts/lists — no ORM-specific objects leak through.
 """
 
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from typing import List, Optional
 
 
@@ -124,6 +126,38 @@ class PantryProvider(ABC):
         """Get locations for a pantry item."""
         ...
 
+    # --- Bulk writes: one request each. The defaults loop over the single-row
+    # methods; override in implementations that support multi-row writes. ---
+
+    def create_locations(self, rows: List[dict]) -> List[dict]:
+        """Create several pantry locations. Returns the created rows."""
+        created = []
+        for row in rows:
+            created.extend(self.create_location(row))
+        return created
+
+    def update_locations(self, rows: List[dict]) -> List[dict]:
+        """Update several pantry locations.
+        Each row is a full location ({"id", "pantry_item_id", "location_name",
+        ...changed fields}), all rows with the same keys. Returns the updated rows.
+        """
+        updated = []
+        for row in rows:
+            data = {k: v for k, v in row.items() if k != 'id'}
+            updated.extend(self.update_location(row['id'], data))
+        return updated
+
+    def upsert_items(self, rows: List[dict]) -> List[dict]:
+        """Insert or update pantry items by id (callers set ids for new items).
+        Each row needs "id", "household_id" and "name"; all rows the same keys.
+        Returns the written rows.
+        """
+        written = []
+        for row in rows:
+            data = {k: v for k, v in row.items() if k != 'id'}
+            written.extend(self.update_item(row['id'], row['household_id'], data) or self.create_item(row))
+        return written
+
 
 # ===== RECIPES =====
 
@@ -205,6 +239,20 @@ class MealPlanProvider(ABC):
         """Delete a meal plan."""
         ...
 
+    # --- Bulk writes (defaults loop; override with multi-row requests) ---
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        """Create several meal plans. Returns the created rows."""
+        created = []
+        for row in rows:
+            created.extend(self.create(row))
+        return created
+
+    def delete_many(self, meal_ids: List[str], household_id: str) -> None:
+        """Delete several meal plans of a household."""
+        for meal_id in meal_ids:
+            self.delete(meal_id, household_id)
+
 
 # ===== SHOPPING =====
 
@@ -236,6 +284,20 @@ class ShoppingProvider(ABC):
         """Delete all checked manual items."""
         ...
 
+    # --- Bulk writes (defaults loop; override with multi-row requests) ---
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        """Create several manual shopping items. Returns the created rows."""
+        created = []
+        for row in rows:
+            created.extend(self.create_manual_item(row))
+        return created
+
+    def delete_many(self, item_ids: List[str], household_id: str) -> None:
+        """Delete several manual shopping items of a household."""
+        for item_id in item_ids:
+            self.delete_manual_item(item_id, household_id)
+
 
 # ===== SETTINGS =====
 
@@ -389,3 +451,25 @@ class DatabaseProvider(ABC):
     @abstractmethod
     def households(self) -> HouseholdProvider:
         ...
+
+    @contextmanager
+    def transaction(self):
+        """
+        Calls made inside the block share one database transaction: all
+        committed when it ends, none if it raises. Nested blocks join the
+        outer one.
+
+        The default suits backends without multi-statement transactions
+        (PostgREST): each call still commits on its own. Override where
+        the database supports them.
+        """
+        yield
+
+    def get_household_rows(self, household_id: str, segments, from_date: str) -> Optional[dict]:
+        """Rows of several state segments in one round-trip.
+        Returns: {segment: rows} for the requested segments ('pantry',
+        'recipes', 'meals', 'manual'), or None if the backend can't batch
+        them — callers then run the per-segment queries.
+        Override in implementations that support batch loads.
+        """
+        return None
@@ -0,0 +1,819 @@
+"""
+SQLite Implementation of DatabaseProvider - Peachy Pantry
+
+Embedded database for single-node installs, local development and
+benchmarks: no network round-trips and no external services. Select it
+with DB_PROVIDER=sqlite; the file is SQLITE_PATH (default
+peachy_pantry.db), created with its schema on first use.
+
+- WAL journal: readers never wait for the writer
+- One connection per thread, opened on first use and kept for the
+  thread's lifetime (async routes reach it through the threaded adapter,
+  whose worker threads are long-lived)
+- json/jsonb columns are JSON1 text (checked with json_valid); pantry
+  locations are nested into their items with json_group_array, in the
+  same query, as PostgREST embeds them
+- Names use NOCASE collation, so the ILIKE lookups are index range scans
+  on (household_id, name)
+
+Rows come back shaped like the Supabase provider's: ids and timestamps as
+strings, booleans as bool, JSON columns decoded.
+
+Auth is local as well: passwords are scrypt-hashed, access tokens are
+HS256 JWTs signed with JWT_SECRET_KEY (or a secret generated into the
+database file), refresh tokens rotate on use.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from jose import jwt, JWTError
+
+from db.provider import (
+    DatabaseProvider, AuthProvider, PantryProvider, RecipeProvider,
+    MealPlanProvider, ShoppingProvider, SettingsProvider, HouseholdProvider
+)
+
+logger = logging.getLogger(__name__)
+
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_NOW = "(strftime('%Y-%m-%dT%H:%M:%f+00:00', 'now'))"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS households (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW},
+    created_by TEXT
+);
+
+CREATE TABLE IF NOT EXISTS household_members (
+    id TEXT PRIMARY KEY,
+    household_id TEXT REFERENCES households(id) ON DELETE CASCADE,
+    user_id TEXT,
+    role TEXT DEFAULT 'member',
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS household_invites (
+    id TEXT PRIMARY KEY,
+    household_id TEXT REFERENCES households(id) ON DELETE CASCADE,
+    code TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    created_at TEXT DEFAULT {_NOW},
+    created_by TEXT,
+    used_at TEXT,
+    used_by TEXT,
+    role TEXT DEFAULT 'member'
+);
+
+CREATE TABLE IF NOT EXISTS household_settings (
+    id TEXT PRIMARY KEY,
+    household_id TEXT NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+    locations TEXT DEFAULT '["Pantry", "Refrigerator", "Freezer", "Cabinet", "Counter"]'
+        CHECK (json_valid(locations)),
+    categories TEXT DEFAULT '["Meat", "Dairy", "Produce", "Pantry", "Frozen", "Spices", "Beverages", "Snacks", "Other"]'
+        CHECK (json_valid(categories)),
+    category_emojis TEXT DEFAULT '{{}}' CHECK (json_valid(category_emojis)),
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS pantry_items (
+    id TEXT PRIMARY KEY,
+    household_id TEXT REFERENCES households(id) ON DELETE CASCADE,
+    created_by TEXT,
+    name TEXT NOT NULL COLLATE NOCASE,
+    category TEXT DEFAULT 'pantry',
+    quantity NUMERIC DEFAULT 1,
+    unit TEXT DEFAULT '',
+    expiration_date TEXT,
+    notes TEXT,
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW},
+    item_category TEXT,
+    reserved_quantity NUMERIC DEFAULT 0,
+    min_threshold NUMERIC DEFAULT 0,
+    preferred_store TEXT
+);
+
+CREATE TABLE IF NOT EXISTS pantry_locations (
+    id TEXT PRIMARY KEY,
+    pantry_item_id TEXT NOT NULL REFERENCES pantry_items(id) ON DELETE CASCADE,
+    location_name TEXT NOT NULL,
+    quantity NUMERIC NOT NULL DEFAULT 0,
+    expiration_date TEXT,
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS recipes (
+    id TEXT PRIMARY KEY,
+    household_id TEXT REFERENCES households(id) ON DELETE CASCADE,
+    created_by TEXT,
+    name TEXT NOT NULL COLLATE NOCASE,
+    servings INTEGER DEFAULT 4,
+    category TEXT,
+    image_url TEXT,
+    photo TEXT,
+    instructions TEXT,
+    ingredients TEXT DEFAULT '[]' CHECK (json_valid(ingredients)),
+    tags TEXT DEFAULT '[]' CHECK (json_valid(tags)),
+    favorite INTEGER DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS meal_plans (
+    id TEXT PRIMARY KEY,
+    household_id TEXT REFERENCES households(id) ON DELETE CASCADE,
+    week TEXT,
+    day_of_week TEXT,
+    recipe_ids TEXT DEFAULT '[]' CHECK (json_valid(recipe_ids)),
+    planned_date TEXT,
+    created_at TEXT DEFAULT {_NOW},
+    updated_at TEXT DEFAULT {_NOW},
+    meal_type TEXT,
+    is_cooked INTEGER DEFAULT 0,
+    recipe_id TEXT REFERENCES recipes(id) ON DELETE SET NULL,
+    serving_multiplier NUMERIC DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS shopping_list_manual (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    household_id TEXT NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    quantity NUMERIC DEFAULT 1,
+    unit TEXT,
+    category TEXT DEFAULT 'Other',
+    checked INTEGER DEFAULT 0,
+    checked_at TEXT,
+    checked_by TEXT,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS auth_users (
+    id TEXT PRIMARY KEY,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    password_hash TEXT NOT NULL,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS auth_refresh_tokens (
+    token TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES auth_users(id) ON DELETE CASCADE,
+    session_id TEXT NOT NULL,
+    revoked INTEGER DEFAULT 0,
+    created_at TEXT DEFAULT {_NOW}
+);
+
+CREATE TABLE IF NOT EXISTS app_secrets (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_household_members_user ON household_members (user_id);
+CREATE INDEX IF NOT EXISTS idx_household_members_household ON household_members (household_id, user_id);
+CREATE INDEX IF NOT EXISTS idx_household_settings_household ON household_settings (household_id);
+CREATE INDEX IF NOT EXISTS idx_household_invites_code ON household_invites (code);
+CREATE INDEX IF NOT EXISTS idx_household_invites_household ON household_invites (household_id);
+CREATE INDEX IF NOT EXISTS idx_pantry_items_household_name ON pantry_items (household_id, name);
+CREATE INDEX IF NOT EXISTS idx_pantry_locations_item ON pantry_locations (pantry_item_id);
+CREATE INDEX IF NOT EXISTS idx_recipes_household ON recipes (household_id);
+CREATE INDEX IF NOT EXISTS idx_meal_plans_household_date ON meal_plans (household_id, planned_date);
+CREATE INDEX IF NOT EXISTS idx_shopping_list_manual_household ON shopping_list_manual (household_id, name);
+CREATE INDEX IF NOT EXISTS idx_auth_refresh_tokens_user ON auth_refresh_tokens (user_id);
+"""
+
+# Columns stored as JSON text / 0-1 integers, decoded on the way out
+_JSON_COLUMNS = {
+    'locations', 'categories', 'category_emojis', 'ingredients', 'tags',
+    'recipe_ids', 'pantry_locations'
+}
+_BOOL_COLUMNS = {'favorite', 'is_cooked', 'checked'}
+
+# Tables whose id is a text uuid generated here (shopping ids are integers)
+_UUID_TABLES = {
+    'households', 'household_members', 'household_invites', 'household_settings',
+    'pantry_items', 'pantry_locations', 'recipes', 'meal_plans'
+}
+
+
+# ===== ROW SHAPING =====
+
+def _encode(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _row(cursor, values) -> dict:
+    row = {}
+    for (name, *_), value in zip(cursor.description, values):
+        if value is not None:
+            if name in _JSON_COLUMNS:
+                value = json.loads(value)
+            elif name in _BOOL_COLUMNS:
+                value = bool(value)
+        row[name] = value
+    return row
+
+
+def _columns(fields: str) -> str:
+    """A select list in PostgREST's plain form ('*' or 'a, b') -> SQL."""
+    if fields.strip() == '*':
+        return '*'
+    return ', '.join(_quote(name.strip()) for name in fields.split(','))
+
+
+def _quote(name: str) -> str:
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid column name: {name!r}")
+    return f'"{name}"'
+
+
+# ===== CONNECTIONS =====
+
+class SqliteDatabase:
+    """A database file, one connection per thread, plus the statement builders every domain shares."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    @classmethod
+    def from_env(cls) -> "SqliteDatabase":
+        return cls(os.getenv("SQLITE_PATH", "peachy_pantry.db"))
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (opened and configured on first use)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit: every statement is its own transaction unless snapshot() opens one
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=5.0)
+            conn.row_factory = _row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA busy_timeout = 5000")
+            self._ensure_schema(conn)
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        if self._schema_ready:
+            return
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+                logger.info(f"🗄️ SQLite database ready at {self.path}")
+
+    def close(self):
+        """Close the calling thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @contextmanager
+    def snapshot(self):
+        """Run the enclosed reads in one transaction (one consistent view of the file)."""
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        finally:
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def transaction(self):
+        """Run the enclosed writes in one write transaction (one commit, all or nothing)."""
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    # --- execution ---
+
+    def fetch(self, sql: str, *args) -> List[dict]:
+        return self.connection().execute(sql, [_encode(a) for a in args]).fetchall()
+
+    def execute(self, sql: str, *args) -> None:
+        self.connection().execute(sql, [_encode(a) for a in args])
+
+    # --- statements ---
+
+    def select(self, table: str, where: dict, fields: str = '*', suffix: str = '') -> List[dict]:
+        conditions = ' AND '.join(f"{_quote(col)} = ?" for col in where)
+        return self.fetch(f"SELECT {_columns(fields)} FROM {table} WHERE {conditions} {suffix}",
+                          *where.values())
+
+    def insert(self, table: str, data: dict) -> List[dict]:
+        if table in _UUID_TABLES and 'id' not in data:
+            data = {'id': str(uuid.uuid4()), **data}
+        columns = ', '.join(_quote(col) for col in data)
+        values = ', '.join('?' for _ in data)
+        return self.fetch(f"INSERT INTO {table} ({columns}) VALUES ({values}) RETURNING *",
+                          *data.values())
+
+    def update(self, table: str, data: dict, where: dict) -> List[dict]:
+        assignments = ', '.join(f"{_quote(col)} = ?" for col in data)
+        conditions = ' AND '.join(f"{_quote(col)} = ?" for col in where)
+        return self.fetch(f"UPDATE {table} SET {assignments} WHERE {conditions} RETURNING *",
+                          *data.values(), *where.values())
+
+    def delete(self, table: str, where: dict) -> None:
+        conditions = ' AND '.join(f"{_quote(col)} = ?" for col in where)
+        self.execute(f"DELETE FROM {table} WHERE {conditions}", *where.values())
+
+    def insert_many(self, table: str, rows: List[dict], conflict_update: bool = False) -> List[dict]:
+        """
+        Insert rows in one transaction. SQLite's VALUES has no DEFAULT, so
+        rows with different keys can't share a statement; with no network
+        in between, one statement per row under a single commit is the
+        cheap part. With conflict_update, rows whose id exists update the
+        given columns instead (PostgREST's upsert).
+        """
+        result = []
+        with self.transaction():
+            for data in rows:
+                if table in _UUID_TABLES and 'id' not in data:
+                    data = {'id': str(uuid.uuid4()), **data}
+                columns = ', '.join(_quote(col) for col in data)
+                values = ', '.join('?' for _ in data)
+                sql = f"INSERT INTO {table} ({columns}) VALUES ({values})"
+                if conflict_update:
+                    assignments = ', '.join(f"{_quote(col)} = excluded.{_quote(col)}" for col in data if col != 'id')
+                    sql += f" ON CONFLICT (id) DO UPDATE SET {assignments}"
+                result.extend(self.fetch(sql + " RETURNING *", *data.values()))
+        return result
+
+    def delete_many(self, table: str, ids: list, household_id: str) -> None:
+        if ids:
+            placeholders = ', '.join('?' for _ in ids)
+            self.execute(f"DELETE FROM {table} WHERE id IN ({placeholders}) AND household_id = ?",
+                         *ids, household_id)
+
+
+# ===== AUTH =====
+
+ACCESS_TOKEN_TTL = 3600
+JWT_AUDIENCE = "authenticated"
+JWT_ISSUER = "peachy-pantry"
+
+
+def _hash_password(password: str) -> str:
+    salt = secrets.token_bytes(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=2 ** 14, r=8, p=1)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+
+def _check_password(password: str, stored: str) -> bool:
+    try:
+        _, salt, digest = stored.split('$')
+    except ValueError:
+        return False
+    candidate = hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), n=2 ** 14, r=8, p=1)
+    return hmac.compare_digest(candidate.hex(), digest)
+
+
+class SqliteAuthProvider(AuthProvider):
+    def __init__(self, db: SqliteDatabase, secret: Optional[str] = None):
+        self._db = db
+        self._secret = secret
+
+    def _signing_secret(self) -> str:
+        """JWT_SECRET_KEY, else one generated once and kept in the database file."""
+        if self._secret is None:
+            self._db.execute("INSERT OR IGNORE INTO app_secrets (name, value) VALUES ('jwt_secret', ?)",
+                             secrets.token_hex(32))
+            self._secret = self._db.select('app_secrets', {'name': 'jwt_secret'}, 'value')[0]['value']
+        return self._secret
+
+    def _new_session(self, user: dict, session_id: Optional[str] = None) -> dict:
+        session_id = session_id or str(uuid.uuid4())
+        now = int(time.time())
+        access_token = jwt.encode({
+            "sub": user['id'],
+            "email": user['email'],
+            "role": "authenticated",
+            "aud": JWT_AUDIENCE,
+            "iss": JWT_ISSUER,
+            "iat": now,
+            "exp": now + ACCESS_TOKEN_TTL,
+            "session_id": session_id,
+        }, self._signing_secret(), algorithm="HS256")
+        refresh_token = secrets.token_urlsafe(32)
+        self._db.insert('auth_refresh_tokens', {
+            'token': refresh_token, 'user_id': user['id'], 'session_id': session_id
+        })
+        return {
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "expires_in": ACCESS_TOKEN_TTL,
+            "expires_at": now + ACCESS_TOKEN_TTL,
+            "token_type": "bearer",
+            "user": user,
+        }
+
+    def sign_up(self, email: str, password: str) -> dict:
+        if self._db.select('auth_users', {'email': email}, 'id'):
+            raise ValueError("User already registered")
+        rows = self._db.insert('auth_users', {
+            'id': str(uuid.uuid4()), 'email': email, 'password_hash': _hash_password(password)
+        })
+        user = {"id": rows[0]['id'], "email": rows[0]['email']}
+        return {"user": user, "session": self._new_session(user)}
+
+    def sign_in_with_password(self, email: str, password: str) -> dict:
+        rows = self._db.select('auth_users', {'email': email})
+        if not rows or not _check_password(password, rows[0]['password_hash']):
+            return {"user": None, "session": None}
+        user = {"id": rows[0]['id'], "email": rows[0]['email']}
+        return {"user": user, "session": self._new_session(user)}
+
+    def sign_out(self) -> None:
+        # Sessions belong to the caller's tokens; nothing is held here
+        pass
+
+    def refresh_session(self, refresh_token: str) -> dict:
+        rows = self._db.fetch(
+            "UPDATE auth_refresh_tokens SET revoked = 1 WHERE token = ? AND revoked = 0"
+            " RETURNING user_id, session_id",
+            refresh_token
+        )
+        if not rows:
+            return {"session": None}
+        users = self._db.select('auth_users', {'id': rows[0]['user_id']}, 'id, email')
+        if not users:
+            return {"session": None}
+        session = self._new_session(users[0], rows[0]['session_id'])
+        return {"session": session, "user": users[0]}
+
+    def get_user(self, token: str) -> dict:
+        try:
+            claims = jwt.decode(token, self._signing_secret(), algorithms=["HS256"],
+                                audience=JWT_AUDIENCE, issuer=JWT_ISSUER)
+        except JWTError:
+            return {"user": None}
+        users = self._db.select('auth_users', {'id': claims.get('sub')}, 'id, email')
+        if not users:
+            return {"user": None}
+        return {"user": {**users[0], "role": claims.get('role')}}
+
+    def get_user_email(self, user_id: str) -> Optional[str]:
+        rows = self._db.select('auth_users', {'id': user_id}, 'email')
+        return rows[0]['email'] if rows else None
+
+    def get_user_emails(self, user_ids: List[str]) -> dict:
+        if not user_ids:
+            return {}
+        placeholders = ', '.join('?' for _ in user_ids)
+        rows = self._db.fetch(f"SELECT id, email FROM auth_users WHERE id IN ({placeholders})", *user_ids)
+        emails = {row['id']: row['email'] for row in rows}
+        return {uid: emails.get(uid) for uid in user_ids}
+
+
+# ===== PANTRY =====
+
+# Pantry items with their locations nested as PostgREST embeds them
+_PANTRY_WITH_LOCATIONS = """
+    SELECT p.*, (
+        SELECT json_group_array(json_object(
+            'id', l.id, 'pantry_item_id', l.pantry_item_id, 'location_name', l.location_name,
+            'quantity', l.quantity, 'expiration_date', l.expiration_date,
+            'created_at', l.created_at, 'updated_at', l.updated_at
+        ))
+        FROM pantry_locations l WHERE l.pantry_item_id = p.id
+    ) AS pantry_locations
+    FROM pantry_items p
+"""
+
+
+class SqlitePantryProvider(PantryProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    def get_items_with_locations(self, household_id: str) -> List[dict]:
+        return self._db.fetch(_PANTRY_WITH_LOCATIONS + " WHERE p.household_id = ?", household_id)
+
+    def get_item_units(self, household_id: str) -> List[dict]:
+        return self._db.select('pantry_items', {'household_id': household_id}, 'name, unit')
+
+    def create_item(self, data: dict) -> List[dict]:
+        return self._db.insert('pantry_items', data)
+
+    def update_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        return self._db.update('pantry_items', data, {'id': item_id, 'household_id': household_id})
+
+    def delete_item(self, item_id: str, household_id: str) -> None:
+        self._db.delete('pantry_items', {'id': item_id, 'household_id': household_id})
+
+    def find_by_name_ilike(self, household_id: str, name: str) -> List[dict]:
+        # LIKE on a NOCASE column: case-insensitive, and served by the index
+        return self._db.fetch(
+            _PANTRY_WITH_LOCATIONS + " WHERE p.household_id = ? AND p.name LIKE ?", household_id, name
+        )
+
+    def find_by_name_and_unit(self, household_id: str, name: str, unit: str) -> List[dict]:
+        return self._db.fetch(
+            "SELECT id FROM pantry_items WHERE household_id = ? AND name LIKE ? AND unit = ?",
+            household_id, name, unit
+        )
+
+    def create_location(self, data: dict) -> List[dict]:
+        return self._db.insert('pantry_locations', data)
+
+    def update_location(self, location_id: str, data: dict) -> List[dict]:
+        return self._db.update('pantry_locations', data, {'id': location_id})
+
+    def delete_locations_for_item(self, item_id: str) -> None:
+        self._db.delete('pantry_locations', {'pantry_item_id': item_id})
+
+    def get_locations(self, item_id: str, limit: Optional[int] = None) -> List[dict]:
+        if limit:
+            return self._db.fetch("SELECT * FROM pantry_locations WHERE pantry_item_id = ? LIMIT ?",
+                                  item_id, limit)
+        return self._db.select('pantry_locations', {'pantry_item_id': item_id})
+
+    def create_locations(self, rows: List[dict]) -> List[dict]:
+        return self._db.insert_many('pantry_locations', rows)
+
+    def update_locations(self, rows: List[dict]) -> List[dict]:
+        return self._db.insert_many('pantry_locations', rows, conflict_update=True)
+
+    def upsert_items(self, rows: List[dict]) -> List[dict]:
+        return self._db.insert_many('pantry_items', rows, conflict_update=True)
+
+
+# ===== RECIPES =====
+
+class SqliteRecipeProvider(RecipeProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    def get_all(self, household_id: str) -> List[dict]:
+        return self._db.select('recipes', {'household_id': household_id})
+
+    def get_by_id(self, recipe_id: str) -> List[dict]:
+        return self._db.select('recipes', {'id': recipe_id})
+
+    def get_ingredients_only(self, household_id: str) -> List[dict]:
+        return self._db.select('recipes', {'household_id': household_id}, 'ingredients')
+
+    def create(self, data: dict) -> List[dict]:
+        return self._db.insert('recipes', data)
+
+    def update(self, recipe_id: str, household_id: str, data: dict) -> List[dict]:
+        return self._db.update('recipes', data, {'id': recipe_id, 'household_id': household_id})
+
+    def delete(self, recipe_id: str, household_id: str) -> None:
+        self._db.delete('recipes', {'id': recipe_id, 'household_id': household_id})
+
+
+# ===== MEAL PLANS =====
+
+class SqliteMealPlanProvider(MealPlanProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    def get_upcoming(self, household_id: str, from_date: str) -> List[dict]:
+        return self._db.fetch("SELECT * FROM meal_plans WHERE household_id = ? AND planned_date >= ?",
+                              household_id, from_date)
+
+    def get_active(self, household_id: str, from_date: str) -> List[dict]:
+        return self._db.fetch(
+            "SELECT * FROM meal_plans WHERE household_id = ? AND (planned_date >= ? OR is_cooked = 0)",
+            household_id, from_date
+        )
+
+    def get_by_id(self, meal_id: str, household_id: str) -> List[dict]:
+        return self._db.select('meal_plans', {'id': meal_id, 'household_id': household_id})
+
+    def create(self, data: dict) -> List[dict]:
+        return self._db.insert('meal_plans', data)
+
+    def update(self, meal_id: str, household_id: str, data: dict) -> List[dict]:
+        return self._db.update('meal_plans', data, {'id': meal_id, 'household_id': household_id})
+
+    def update_by_id(self, meal_id: str, data: dict) -> List[dict]:
+        return self._db.update('meal_plans', data, {'id': meal_id})
+
+    def delete(self, meal_id: str, household_id: str) -> None:
+        self._db.delete('meal_plans', {'id': meal_id, 'household_id': household_id})
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        return self._db.insert_many('meal_plans', rows)
+
+    def delete_many(self, meal_ids: List[str], household_id: str) -> None:
+        self._db.delete_many('meal_plans', meal_ids, household_id)
+
+
+# ===== SHOPPING =====
+
+class SqliteShoppingProvider(ShoppingProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    def get_manual_items(self, household_id: str) -> List[dict]:
+        return self._db.select('shopping_list_manual', {'household_id': household_id})
+
+    def create_manual_item(self, data: dict) -> List[dict]:
+        return self._db.insert('shopping_list_manual', data)
+
+    def update_manual_item(self, item_id: str, household_id: str, data: dict) -> List[dict]:
+        return self._db.update('shopping_list_manual', data,
+                               {'id': int(item_id), 'household_id': household_id})
+
+    def delete_manual_item(self, item_id: str, household_id: str) -> None:
+        self._db.delete('shopping_list_manual', {'id': int(item_id), 'household_id': household_id})
+
+    def delete_checked_items(self, household_id: str) -> None:
+        self._db.delete('shopping_list_manual', {'household_id': household_id, 'checked': True})
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        return self._db.insert_many('shopping_list_manual', rows)
+
+    def delete_many(self, item_ids: List[str], household_id: str) -> None:
+        self._db.delete_many('shopping_list_manual', [int(i) for i in item_ids], household_id)
+
+
+# ===== SETTINGS =====
+
+class SqliteSettingsProvider(SettingsProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    def get(self, household_id: str, fields: str = '*') -> List[dict]:
+        return self._db.select('household_settings', {'household_id': household_id}, fields)
+
+    def create(self, data: dict) -> List[dict]:
+        return self._db.insert('household_settings', data)
+
+    def update(self, household_id: str, data: dict) -> List[dict]:
+        return self._db.update('household_settings', data, {'household_id': household_id})
+
+
+# ===== HOUSEHOLDS =====
+
+class SqliteHouseholdProvider(HouseholdProvider):
+    def __init__(self, db: SqliteDatabase):
+        self._db = db
+
+    # --- Households ---
+
+    def get_by_ids(self, ids: List[str], fields: str = 'id, name, created_at') -> List[dict]:
+        if not ids:
+            return []
+        placeholders = ', '.join('?' for _ in ids)
+        return self._db.fetch(f"SELECT {_columns(fields)} FROM households WHERE id IN ({placeholders})", *ids)
+
+    def get_by_id_single(self, household_id: str, fields: str = 'name') -> dict:
+        rows = self._db.select('households', {'id': household_id}, fields)
+        if len(rows) != 1:
+            raise LookupError(f"Expected one household {household_id}, found {len(rows)}")
+        return rows[0]
+
+    def create(self, data: dict) -> List[dict]:
+        return self._db.insert('households', data)
+
+    def update_name(self, household_id: str, name: str) -> List[dict]:
+        return self._db.update('households', {'name': name}, {'id': household_id})
+
+    # --- Members ---
+
+    def get_memberships(self, user_id: str, fields: str = 'household_id') -> List[dict]:
+        return self._db.select('household_members', {'user_id': user_id}, fields)
+
+    def get_first_membership(self, user_id: str) -> List[dict]:
+        return self._db.select('household_members', {'user_id': user_id}, 'household_id', 'LIMIT 1')
+
+    def get_members(self, household_id: str, fields: str = 'user_id, role, created_at') -> List[dict]:
+        return self._db.select('household_members', {'household_id': household_id}, fields)
+
+    def check_membership(self, user_id: str, household_id: str) -> List[dict]:
+        return self._db.select('household_members', {'user_id': user_id, 'household_id': household_id}, 'id')
+
+    def check_membership_with_role(self, household_id: str, user_id: str) -> List[dict]:
+        return self._db.select('household_members', {'household_id': household_id, 'user_id': user_id},
+                               'id, role')
+
+    def add_member(self, data: dict) -> List[dict]:
+        return self._db.insert('household_members', data)
+
+    def remove_member(self, household_id: str, user_id: str) -> None:
+        self._db.delete('household_members', {'household_id': household_id, 'user_id': user_id})
+
+    # --- Invites ---
+
+    def create_invite(self, data: dict) -> List[dict]:
+        return self._db.insert('household_invites', data)
+
+    def get_active_invite(self, household_id: str, now_iso: str) -> List[dict]:
+        # julianday() compares the instants, whatever the ISO precision/offset
+        return self._db.fetch(
+            "SELECT code, expires_at, created_at FROM household_invites"
+            " WHERE household_id = ? AND used_by IS NULL AND julianday(expires_at) >= julianday(?)"
+            " ORDER BY created_at DESC LIMIT 1",
+            household_id, now_iso
+        )
+
+    def find_valid_invite(self, code: str, now_iso: str) -> List[dict]:
+        return self._db.fetch(
+            "SELECT id, household_id, role FROM household_invites"
+            " WHERE code = ? AND used_by IS NULL AND julianday(expires_at) >= julianday(?)",
+            code, now_iso
+        )
+
+    def mark_invite_used(self, invite_id: str, data: dict) -> None:
+        self._db.update('household_invites', data, {'id': invite_id})
+
+
+# ===== MAIN PROVIDER =====
+
+class SqliteDatabaseProvider(DatabaseProvider):
+    """
+    Sync SQLite provider (served to async routes by ThreadedAsyncDatabaseProvider).
+
+    Usage: SqliteDatabaseProvider(SqliteDatabase("peachy_pantry.db"))
+    """
+
+    def __init__(self, db: SqliteDatabase, secret: Optional[str] = None):
+        self.database = db
+        self._auth = SqliteAuthProvider(db, secret)
+        self._pantry = SqlitePantryProvider(db)
+        self._recipes = SqliteRecipeProvider(db)
+        self._meal_plans = SqliteMealPlanProvider(db)
+        self._shopping = SqliteShoppingProvider(db)
+        self._settings = SqliteSettingsProvider(db)
+        self._households = SqliteHouseholdProvider(db)
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @property
+    def pantry(self):
+        return self._pantry
+
+    @property
+    def recipes(self):
+        return self._recipes
+
+    @property
+    def meal_plans(self):
+        return self._meal_plans
+
+    @property
+    def shopping(self):
+        return self._shopping
+
+    @property
+    def settings(self):
+        return self._settings
+
+    @property
+    def households(self):
+        return self._households
+
+    def transaction(self):
+        return self.database.transaction()
+
+    def get_household_rows(self, household_id: str, segments, from_date: str) -> Optional[Dict[str, list]]:
+        # No round-trips to save, but one read transaction (a consistent
+        # view) on this thread's connection, instead of a thread per segment
+        queries = {
+            'pantry': lambda: self._pantry.get_items_with_locations(household_id),
+            'recipes': lambda: self._recipes.get_all(household_id),
+            'meals': lambda: self._meal_plans.get_active(household_id, from_date),
+            'manual': lambda: self._shopping.get_manual_items(household_id),
+        }
+        with self.database.snapshot():
+            return {seg: queries[seg]() for seg in segments}
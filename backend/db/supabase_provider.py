@@ -150,6 +150,33 @@ class SupabasePantryProvider(PantryProvider):
             query = query.limit(limit)
         return query.execute().data
 
+    # --- Bulk writes: one multi-row request each ---
+
+    def create_locations(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = self._client.table('pantry_locations')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    def update_locations(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        # Upsert on the primary key: PostgREST has no multi-row PATCH
+        resp = self._client.table('pantry_locations')\
+            .upsert(rows, on_conflict='id')\
+            .execute()
+        return resp.data
+
+    def upsert_items(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = self._client.table('pantry_items')\
+            .upsert(rows, on_conflict='id', default_to_null=False)\
+            .execute()
+        return resp.data
+
 
 # ===== RECIPES =====
 
@@ -251,6 +278,25 @@ class SupabaseMealPlanProvider(MealPlanProvider):
             .eq('household_id', household_id)\
             .execute()
 
+    # --- Bulk writes: one multi-row request each ---
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = self._client.table('meal_plans')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    def delete_many(self, meal_ids: List[str], household_id: str) -> None:
+        if not meal_ids:
+            return
+        self._client.table('meal_plans')\
+            .delete()\
+            .in_('id', meal_ids)\
+            .eq('household_id', household_id)\
+            .execute()
+
 
 # ===== SHOPPING =====
 
@@ -291,6 +337,25 @@ class SupabaseShoppingProvider(ShoppingProvider):
             .eq('checked', True)\
             .execute()
 
+    # --- Bulk writes: one multi-row request each ---
+
+    def create_many(self, rows: List[dict]) -> List[dict]:
+        if not rows:
+            return []
+        resp = self._client.table('shopping_list_manual')\
+            .insert(rows, default_to_null=False)\
+            .execute()
+        return resp.data
+
+    def delete_many(self, item_ids: List[str], household_id: str) -> None:
+        if not item_ids:
+            return
+        self._client.table('shopping_list_manual')\
+            .delete()\
+            .in_('id', item_ids)\
+            .eq('household_id', household_id)\
+            .execute()
+
 
 # ===== SETTINGS =====
 
@@ -0,0 +1,116 @@
+"""
+Threaded Async Adapter - Peachy Pantry
+
+Serves the AsyncDatabaseProvider interface from any sync DatabaseProvider
+by running each call in the default thread pool (asyncio.to_thread).
+
+Used for backends without a native async client, so async routes work
+with every provider get_db() can return.
+
+Inside `async with db.transaction()` every call runs on one dedicated
+thread instead, where the sync provider's transaction is open (SQLite
+connections, and so their transactions, belong to a thread).
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from db.async_provider import AsyncDatabaseProvider
+from db.provider import DatabaseProvider
+
+# The thread of the transaction the current task is in, if any
+_transaction_thread: ContextVar[Optional[ThreadPoolExecutor]] = ContextVar("db_transaction_thread", default=None)
+
+
+async def _in_thread(method, *args, **kwargs):
+    """Run a blocking call in a worker thread (the transaction's, inside one)."""
+    thread = _transaction_thread.get()
+    if thread is None:
+        return await asyncio.to_thread(method, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(thread, functools.partial(method, *args, **kwargs))
+
+
+class _ThreadedDomain:
+    """Wraps one domain provider (db.pantry, db.recipes...): every method becomes awaitable."""
+
+    def __init__(self, domain):
+        self._domain = domain
+
+    def __getattr__(self, name):
+        method = getattr(self._domain, name)
+        if not callable(method):
+            return method
+
+        async def call(*args, **kwargs):
+            return await _in_thread(method, *args, **kwargs)
+
+        call.__name__ = name
+        return call
+
+
+class ThreadedAsyncDatabaseProvider(AsyncDatabaseProvider):
+    """AsyncDatabaseProvider backed by a sync DatabaseProvider."""
+
+    def __init__(self, provider: DatabaseProvider):
+        self._provider = provider
+        self._auth = _ThreadedDomain(provider.auth)
+        self._pantry = _ThreadedDomain(provider.pantry)
+        self._recipes = _ThreadedDomain(provider.recipes)
+        self._meal_plans = _ThreadedDomain(provider.meal_plans)
+        self._shopping = _ThreadedDomain(provider.shopping)
+        self._households = _ThreadedDomain(provider.households)
+        # Transactions take turns on one thread
+        self._transaction_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-transaction")
+        self._transaction_lock = asyncio.Lock()
+
+    @property
+    def auth(self):
+        return self._auth
+
+    @property
+    def pantry(self):
+        return self._pantry
+
+    @property
+    def recipes(self):
+        return self._recipes
+
+    @property
+    def meal_plans(self):
+        return self._meal_plans
+
+    @property
+    def shopping(self):
+        return self._shopping
+
+    @property
+    def households(self):
+        return self._households
+
+    @asynccontextmanager
+    async def transaction(self):
+        if _transaction_thread.get() is not None:
+            yield  # Already inside one: join it
+            return
+
+        async with self._transaction_lock:
+            token = _transaction_thread.set(self._transaction_thread)
+            try:
+                context = self._provider.transaction()
+                await _in_thread(context.__enter__)
+                try:
+                    yield
+                except BaseException as e:
+                    if not await _in_thread(context.__exit__, type(e), e, e.__traceback__):
+                        raise
+                else:
+                    await _in_thread(context.__exit__, None, None, None)
+            finally:
+                _transaction_thread.reset(token)
+
+    async def get_household_rows(self, household_id: str, segments, from_date: str):
+        return await _in_thread(self._provider.get_household_rows, household_id, segments, from_date)
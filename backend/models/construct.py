@@ -0,0 +1,29 @@
+"""
+Trusted Model Construction - Python Age 5.0
+
+Rebuilds models from data we wrote ourselves (the Redis state cache).
+Skips validation entirely: the dict becomes the instance's __dict__.
+
+Pydantic's own model_construct() still walks every field in Python and is
+slower than model_validate() for our models, so this sets the instance
+slots directly instead. Only use it for data that was produced by
+model_dump() of the same model (the cache schema version guards that).
+"""
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def construct_trusted(cls, data: dict, private: dict = None):
+    """
+    Build a `cls` instance around `data` without validation or copying.
+
+    Models with private attributes pass their values in `private`
+    (model_post_init doesn't run here).
+    """
+    instance = _new(cls)
+    _set(instance, '__dict__', data)
+    _set(instance, '__pydantic_fields_set__', set(data))
+    _set(instance, '__pydantic_extra__', None)
+    _set(instance, '__pydantic_private__', private)
+    return instance
@@ -6,6 +6,8 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import date
 
+from .construct import construct_trusted
+
 
 class MealPlan(BaseModel):
     """Meal planned for a specific date"""
@@ -39,6 +41,13 @@ class MealPlan(BaseModel):
             cooked=cooked or False
         )
 
+    @classmethod
+    def from_cache(cls, meal_data: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        if isinstance(meal_data['date'], str):
+            meal_data['date'] = date.fromisoformat(meal_data['date'])
+        return construct_trusted(cls, meal_data)
+
 
 class MealPlanCreate(BaseModel):
     """Create new meal plan"""
@@ -2,10 +2,13 @@
 Pantry Models - Python Age 5.0
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional
 from datetime import date
 
+from utils.normalize import normalize_ingredient
+from .construct import construct_trusted
+
 
 class PantryLocation(BaseModel):
     """Where an item is stored and how much"""
@@ -14,6 +17,25 @@ class PantryLocation(BaseModel):
     quantity: float = 0  # Default 0 means "unknown quantity"
     expiration_date: Optional[date] = None
 
+    @classmethod
+    def from_supabase(cls, loc: dict):
+        """Convert a pantry_locations row to model"""
+        # Use location_name (actual DB column name)
+        return cls(**{
+            'id': loc.get('id'),
+            'location': loc.get('location_name', 'Unknown'),
+            'quantity': loc.get('quantity', 0),
+            'expiration_date': loc.get('expiration_date')
+        })
+
+    @classmethod
+    def from_cache(cls, loc: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        expiration = loc.get('expiration_date')
+        if isinstance(expiration, str):
+            loc['expiration_date'] = date.fromisoformat(expiration)
+        return construct_trusted(cls, loc)
+
 
 class PantryItem(BaseModel):
     """Complete pantry item with all locations"""
@@ -26,6 +48,18 @@ class PantryItem(BaseModel):
     preferred_store: Optional[str] = None
     locations: List[PantryLocation] = []
 
+    # Normalized (name, unit), computed once when the item is built —
+    # name and unit aren't reassigned afterwards
+    _norm_key: tuple = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._norm_key = normalize_ingredient(self.name, self.unit)
+
+    @property
+    def norm_key(self) -> tuple:
+        """Interned normalized (name, unit) for index lookups"""
+        return self.__pydantic_private__['_norm_key']  # skips BaseModel.__getattr__
+
     @property
     def total_quantity(self) -> float:
         """Sum quantities across all locations"""
@@ -48,15 +82,7 @@ class PantryItem(BaseModel):
         locations = []
         for loc in locations_data:
             if loc.get('pantry_item_id') == item_data['id']:
-                # Use location_name (actual DB column name)
-                location_value = loc.get('location_name', 'Unknown')
-
-                locations.append(PantryLocation(**{
-                    'id': loc.get('id'),
-                    'location': location_value,
-                    'quantity': loc.get('quantity', 0),
-                    'expiration_date': loc.get('expiration_date')
-                }))
+                locations.append(PantryLocation.from_supabase(loc))
 
         return cls(
             id=item_data['id'],
@@ -69,6 +95,14 @@ class PantryItem(BaseModel):
             locations=locations
         )
 
+    @classmethod
+    def from_cache(cls, item_data: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        item_data['locations'] = [PantryLocation.from_cache(loc) for loc in item_data.get('locations', [])]
+        return construct_trusted(cls, item_data, {
+            '_norm_key': normalize_ingredient(item_data['name'], item_data['unit'])
+        })
+
 
 class PantryItemCreate(BaseModel):
     """Create new pantry item - only name is required"""
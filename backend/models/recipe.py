@@ -2,9 +2,12 @@
 Recipe Models - Python Age 5.0
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional
 
+from utils.normalize import normalize_ingredient
+from .construct import construct_trusted
+
 
 class RecipeIngredient(BaseModel):
     """Single ingredient in a recipe"""
@@ -13,6 +16,22 @@ class RecipeIngredient(BaseModel):
     quantity: float
     unit: str
 
+    # Normalized (name, unit), computed once when the ingredient is built
+    _norm_key: tuple = PrivateAttr(default=None)
+
+    def model_post_init(self, __context):
+        self._norm_key = normalize_ingredient(self.name, self.unit)
+
+    @property
+    def norm_key(self) -> tuple:
+        """Interned normalized (name, unit) for index lookups"""
+        return self.__pydantic_private__['_norm_key']  # skips BaseModel.__getattr__
+
+    @classmethod
+    def from_cache(cls, ing: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        return construct_trusted(cls, ing, {'_norm_key': normalize_ingredient(ing['name'], ing['unit'])})
+
 
 class Recipe(BaseModel):
     """Complete recipe with ingredients"""
@@ -58,6 +77,14 @@ class Recipe(BaseModel):
             ingredients=ingredients
         )
 
+    @classmethod
+    def from_cache(cls, recipe_data: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        recipe_data['ingredients'] = [
+            RecipeIngredient.from_cache(ing) for ing in recipe_data.get('ingredients', [])
+        ]
+        return construct_trusted(cls, recipe_data)
+
 
 class RecipeCreate(BaseModel):
     """Create new recipe"""
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
+from .construct import construct_trusted
+
 
 class ShoppingItem(BaseModel):
     """Single item on shopping list (auto-generated or manual)"""
@@ -23,6 +25,32 @@ class ShoppingItem(BaseModel):
     household_id: Optional[str] = None
     preferred_store: Optional[str] = None
     breakdown: Optional[dict] = None  # e.g. {"meals": 3, "threshold": 2}
+    # Where an auto-generated line comes from, e.g.
+    # {"meals": {meal_id: quantity needed}, "threshold": 2}
+    sources: Optional[dict] = None
+
+    @classmethod
+    def from_supabase(cls, item: dict, household_id: Optional[str] = None):
+        """Convert a shopping_list_manual row to model"""
+        return cls(
+            id=str(item['id']),
+            name=item['name'],
+            quantity=item['quantity'],
+            unit=item['unit'],
+            category=item.get('category', 'Other'),
+            source="Manual",
+            checked=item.get('checked', False),
+            checked_at=item.get('checked_at'),
+            checked_by=item.get('checked_by'),
+            household_id=household_id or item.get('household_id')
+        )
+
+    @classmethod
+    def from_cache(cls, item: dict):
+        """Rebuild from a trusted cache entry (no validation)"""
+        if isinstance(item.get('checked_at'), str):
+            item['checked_at'] = datetime.fromisoformat(item['checked_at'])
+        return construct_trusted(cls, item)
 
     class Config:
         json_schema_extra = {
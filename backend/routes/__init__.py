@@ -2,6 +2,6 @@
 Peachy Pantry API Routes - Python Age 5.0
 """
 
-from . import auth, pantry, recipes, meal_plans, shopping_list, alerts, settings, households
+from . import auth, pantry, recipes, meal_plans, shopping_list, alerts, settings, households, stream
 
-__all__ = ['auth', 'pantry', 'recipes', 'meal_plans', 'shopping_list', 'alerts', 'settings', 'households']
+__all__ = ['auth', 'pantry', 'recipes', 'meal_plans', 'shopping_list', 'alerts', 'settings', 'households', 'stream']
@@ -7,6 +7,7 @@ Smart features that make the app feel ALIVE!
 from fastapi import APIRouter, Depends
 
 from utils.auth import get_current_household
+from utils.normalize import normalize_key
 from state_manager import StateManager
 
 router = APIRouter(prefix="/api/alerts", tags=["alerts"])
@@ -26,7 +27,7 @@ async def get_expiring_items(
     Returns:
         List of expiring items with recipes that use them
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     expiring = state.get_expiring_soon(days=days)
 
@@ -47,7 +48,7 @@ async def suggest_recipes_for_expiring(household_id: str = Depends(get_current_h
     Returns:
         Suggestions with expiring item and matching recipes
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     suggestions = state.suggest_recipes_for_expiring_items()
 
@@ -65,7 +66,7 @@ async def suggest_ready_recipes(household_id: str = Depends(get_current_househol
     Returns:
         List of ready-to-cook recipes
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     ready_recipes = [
         recipe
@@ -79,6 +80,52 @@ async def suggest_ready_recipes(household_id: str = Depends(get_current_househol
     }
 
 
+@router.get("/suggestions/almost-ready")
+async def suggest_almost_ready_recipes(
+    min_percent: int = 50,
+    household_id: str = Depends(get_current_household)
+):
+    """
+    Recipes you're only a few ingredients away from.
+
+    Args:
+        min_percent: Minimum share of ingredients on hand (default 50)
+
+    Returns:
+        Recipes not ready yet, most complete first, with what's missing
+    """
+    state = await StateManager.aget_state(household_id)
+    recipes = {recipe.id: recipe for recipe in state.recipes}
+
+    almost_ready = []
+    for entry in state.get_recipe_availability():
+        if not entry["missing"] or entry["percent_available"] < min_percent:
+            continue
+        recipe = recipes[entry["recipe_id"]]
+
+        # Report missing ingredients as the recipe spells them
+        missing = []
+        for ingredient in recipe.ingredients:
+            short = entry["missing"].pop(normalize_key(ingredient.name, ingredient.unit), None)
+            if short is not None:
+                missing.append({"ingredient": ingredient.name, "unit": ingredient.unit, "short": short})
+
+        almost_ready.append({
+            "id": recipe.id,
+            "name": recipe.name,
+            "tags": recipe.tags,
+            "percent_available": entry["percent_available"],
+            "missing": missing
+        })
+
+    almost_ready.sort(key=lambda r: (-r["percent_available"], len(r["missing"])))
+
+    return {
+        "almost_ready": almost_ready,
+        "total_almost_ready": len(almost_ready)
+    }
+
+
 @router.get("/pantry-health")
 async def get_pantry_health(household_id: str = Depends(get_current_household)):
     """
@@ -87,11 +134,9 @@ async def get_pantry_health(household_id: str = Depends(get_current_household)):
     Returns:
         Health score and breakdown
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
-    health = state.get_pantry_health()
-
-    return health
+    return state.get_pantry_health()
 
 
 @router.get("/dashboard")
@@ -99,7 +144,8 @@ async def get_dashboard_summary(household_id: str = Depends(get_current_househol
     """
     Complete dashboard summary.
 
-    Everything you need to see at a glance!
+    Everything you need to see at a glance! Memoized on the state until
+    anything changes or the day rolls over.
 
     Returns:
         - Expiring items with recipe suggestions
@@ -108,8 +154,13 @@ async def get_dashboard_summary(household_id: str = Depends(get_current_househol
         - Pantry health
         - Ready-to-cook recipes
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
+
+    return state.view('dashboard', _build_dashboard)
+
 
+def _build_dashboard(state) -> dict:
+    """Dashboard payload (see get_dashboard_summary)."""
     # Expiring items
     expiring = state.get_expiring_soon(days=3)
     expiring_suggestions = state.suggest_recipes_for_expiring_items()
@@ -16,6 +16,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from gotrue.errors import AuthApiError
 from db import get_db
+from utils.auth import forget_token
 
 limiter = Limiter(key_func=get_remote_address)
 
@@ -56,9 +57,7 @@ async def signup(credentials: SignUpRequest, request: Request):
         # IMPORTANT: sign_up changes the Supabase client's auth context to the
         # new user's JWT. Restore service-role auth so subsequent table operations
         # (household creation, member addition) have full permissions via RLS bypass.
-        from utils.supabase_client import get_supabase
-        service_key = os.getenv("SUPABASE_SERVICE_KEY")
-        get_supabase().postgrest.auth(service_key)
+        _restore_service_role()
 
         # Create household for user
         household_data = db.households.create({
@@ -76,13 +75,15 @@ async def signup(credentials: SignUpRequest, request: Request):
         })
 
         # Create user profile with a quick access code
-        from utils.supabase_client import get_supabase as _gs
-        _sb = _gs()
-        try:
-            code_resp = _sb.rpc("generate_quick_access_code").execute()
-            initial_code = (code_resp.data or '').upper()
-        except Exception:
-            initial_code = None
+        from utils.supabase_client import get_supabase as _gs, supabase_configured
+        initial_code = None
+        if supabase_configured():
+            _sb = _gs()
+            try:
+                code_resp = _sb.rpc("generate_quick_access_code").execute()
+                initial_code = (code_resp.data or '').upper()
+            except Exception:
+                initial_code = None
 
         if initial_code:
             _sb.table("user_profiles").upsert({
@@ -137,9 +138,7 @@ async def signin(credentials: SignInRequest, request: Request):
         user = auth_result['user']
 
         # Restore service-role auth for table queries (sign_in changes client context)
-        from utils.supabase_client import get_supabase
-        service_key = os.getenv("SUPABASE_SERVICE_KEY")
-        get_supabase().postgrest.auth(service_key)
+        _restore_service_role()
 
         # Get user's household
         memberships = db.households.get_memberships(user['id'])
@@ -182,11 +181,25 @@ class QuickAccessRequest(BaseModel):
 # ------------------------------------------------------------------ #
 
 def _restore_service_role():
-    from utils.supabase_client import get_supabase
+    from utils.supabase_client import get_supabase, supabase_configured
+    if not supabase_configured():
+        # Local auth (DB_PROVIDER=sqlite): no shared client to reset
+        return
     key = os.getenv("SUPABASE_SERVICE_KEY")
     get_supabase().postgrest.auth(key)
 
 
+def _quick_access_client():
+    """The Supabase client quick access codes live in (user_profiles, device_tokens)."""
+    from utils.supabase_client import get_supabase, supabase_configured
+    if not supabase_configured():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Quick access codes need Supabase"
+        )
+    return get_supabase()
+
+
 # Redis key for storing QA refresh tokens (used by returning-device flow)
 def _qa_rt_key(user_id: str) -> str:
     return f"qa_rt:{user_id}"
@@ -234,9 +247,8 @@ async def quick_access(body: QuickAccessRequest, request: Request):
     Server-side enforces 2 failed attempts before a 30-minute lockout.
     Generic error messages are used throughout to prevent enumeration.
     """
-    from utils.supabase_client import get_supabase
     db = get_db()
-    sb = get_supabase()
+    sb = _quick_access_client()
     service_key = os.getenv("SUPABASE_SERVICE_KEY")
 
     AUTH_FAILED = "Invalid access code or credentials"
@@ -400,8 +412,7 @@ async def get_my_code(authorization: Optional[str] = Header(None)):
 
     token = authorization.replace("Bearer ", "")
     db = get_db()
-    from utils.supabase_client import get_supabase
-    sb = get_supabase()
+    sb = _quick_access_client()
 
     user_result = db.auth.get_user(token)
     if not user_result or not user_result.get("user"):
@@ -440,8 +451,7 @@ async def regenerate_code(authorization: Optional[str] = Header(None)):
 
     token = authorization.replace("Bearer ", "")
     db = get_db()
-    from utils.supabase_client import get_supabase
-    sb = get_supabase()
+    sb = _quick_access_client()
 
     user_result = db.auth.get_user(token)
     if not user_result or not user_result.get("user"):
@@ -543,6 +553,11 @@ async def signout(authorization: Optional[str] = Header(None), body: Optional[Si
     rt_client = (body.refresh_token or "").strip() if body else None
     db = get_db()
 
+    # The access token stays verifiable until it expires; at least stop
+    # serving it from this worker's cache
+    if at_client:
+        forget_token(at_client)
+
     # Store the current RT in Redis so QA returning-device can refresh from it.
     if at_client and rt_client:
         try:
@@ -14,7 +14,7 @@ import secrets
 from datetime import datetime, timedelta, timezone
 
 from db import get_db
-from utils.auth import get_current_user
+from utils.auth import get_current_user, get_verified_user
 
 router = APIRouter(prefix="/api/households", tags=["households"])
 
@@ -110,7 +110,7 @@ async def list_members(
 @router.post("/invite")
 async def create_invite(
     request: InviteRequest,
-    user: dict = Depends(get_current_user),
+    user: dict = Depends(get_verified_user),
     household_id: Optional[str] = None
 ):
     """Generate an invite code for the current household."""
@@ -164,7 +164,7 @@ async def get_active_invite(user: dict = Depends(get_current_user)):
 @router.post("/invite/accept")
 async def accept_invite(
     request: AcceptInviteRequest,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_verified_user)
 ):
     """Accept an invite code and join the household."""
     db = get_db()
@@ -228,7 +228,7 @@ class RenameRequest(BaseModel):
 async def rename_household(
     household_id: str,
     request: RenameRequest,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_verified_user)
 ):
     """Rename a household. Only owners can rename."""
     db = get_db()
@@ -254,7 +254,7 @@ async def rename_household(
 @router.post("/leave")
 async def leave_household(
     request: SwitchHouseholdRequest,
-    user: dict = Depends(get_current_user)
+    user: dict = Depends(get_verified_user)
 ):
     """Leave a household. Owners cannot leave their own household."""
     db = get_db()
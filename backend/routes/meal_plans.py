@@ -4,15 +4,18 @@ Meal Plan Routes - Python Age 5.0
 Plan your meals, and everything syncs automatically.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from datetime import date
 import logging
 
 from models.meal_plan import MealPlanCreate, MealPlanUpdate
 from utils.auth import get_current_household
+from utils.etag import check_not_modified, set_etag
+from utils.delta import delta_response, start_delta
+from utils.json_response import json_object, json_response
 from utils.normalize import normalize_unit
-from db import get_db
-from state_manager import StateManager
+from db import get_async_db
+from state_manager import StateManager, StateChange
 
 logger = logging.getLogger(__name__)
 
@@ -20,23 +23,36 @@ router = APIRouter(prefix="/api/meal-plans", tags=["meal_plans"])
 
 
 @router.get("/")
-async def get_meal_plans(household_id: str = Depends(get_current_household)):
+async def get_meal_plans(request: Request, household_id: str = Depends(get_current_household)):
     """
     Get all upcoming meal plans.
 
-    Returns meal plans + reserved ingredients + shopping list.
+    Returns meal plans + reserved ingredients + shopping list (304 if
+    If-None-Match has the current ETag).
     """
-    state = StateManager.get_state(household_id)
+    not_modified = await check_not_modified(request, household_id, 'meal_plans')
+    if not_modified:
+        return not_modified
 
-    return {
-        "meal_plans": [meal.model_dump() for meal in state.meal_plans],
-        "reserved_ingredients": state.reserved_ingredients,
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    state = await StateManager.aget_state(household_id)
+    response = json_response(state.view('meal_plans', _build_meal_plans))
+    await set_etag(response, household_id, 'meal_plans', state)
+
+    return response
+
+
+def _build_meal_plans(state) -> bytes:
+    """GET /api/meal-plans payload, encoded."""
+    return json_object({
+        "meal_plans": state.encoded('meal_plans'),
+        "reserved_ingredients": state.encoded('reserved_ingredients'),
+        "shopping_list": state.encoded('shopping_list')
+    })
 
 
 @router.post("/")
 async def add_meal_plan(
+    request: Request,
     meal: MealPlanCreate,
     household_id: str = Depends(get_current_household)
 ):
@@ -45,9 +61,9 @@ async def add_meal_plan(
 
     Reserved ingredients and shopping list update automatically!
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
+    async def update():
         insert_data = {
             'household_id': household_id,
             'planned_date': meal.date.isoformat(),
@@ -57,35 +73,38 @@ async def add_meal_plan(
         }
         logger.info(f"Inserting meal plan: {insert_data}")
 
-        result = db.meal_plans.create(insert_data)
+        result = await db.meal_plans.create(insert_data)
 
         if not result:
             logger.error(f"Meal plan insert returned no data")
             raise HTTPException(500, "Failed to create meal plan")
 
-        return result[0]['id']
+        return StateChange(result=result[0]['id']).meal(result[0])
 
+    delta = start_delta(request)
     try:
-        meal_id = StateManager.update_and_invalidate(household_id, update)
+        # Update DB and patch cached state — returns fresh state
+        meal_id, state = await StateManager.aupdate_and_apply(household_id, update, delta)
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Failed to add meal plan: {e}", exc_info=True)
         raise HTTPException(500, "Failed to add meal plan")
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta, id=meal_id)
 
-    return {
+    return json_response(json_object({
         "id": meal_id,
-        "meal_plans": [m.model_dump() for m in state.meal_plans],
-        "reserved_ingredients": state.reserved_ingredients,
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+        "meal_plans": state.encoded('meal_plans'),
+        "reserved_ingredients": state.encoded('reserved_ingredients'),
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.put("/{meal_id}")
 async def update_meal_plan(
+    request: Request,
     meal_id: str,
     meal: MealPlanUpdate,
     household_id: str = Depends(get_current_household)
@@ -93,9 +112,9 @@ async def update_meal_plan(
     """
     Update meal plan.
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
+    async def update():
         update_data = {}
         if meal.date is not None:
             update_data['planned_date'] = meal.date.isoformat()
@@ -106,23 +125,31 @@ async def update_meal_plan(
         if meal.cooked is not None:
             update_data['is_cooked'] = meal.cooked
 
+        change = StateChange()
         if update_data:
-            db.meal_plans.update(meal_id, household_id, update_data)
+            rows = await db.meal_plans.update(meal_id, household_id, update_data)
+            if rows:
+                change.meal(rows[0])
 
-    StateManager.update_and_invalidate(household_id, update)
+        return change
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    return {
-        "meal_plans": [meal.model_dump() for meal in state.meal_plans],
-        "reserved_ingredients": state.reserved_ingredients,
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    return json_response(json_object({
+        "meal_plans": state.encoded('meal_plans'),
+        "reserved_ingredients": state.encoded('reserved_ingredients'),
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.delete("/{meal_id}")
 async def delete_meal_plan(
+    request: Request,
     meal_id: str,
     household_id: str = Depends(get_current_household)
 ):
@@ -131,21 +158,24 @@ async def delete_meal_plan(
 
     Shopping list updates automatically!
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        db.meal_plans.delete(meal_id, household_id)
+    async def update():
+        await db.meal_plans.delete(meal_id, household_id)
+        return StateChange().meal_removed(meal_id)
 
-    StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta)
 
-    return {
-        "meal_plans": [meal.model_dump() for meal in state.meal_plans],
-        "reserved_ingredients": state.reserved_ingredients,
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    return json_response(json_object({
+        "meal_plans": state.encoded('meal_plans'),
+        "reserved_ingredients": state.encoded('reserved_ingredients'),
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.post("/{meal_id}/validate")
@@ -158,7 +188,7 @@ async def validate_can_cook(
 
     Returns missing ingredients if any.
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     validation = state.validate_can_cook_meal(meal_id)
 
@@ -167,6 +197,7 @@ async def validate_can_cook(
 
 @router.post("/{meal_id}/cook")
 async def mark_meal_cooked(
+    request: Request,
     meal_id: str,
     force: bool = False,
     household_id: str = Depends(get_current_household)
@@ -177,7 +208,7 @@ async def mark_meal_cooked(
     Uses database transaction to prevent race conditions!
     Validates ingredients first unless force=True.
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     # Validate first (unless forced)
     if not force:
@@ -193,84 +224,120 @@ async def mark_meal_cooked(
                 }
             )
 
-    db = get_db()
-
-    def update():
-        # Get the meal
-        meal_data = db.meal_plans.get_by_id(meal_id, household_id)
-
-        if not meal_data:
-            raise HTTPException(404, "Meal not found")
-
-        # Mark meal as cooked FIRST — prevents double-deduct on retry
-        # if depletion partially fails below
-        db.meal_plans.update_by_id(meal_id, {'is_cooked': True})
-
-        # When forced, skip pantry depletion entirely (e.g. past meals after recount)
-        if force:
-            return
-
-        meal = meal_data[0]
-        serving_multiplier = meal.get('serving_multiplier', 1.0) or 1.0
-
-        # Get the recipe (ingredients stored as JSONB in recipes table)
-        recipe_data = db.recipes.get_by_id(meal['recipe_id'])
-
-        if not recipe_data:
-            return  # Recipe deleted — nothing to deplete
-
-        recipe = recipe_data[0]
-        ingredients = recipe.get('ingredients', []) or []
-
-        # Deplete pantry for each ingredient
-        for ingredient in ingredients:
-            ing_name = ingredient.get('name', '')
-            ing_unit = ingredient.get('unit', '')
-            ing_qty = ingredient.get('quantity', 0) or 0
-            qty_needed = ing_qty * serving_multiplier
-
-            if not ing_name or qty_needed <= 0:
-                continue
-
-            # Find pantry item by name (case-insensitive) and unit
-            pantry_items = db.pantry.find_by_name_ilike(household_id, ing_name)
-
-            # Filter by unit match (normalized to handle oz/ounce, etc.)
-            matching_items = [
-                item for item in pantry_items
-                if normalize_unit(item.get('unit', '')) == normalize_unit(ing_unit)
-            ]
-
-            if matching_items:
-                pantry_item = matching_items[0]
-
-                # Deplete from locations (FIFO - oldest expiration first)
-                locations = sorted(
-                    pantry_item.get('pantry_locations', []),
-                    key=lambda loc: loc.get('expiration_date') or '9999-12-31'
-                )
-
-                remaining = qty_needed
-                for location in locations:
-                    if remaining <= 0:
-                        break
-
-                    loc_qty = location.get('quantity', 0) or 0
-                    if loc_qty >= remaining:
-                        new_qty = loc_qty - remaining
-                        db.pantry.update_location(location['id'], {'quantity': new_qty})
-                        remaining = 0
-                    else:
-                        remaining -= loc_qty
-                        db.pantry.update_location(location['id'], {'quantity': 0})
-
-    StateManager.update_and_invalidate(household_id, update)
-
-    # Return fresh state
-    state = StateManager.get_state(household_id)
-
-    return {
-        "meal_plans": [meal.model_dump() for meal in state.meal_plans],
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    db = await get_async_db()
+
+    async def update():
+        # One transaction on the Postgres and SQLite providers; on Supabase
+        # (PostgREST) each write still commits on its own
+        async with db.transaction():
+            # Get the meal
+            meal_data = await db.meal_plans.get_by_id(meal_id, household_id)
+
+            if not meal_data:
+                raise HTTPException(404, "Meal not found")
+
+            # Mark meal as cooked FIRST — prevents double-deduct on retry
+            # if depletion partially fails below (where writes aren't atomic)
+            cooked_rows = await db.meal_plans.update_by_id(meal_id, {'is_cooked': True})
+
+            change = StateChange()
+            if cooked_rows:
+                change.meal(cooked_rows[0])
+            else:
+                change.rebuild('meals')
+
+            # When forced, skip pantry depletion entirely (e.g. past meals after recount)
+            if force:
+                return change
+
+            meal = meal_data[0]
+            serving_multiplier = meal.get('serving_multiplier', 1.0) or 1.0
+
+            # Get the recipe (ingredients stored as JSONB in recipes table)
+            recipe_data = await db.recipes.get_by_id(meal['recipe_id'])
+
+            if not recipe_data:
+                return change  # Recipe deleted — nothing to deplete
+
+            recipe = recipe_data[0]
+            ingredients = recipe.get('ingredients', []) or []
+
+            if not ingredients:
+                return change
+
+            # One read for the whole pantry, items grouped by name (case-insensitive)
+            pantry_by_name = {}
+            for item in await db.pantry.get_items_with_locations(household_id):
+                pantry_by_name.setdefault(item['name'].lower(), []).append(item)
+
+            # location id -> row with the depleted quantity; ingredients that hit
+            # the same item deplete from what earlier ones left
+            depleted = {}
+
+            # Deplete pantry for each ingredient
+            for ingredient in ingredients:
+                ing_name = ingredient.get('name', '')
+                ing_unit = ingredient.get('unit', '')
+                ing_qty = ingredient.get('quantity', 0) or 0
+                qty_needed = ing_qty * serving_multiplier
+
+                if not ing_name or qty_needed <= 0:
+                    continue
+
+                # Filter by unit match (normalized to handle oz/ounce, etc.)
+                matching_items = [
+                    item for item in pantry_by_name.get(ing_name.lower(), [])
+                    if normalize_unit(item.get('unit', '')) == normalize_unit(ing_unit)
+                ]
+
+                if matching_items:
+                    pantry_item = matching_items[0]
+
+                    # Deplete from locations (FIFO - oldest expiration first)
+                    locations = sorted(
+                        pantry_item.get('pantry_locations', []),
+                        key=lambda loc: loc.get('expiration_date') or '9999-12-31'
+                    )
+
+                    remaining = qty_needed
+                    for location in locations:
+                        if remaining <= 0:
+                            break
+
+                        row = depleted.get(location['id']) or {
+                            'id': location['id'],
+                            'pantry_item_id': pantry_item['id'],
+                            'location_name': location['location_name'],
+                            'quantity': location.get('quantity', 0) or 0
+                        }
+                        loc_qty = row['quantity']
+                        if loc_qty >= remaining:
+                            row['quantity'] = loc_qty - remaining
+                            remaining = 0
+                        else:
+                            remaining -= loc_qty
+                            row['quantity'] = 0
+                        depleted[location['id']] = row
+
+            if depleted:
+                # Every depleted location in one write
+                rows = await db.pantry.update_locations(list(depleted.values()))
+                for row in rows:
+                    change.pantry_location(row['pantry_item_id'], row)
+                if len(rows) < len(depleted):
+                    change.rebuild('pantry')
+
+            return change
+
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
+
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    return json_response(json_object({
+        "meal_plans": state.encoded('meal_plans'),
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list')
+    }))
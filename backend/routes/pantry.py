@@ -4,34 +4,50 @@ Pantry Routes - Python Age 5.0
 The pantry is the heart of Peachy Pantry.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List
 
 from models.pantry import PantryItemCreate, PantryItemUpdate
 from utils.auth import get_current_household
-from db import get_db
-from state_manager import StateManager
+from utils.etag import check_not_modified, set_etag
+from utils.delta import delta_response, start_delta
+from utils.json_response import json_object, json_response
+from db import get_async_db
+from state_manager import StateManager, StateChange
 
 router = APIRouter(prefix="/api/pantry", tags=["pantry"])
 
 
 @router.get("/")
-async def get_pantry(household_id: str = Depends(get_current_household)):
+async def get_pantry(request: Request, household_id: str = Depends(get_current_household)):
     """
     Get all pantry items with automatically calculated data.
 
     Returns pantry + shopping list + ready recipes all at once!
-    Everything syncs automatically.
+    Everything syncs automatically. The encoded payload is memoized on the
+    state until something changes; If-None-Match with the current ETag
+    gets a 304.
     """
-    state = StateManager.get_state(household_id)
+    not_modified = await check_not_modified(request, household_id, 'pantry')
+    if not_modified:
+        return not_modified
 
-    return {
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
-        "ready_recipes": state.ready_to_cook_recipe_ids,
+    state = await StateManager.aget_state(household_id)
+    response = json_response(state.view('pantry', _build_pantry))
+    await set_etag(response, household_id, 'pantry', state)
+
+    return response
+
+
+def _build_pantry(state) -> bytes:
+    """GET /api/pantry payload, encoded."""
+    return json_object({
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list'),
+        "ready_recipes": state.encoded('ready_to_cook_recipe_ids'),
         "pantry_health": state.get_pantry_health(),
         "last_updated": state.last_updated.isoformat()
-    }
+    })
 
 
 @router.get("/units")
@@ -42,13 +58,13 @@ async def get_units(household_id: str = Depends(get_current_household)):
 
     Useful for autocomplete/suggestions when adding new items.
     """
-    db = get_db()
+    db = await get_async_db()
 
     # Get names + units from pantry
-    pantry_items = db.pantry.get_item_units(household_id)
+    pantry_items = await db.pantry.get_item_units(household_id)
 
     # Get ingredients from recipes
-    recipes = db.recipes.get_ingredients_only(household_id)
+    recipes = await db.recipes.get_ingredients_only(household_id)
 
     units = set()
     ingredient_names = set()
@@ -82,8 +98,19 @@ async def get_units(household_id: str = Depends(get_current_household)):
     }
 
 
+def _location_rows(item_id: str, locations: List[dict]) -> List[dict]:
+    """Request locations -> pantry_locations rows for one create_locations() call."""
+    return [{
+        'pantry_item_id': item_id,
+        'location_name': location.get('location', 'Unspecified'),
+        'quantity': location.get('quantity', 0),
+        'expiration_date': location.get('expiration_date')
+    } for location in locations]
+
+
 @router.post("/")
 async def add_pantry_item(
+    request: Request,
     item: PantryItemCreate,
     household_id: str = Depends(get_current_household)
 ):
@@ -92,9 +119,9 @@ async def add_pantry_item(
 
     Shopping list automatically updates!
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
+    async def update():
         # Insert pantry item
         create_data = {
             'household_id': household_id,
@@ -105,36 +132,37 @@ async def add_pantry_item(
         }
         if item.preferred_store:
             create_data['preferred_store'] = item.preferred_store
-        item_data = db.pantry.create_item(create_data)
 
-        item_id = item_data[0]['id']
+        # Item and locations: atomic on the Postgres and SQLite providers
+        # only; on Supabase (PostgREST) each write commits on its own
+        async with db.transaction():
+            item_data = await db.pantry.create_item(create_data)
 
-        # Insert locations (if any provided)
-        for location in item.locations:
-            db.pantry.create_location({
-                'pantry_item_id': item_id,
-                'location_name': location.get('location', 'Unspecified'),
-                'quantity': location.get('quantity', 0),
-                'expiration_date': location.get('expiration_date')
-            })
+            item_id = item_data[0]['id']
 
-        return item_id
+            # Insert locations (if any provided), in one request
+            location_rows = await db.pantry.create_locations(_location_rows(item_id, item.locations))
 
-    item_id = StateManager.update_and_invalidate(household_id, update)
+        return StateChange(result=item_id).pantry_item(item_data[0], locations=location_rows)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    item_id, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    return {
+    if delta and delta.applied:
+        return delta_response(state, delta, id=item_id)
+
+    return json_response(json_object({
         "id": item_id,
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
-        "ready_recipes": state.ready_to_cook_recipe_ids
-    }
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list'),
+        "ready_recipes": state.encoded('ready_to_cook_recipe_ids')
+    }))
 
 
 @router.put("/{item_id}")
 async def update_pantry_item(
+    request: Request,
     item_id: str,
     item: PantryItemUpdate,
     household_id: str = Depends(get_current_household)
@@ -144,9 +172,11 @@ async def update_pantry_item(
 
     Everything syncs automatically!
     """
-    db = get_db()
+    db = await get_async_db()
+
+    async def update():
+        change = StateChange()
 
-    def update():
         # Build update dict (only include provided fields)
         update_data = {}
         if item.name is not None:
@@ -160,37 +190,42 @@ async def update_pantry_item(
         if item.preferred_store is not None:
             update_data['preferred_store'] = item.preferred_store
 
-        if update_data:
-            db.pantry.update_item(item_id, household_id, update_data)
+        # Atomic on the Postgres and SQLite providers only; on Supabase
+        # (PostgREST) each write commits on its own
+        async with db.transaction():
+            if update_data:
+                rows = await db.pantry.update_item(item_id, household_id, update_data)
+                if rows:
+                    change.pantry_item(rows[0])
 
-        # Update locations if provided
-        if item.locations is not None:
-            # Delete old locations
-            db.pantry.delete_locations_for_item(item_id)
+            # Update locations if provided
+            if item.locations is not None:
+                # Delete old locations
+                await db.pantry.delete_locations_for_item(item_id)
 
-            # Insert new locations
-            for location in item.locations:
-                db.pantry.create_location({
-                    'pantry_item_id': item_id,
-                    'location_name': location.get('location', 'Unspecified'),
-                    'quantity': location.get('quantity', 0),
-                    'expiration_date': location.get('expiration_date')
-                })
+                # Insert new locations
+                location_rows = await db.pantry.create_locations(_location_rows(item_id, item.locations))
+                change.pantry_locations(item_id, location_rows)
 
-    StateManager.update_and_invalidate(household_id, update)
+        return change
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    return {
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
-        "ready_recipes": state.ready_to_cook_recipe_ids
-    }
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    return json_response(json_object({
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list'),
+        "ready_recipes": state.encoded('ready_to_cook_recipe_ids')
+    }))
 
 
 @router.delete("/{item_id}")
 async def delete_pantry_item(
+    request: Request,
     item_id: str,
     household_id: str = Depends(get_current_household)
 ):
@@ -199,22 +234,27 @@ async def delete_pantry_item(
 
     Shopping list updates automatically!
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        # Delete locations first (foreign key constraint)
-        db.pantry.delete_locations_for_item(item_id)
+    async def update():
+        async with db.transaction():
+            # Delete locations first (foreign key constraint)
+            await db.pantry.delete_locations_for_item(item_id)
 
-        # Delete item
-        db.pantry.delete_item(item_id, household_id)
+            # Delete item
+            await db.pantry.delete_item(item_id, household_id)
 
-    StateManager.update_and_invalidate(household_id, update)
+        return StateChange().pantry_removed(item_id)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    return {
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
-        "ready_recipes": state.ready_to_cook_recipe_ids
-    }
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    return json_response(json_object({
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list'),
+        "ready_recipes": state.encoded('ready_to_cook_recipe_ids')
+    }))
@@ -4,16 +4,19 @@ Recipe Routes - Python Age 5.0
 Recipes with smart search and filtering.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
 from typing import List, Optional
 import uuid
 import logging
 
 from models.recipe import RecipeCreate, RecipeUpdate
 from utils.auth import get_current_household
+from utils.etag import check_not_modified, set_etag
+from utils.delta import delta_response, start_delta
+from utils.json_response import json_object, json_response
 from utils.supabase_client import get_supabase
-from db import get_db
-from state_manager import StateManager
+from db import get_async_db
+from state_manager import StateManager, StateChange
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +24,27 @@ router = APIRouter(prefix="/api/recipes", tags=["recipes"])
 
 
 @router.get("/")
-async def get_recipes(household_id: str = Depends(get_current_household)):
+async def get_recipes(request: Request, household_id: str = Depends(get_current_household)):
     """
-    Get all recipes.
+    Get all recipes (304 if If-None-Match has the current ETag).
     """
-    state = StateManager.get_state(household_id)
+    not_modified = await check_not_modified(request, household_id, 'recipes')
+    if not_modified:
+        return not_modified
 
-    return {
-        "recipes": [recipe.model_dump() for recipe in state.recipes],
-        "ready_to_cook": state.ready_to_cook_recipe_ids
-    }
+    state = await StateManager.aget_state(household_id)
+    response = json_response(state.view('recipes', _build_recipes))
+    await set_etag(response, household_id, 'recipes', state)
+
+    return response
+
+
+def _build_recipes(state) -> bytes:
+    """GET /api/recipes payload, encoded."""
+    return json_object({
+        "recipes": state.encoded('recipes'),
+        "ready_to_cook": state.encoded('ready_to_cook_recipe_ids')
+    })
 
 
 @router.get("/search")
@@ -39,44 +53,38 @@ async def search_recipes(
     tags: Optional[List[str]] = Query(None),
     ready_only: bool = False,
     has_ingredients: Optional[List[str]] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     household_id: str = Depends(get_current_household)
 ):
     """
     Search and filter recipes.
 
     Args:
-        q: Search term (searches recipe name)
+        q: Search terms (name, tags and instructions; prefix and typo tolerant)
         tags: Filter by tags
         ready_only: Only show ready-to-cook recipes
-        has_ingredients: Filter by ingredients
+        has_ingredients: Filter by ingredients (any of them)
+        limit: Page size (default: everything)
+        offset: Results to skip
+
+    Results are ranked by relevance when q is given; each carries its score.
     """
-    state = StateManager.get_state(household_id)
-    recipes = state.recipes
-
-    # Filter by search term
-    if q:
-        q_lower = q.lower()
-        recipes = [r for r in recipes if q_lower in r.name.lower()]
-
-    # Filter by tags
-    if tags:
-        recipes = [r for r in recipes if any(tag in r.tags for tag in tags)]
-
-    # Filter by ready to cook
-    if ready_only:
-        recipes = [r for r in recipes if r.id in state.ready_to_cook_recipe_ids]
-
-    # Filter by ingredients
-    if has_ingredients:
-        has_lower = [ing.lower() for ing in has_ingredients]
-        recipes = [
-            r for r in recipes
-            if any(ing.lower() in [i.name.lower() for i in r.ingredients] for ing in has_lower)
-        ]
+    state = await StateManager.aget_state(household_id)
+    hits, total = state.search_recipes(
+        query=q,
+        tags=tags,
+        ready_only=ready_only,
+        has_ingredients=has_ingredients,
+        limit=limit,
+        offset=offset
+    )
 
     return {
-        "recipes": [recipe.model_dump() for recipe in recipes],
-        "total": len(recipes)
+        "recipes": [{**recipe.model_dump(), "score": score} for recipe, score in hits],
+        "total": total,
+        "limit": limit,
+        "offset": offset
     }
 
 
@@ -135,7 +143,7 @@ async def get_recipe(
     """
     Get single recipe by ID.
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     recipe = next((r for r in state.recipes if r.id == recipe_id), None)
 
@@ -144,23 +152,24 @@ async def get_recipe(
 
     return {
         "recipe": recipe.model_dump(),
-        "ready_to_cook": recipe.id in state.ready_to_cook_recipe_ids
+        "ready_to_cook": state.is_ready_to_cook(recipe.id)
     }
 
 
 @router.post("/")
 async def add_recipe(
+    request: Request,
     recipe: RecipeCreate,
     household_id: str = Depends(get_current_household)
 ):
     """
     Add new recipe.
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
+    async def update():
         # Insert recipe with ingredients as JSONB
-        recipe_data = db.recipes.create({
+        recipe_data = await db.recipes.create({
             'household_id': household_id,
             'name': recipe.name,
             'servings': recipe.servings,
@@ -173,22 +182,25 @@ async def add_recipe(
         })
 
         recipe_id = recipe_data[0]['id']
-        return recipe_id
+        return StateChange(result=recipe_id).recipe(recipe_data[0])
 
-    recipe_id = StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    recipe_id, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta, id=recipe_id)
 
-    return {
+    return json_response(json_object({
         "id": recipe_id,
-        "recipes": [recipe.model_dump() for recipe in state.recipes],
-        "ready_to_cook": state.ready_to_cook_recipe_ids
-    }
+        "recipes": state.encoded('recipes'),
+        "ready_to_cook": state.encoded('ready_to_cook_recipe_ids')
+    }))
 
 
 @router.put("/{recipe_id}")
 async def update_recipe(
+    request: Request,
     recipe_id: str,
     recipe: RecipeUpdate,
     household_id: str = Depends(get_current_household)
@@ -196,9 +208,9 @@ async def update_recipe(
     """
     Update existing recipe.
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
+    async def update():
         # Build update dict with all provided fields
         update_data = {}
         if recipe.name is not None:
@@ -218,14 +230,24 @@ async def update_recipe(
         if recipe.ingredients is not None:
             update_data['ingredients'] = recipe.ingredients
 
+        change = StateChange()
+
         # Single atomic update with all fields
         if update_data:
-            db.recipes.update(recipe_id, household_id, update_data)
+            rows = await db.recipes.update(recipe_id, household_id, update_data)
+            if rows:
+                change.recipe(rows[0])
+
+        return change
 
-    StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # For metadata-only updates (favorite, tags), skip the expensive full-state
-    # reload. These don't affect calculated fields (shopping list, ready-to-cook).
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    # For metadata-only updates (favorite, tags), skip serializing the full
+    # state. These don't affect calculated fields (shopping list, ready-to-cook).
     is_metadata_only = (
         recipe.ingredients is None and
         recipe.name is None and
@@ -236,16 +258,15 @@ async def update_recipe(
         return {"success": True}
 
     # Full edit (ingredients/name/servings changed) — return fresh state
-    state = StateManager.get_state(household_id)
-
-    return {
-        "recipes": [recipe.model_dump() for recipe in state.recipes],
-        "ready_to_cook": state.ready_to_cook_recipe_ids
-    }
+    return json_response(json_object({
+        "recipes": state.encoded('recipes'),
+        "ready_to_cook": state.encoded('ready_to_cook_recipe_ids')
+    }))
 
 
 @router.delete("/{recipe_id}")
 async def delete_recipe(
+    request: Request,
     recipe_id: str,
     household_id: str = Depends(get_current_household)
 ):
@@ -258,7 +279,7 @@ async def delete_recipe(
     from datetime import date as date_type
 
     # Check for uncooked meals referencing this recipe
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
     today = date_type.today()
     blocking_meals = [
         meal for meal in state.meal_plans
@@ -277,20 +298,23 @@ async def delete_recipe(
             }
         )
 
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        db.recipes.delete(recipe_id, household_id)
+    async def update():
+        await db.recipes.delete(recipe_id, household_id)
+        return StateChange().recipe_removed(recipe_id)
 
-    StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta)
 
-    return {
-        "recipes": [recipe.model_dump() for recipe in state.recipes],
-        "ready_to_cook": state.ready_to_cook_recipe_ids
-    }
+    return json_response(json_object({
+        "recipes": state.encoded('recipes'),
+        "ready_to_cook": state.encoded('ready_to_cook_recipe_ids')
+    }))
 
 
 @router.get("/{recipe_id}/scaled")
@@ -305,7 +329,7 @@ async def get_scaled_recipe(
     Args:
         multiplier: Serving multiplier (e.g., 2.0 for double)
     """
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
     recipe = next((r for r in state.recipes if r.id == recipe_id), None)
 
@@ -10,19 +10,23 @@ Features:
 - Focus mode support
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from datetime import datetime
+import uuid
 
 from models.shopping import ManualShoppingItemCreate, ShoppingItemUpdate
 from utils.auth import get_current_household, get_current_user
-from db import get_db
-from state_manager import StateManager
+from utils.etag import check_not_modified, set_etag
+from utils.delta import delta_response, start_delta
+from utils.json_response import json_object, json_response
+from db import get_async_db
+from state_manager import StateManager, StateChange
 
 router = APIRouter(prefix="/api/shopping-list", tags=["shopping"])
 
 
 @router.get("/")
-async def get_shopping_list(household_id: str = Depends(get_current_household)):
+async def get_shopping_list(request: Request, household_id: str = Depends(get_current_household)):
     """
     Get complete shopping list.
 
@@ -30,16 +34,30 @@ async def get_shopping_list(household_id: str = Depends(get_current_household)):
     - Auto-generated from meals
     - Auto-generated from thresholds
     - Manual items
+
+    Answers 304 if If-None-Match has the current ETag.
     """
-    state = StateManager.get_state(household_id)
+    not_modified = await check_not_modified(request, household_id, 'shopping_list')
+    if not_modified:
+        return not_modified
+
+    state = await StateManager.aget_state(household_id)
+    response = json_response(state.view('shopping_list', _build_shopping_list))
+    await set_etag(response, household_id, 'shopping_list', state)
+
+    return response
+
 
-    return {
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
+def _build_shopping_list(state) -> bytes:
+    """GET /api/shopping-list payload, encoded."""
+    checked = sum(1 for item in state.shopping_list if item.checked)
+    return json_object({
+        "shopping_list": state.encoded('shopping_list'),
         "last_updated": state.last_updated.isoformat(),
         "total_items": len(state.shopping_list),
-        "checked_items": sum(1 for item in state.shopping_list if item.checked),
-        "unchecked_items": sum(1 for item in state.shopping_list if not item.checked)
-    }
+        "checked_items": checked,
+        "unchecked_items": len(state.shopping_list) - checked
+    })
 
 
 @router.post("/regenerate")
@@ -49,18 +67,19 @@ async def regenerate_shopping_list(household_id: str = Depends(get_current_house
 
     Invalidates cache - next request will recalculate.
     """
-    StateManager.invalidate(household_id)
+    await StateManager.ainvalidate(household_id)
 
-    state = StateManager.get_state(household_id)
+    state = await StateManager.aget_state(household_id)
 
-    return {
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
+    return json_response(json_object({
+        "shopping_list": state.encoded('shopping_list'),
         "last_updated": state.last_updated.isoformat()
-    }
+    }))
 
 
 @router.post("/items")
 async def add_manual_item(
+    request: Request,
     item: ManualShoppingItemCreate,
     household_id: str = Depends(get_current_household)
 ):
@@ -69,10 +88,10 @@ async def add_manual_item(
 
     These persist separately from auto-generated items.
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        result = db.shopping.create_manual_item({
+    async def update():
+        result = await db.shopping.create_manual_item({
             'household_id': household_id,
             'name': item.name,
             'quantity': item.quantity,
@@ -81,21 +100,24 @@ async def add_manual_item(
             'checked': item.checked
         })
 
-        return result[0]['id']
+        return StateChange(result=result[0]['id']).manual_item(result[0])
 
-    item_id = StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    item_id, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta, id=item_id)
 
-    return {
+    return json_response(json_object({
         "id": item_id,
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.patch("/items/{item_id}")
 async def update_shopping_item(
+    request: Request,
     item_id: str,
     update: ShoppingItemUpdate,
     household_id: str = Depends(get_current_household),
@@ -106,9 +128,9 @@ async def update_shopping_item(
 
     Only works for manual items (auto-generated items can't be edited).
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update_item():
+    async def update_item():
         update_data = {}
 
         if update.checked is not None:
@@ -132,12 +154,21 @@ async def update_shopping_item(
         if update.category is not None:
             update_data['category'] = update.category
 
+        change = StateChange()
         if update_data:
-            db.shopping.update_manual_item(item_id, household_id, update_data)
+            rows = await db.shopping.update_manual_item(item_id, household_id, update_data)
+            if rows:
+                change.manual_item(rows[0])
 
-    StateManager.update_and_invalidate(household_id, update_item)
+        return change
 
-    # For check-only updates, skip the expensive full-state reload.
+    delta = start_delta(request)
+    _, state = await StateManager.aupdate_and_apply(household_id, update_item, delta)
+
+    if delta and delta.applied:
+        return delta_response(state, delta)
+
+    # For check-only updates, skip serializing the full list.
     # The frontend already updates the checkbox client-side.
     is_check_only = (
         update.checked is not None and
@@ -151,15 +182,14 @@ async def update_shopping_item(
         return {"success": True}
 
     # Full edit (name/qty/unit/category changed) — return fresh state
-    state = StateManager.get_state(household_id)
-
-    return {
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    return json_response(json_object({
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.delete("/items/{item_id}")
 async def delete_manual_item(
+    request: Request,
     item_id: str,
     household_id: str = Depends(get_current_household)
 ):
@@ -168,116 +198,160 @@ async def delete_manual_item(
 
     Only works for manual items (can't delete auto-generated items).
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        db.shopping.delete_manual_item(item_id, household_id)
+    async def update():
+        await db.shopping.delete_manual_item(item_id, household_id)
+        return StateChange().manual_removed(item_id)
 
-    StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta)
 
-    return {
-        "shopping_list": [item.model_dump() for item in state.shopping_list]
-    }
+    return json_response(json_object({
+        "shopping_list": state.encoded('shopping_list')
+    }))
 
 
 @router.post("/clear-checked")
-async def clear_checked_items(household_id: str = Depends(get_current_household)):
+async def clear_checked_items(request: Request, household_id: str = Depends(get_current_household)):
     """
     Delete all checked manual items.
 
     Useful after shopping is complete.
     """
-    db = get_db()
+    db = await get_async_db()
 
-    def update():
-        db.shopping.delete_checked_items(household_id)
+    async def update():
+        await db.shopping.delete_checked_items(household_id)
+        return StateChange().manual_checked_cleared()
 
-    StateManager.update_and_invalidate(household_id, update)
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
 
-    # Return fresh state
-    state = StateManager.get_state(household_id)
+    if delta and delta.applied:
+        return delta_response(state, delta, message="Checked items cleared")
 
-    return {
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
+    return json_response(json_object({
+        "shopping_list": state.encoded('shopping_list'),
         "message": "Checked items cleared"
-    }
+    }))
 
 
 @router.post("/add-checked-to-pantry")
-async def add_checked_to_pantry(household_id: str = Depends(get_current_household)):
+async def add_checked_to_pantry(request: Request, household_id: str = Depends(get_current_household)):
     """
     Add all checked items to pantry.
 
     Smart feature: After shopping, add purchased items to pantry automatically!
     """
-    state = StateManager.get_state(household_id)
-    db = get_db()
+    state = await StateManager.aget_state(household_id)
+    db = await get_async_db()
 
     added_count = 0
 
-    def update():
+    async def update():
         nonlocal added_count
+        change = StateChange()
 
-        for item in state.shopping_list:
-            if not item.checked:
-                continue
+        checked = [item for item in state.shopping_list if item.checked]
+        if not checked:
+            return change
 
-            # Check if item already exists in pantry (case-insensitive)
-            existing = db.pantry.find_by_name_and_unit(household_id, item.name, item.unit)
+        # One read for the whole pantry; match names case-insensitively, units exactly
+        pantry = {}
+        for row in await db.pantry.get_items_with_locations(household_id):
+            pantry.setdefault((row['name'].lower(), row.get('unit')), row)
 
-            if existing:
-                # Update existing item quantity
-                pantry_id = existing[0]['id']
+        location_updates = {}  # location id -> row with the new quantity
+        new_locations = {}     # pantry item id -> 'Pantry' location row to create
+        new_items = {}         # (name, unit) -> pantry item row to create
 
-                # Get current location or create default
-                locations = db.pantry.get_locations(pantry_id, limit=1)
+        for item in checked:
+            key = (item.name.lower(), item.unit)
+            existing = pantry.get(key)
 
+            if existing:
+                # Add to the item's first location, or give it a default one
+                locations = existing.get('pantry_locations') or []
                 if locations:
-                    # Add to existing location
-                    location = locations[0]
-                    new_qty = location['quantity'] + item.quantity
-                    db.pantry.update_location(location['id'], {'quantity': new_qty})
+                    location = location_updates.get(locations[0]['id']) or {
+                        'id': locations[0]['id'],
+                        'pantry_item_id': existing['id'],
+                        'location_name': locations[0]['location_name'],
+                        'quantity': locations[0]['quantity']
+                    }
+                    location['quantity'] += item.quantity
+                    location_updates[location['id']] = location
                 else:
-                    # Create new location
-                    db.pantry.create_location({
-                        'pantry_item_id': pantry_id,
+                    location = new_locations.setdefault(existing['id'], {
+                        'pantry_item_id': existing['id'],
                         'location_name': 'Pantry',
-                        'quantity': item.quantity
+                        'quantity': 0
                     })
-
-                added_count += 1
+                    location['quantity'] += item.quantity
+            elif key in new_items:
+                # Same item checked twice: one pantry item, quantities added up
+                new_locations[new_items[key]['id']]['quantity'] += item.quantity
             else:
-                # Create new pantry item
-                pantry_data = db.pantry.create_item({
+                # New pantry item (id chosen here so its location can go in the same batch)
+                pantry_id = str(uuid.uuid4())
+                new_items[key] = {
+                    'id': pantry_id,
                     'household_id': household_id,
                     'name': item.name,
                     'unit': item.unit,
                     'category': item.category,
                     'min_threshold': 0
-                })
-
-                pantry_id = pantry_data[0]['id']
-
-                # Create location
-                db.pantry.create_location({
+                }
+                new_locations[pantry_id] = {
                     'pantry_item_id': pantry_id,
                     'location_name': 'Pantry',
                     'quantity': item.quantity
-                })
-
-                added_count += 1
-
-    StateManager.update_and_invalidate(household_id, update)
-
-    # Return fresh state
-    state = StateManager.get_state(household_id)
-
-    return {
-        "pantry_items": [item.model_dump() for item in state.pantry_items],
-        "shopping_list": [item.model_dump() for item in state.shopping_list],
+                }
+
+            added_count += 1
+
+        # Three multi-row writes, whatever the number of checked items.
+        # Atomic on the Postgres and SQLite providers only (no new pantry
+        # items left without a location); on Supabase (PostgREST) each
+        # write commits on its own
+        async with db.transaction():
+            item_rows = await db.pantry.upsert_items(list(new_items.values())) if new_items else []
+            location_rows = await db.pantry.create_locations(list(new_locations.values()))
+            location_rows += await db.pantry.update_locations(list(location_updates.values()))
+
+        locations_by_item = {}
+        for row in location_rows:
+            locations_by_item.setdefault(row['pantry_item_id'], []).append(row)
+
+        for row in item_rows:
+            change.pantry_item(row, locations=locations_by_item.pop(row['id'], []))
+        for pantry_id, rows in locations_by_item.items():
+            for row in rows:
+                change.pantry_location(pantry_id, row)
+
+        expected = len(new_items) + len(new_locations) + len(location_updates)
+        if len(item_rows) + len(location_rows) < expected:
+            change.rebuild('pantry')
+
+        return change
+
+    delta = start_delta(request)
+    # Update DB and patch cached state — returns fresh state
+    _, state = await StateManager.aupdate_and_apply(household_id, update, delta)
+
+    if delta and delta.applied:
+        return delta_response(state, delta, added_count=added_count,
+                              message=f"Added {added_count} items to pantry")
+
+    return json_response(json_object({
+        "pantry_items": state.encoded('pantry_items'),
+        "shopping_list": state.encoded('shopping_list'),
         "added_count": added_count,
         "message": f"Added {added_count} items to pantry"
-    }
+    }))
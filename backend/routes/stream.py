@@ -0,0 +1,68 @@
+"""
+State Stream Routes - Python Age 5.0
+
+Server-sent events: every write to the household shows up here as a
+versioned diff, so open tabs patch their lists instead of re-fetching.
+"""
+
+import asyncio
+import logging
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from utils.auth import get_current_household
+from utils.json_response import dumps
+from utils.state_stream import state_stream
+from state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/stream", tags=["stream"])
+
+# Comment line sent when nothing happened for this long (keeps proxies from
+# closing the connection and notices clients that went away)
+KEEPALIVE_SECONDS = 15
+
+
+@router.get("")
+async def stream_state(request: Request, household_id: str = Depends(get_current_household)):
+    """
+    Stream the household's state events (text/event-stream).
+
+    Events:
+        hello   {"versions": {...}} — current segment versions, sent first
+        state   {"segments", "versions", "origin", "changes" | "reload"}
+                (see StateManager._state_event and utils/delta.py for
+                the shape of "changes")
+
+    A client applies "changes" when each listed segment's version is
+    exactly one past what it holds; on a gap, or "reload", it re-fetches
+    those segments. Events whose "origin" is its own X-Client-Id were
+    already applied from the write's response.
+    """
+
+    async def events():
+        # Subscribe before reading the versions so no event falls in between
+        queue = await state_stream.subscribe(household_id)
+        try:
+            versions = await StateManager.aversions(household_id)
+            yield b"event: hello\ndata: " + dumps({"versions": versions}) + b"\n\n"
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield b": keepalive\n\n"
+                    continue
+                yield b"event: state\ndata: " + payload + b"\n\n"
+        finally:
+            await state_stream.unsubscribe(household_id, queue)
+
+    logger.info(f"📡 State stream opened for household {household_id}")
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
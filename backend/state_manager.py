@@ -14,20 +14,30 @@ One source of truth. Everything flows from here.
 
 from typing import Dict, List, Optional
 from datetime import datetime, date, timedelta
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict, OrderedDict
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+import asyncio
+import threading
+import time
+import uuid
 import redis
-import json
+import redis.asyncio
 
-from utils.normalize import normalize_name, normalize_unit, normalize_key
+from utils.normalize import normalize_name, normalize_unit, normalize_ingredient
+from utils.cache_codec import CacheCodecError, get_codec
+from utils import ready_engine
+from utils.recipe_search import RecipeSearchIndex
+from utils.json_response import dumps as json_dumps
 import logging
 import os
 
-from models.pantry import PantryItem
+from models.pantry import PantryItem, PantryLocation
 from models.recipe import Recipe
 from models.meal_plan import MealPlan
 from models.shopping import ShoppingItem
-from db import get_db
+from db import get_db, get_async_db
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +71,61 @@ except (redis.ConnectionError, redis.TimeoutError) as e:
     logger.warning(f"⚠️ Redis not available - caching disabled: {e}")
     redis_client = None
 
+# Async client on the same server for the event-loop path (aget_state & co.)
+if redis_client is None:
+    async_redis_client = None
+elif redis_url:
+    async_redis_client = redis.asyncio.from_url(redis_url, decode_responses=False, socket_connect_timeout=2)
+else:
+    async_redis_client = redis.asyncio.Redis(
+        host='localhost', port=6379, db=0, decode_responses=False, socket_connect_timeout=2
+    )
+
+# Per-request state metadata (see StateManager.track_request)
+_request_meta: ContextVar[Optional[dict]] = ContextVar("state_request_meta", default=None)
+
+# Encoding of cached blobs (orjson/msgpack/json, optional zstd)
+cache_codec = get_codec()
+logger.info(f"📦 Cache codec: {cache_codec.name}")
+
+
+# Cache segments: each is stored under its own key with its own version
+# counter, so a write only evicts/reloads the entity type it touched.
+# name -> (HouseholdState attribute, model)
+SEGMENTS = {
+    'pantry': ('pantry_items', PantryItem),
+    'recipes': ('recipes', Recipe),
+    'meals': ('meal_plans', MealPlan),
+    'manual': ('manual_shopping_items', ShoppingItem),
+}
+
+# Derived fields and the segments they are computed from
+DERIVED_DEPENDENCIES = {
+    'reserved_ingredients': ('recipes', 'meals'),
+    'shopping_list': ('pantry', 'recipes', 'meals', 'manual'),
+    'ready_to_cook_recipe_ids': ('pantry', 'recipes', 'meals'),
+}
+
+# Route payloads memoized on the state (see HouseholdState.view) and the
+# segments they read. They also expire when the day rolls over. The same
+# table scopes the ETags of the state-backed GET endpoints.
+VIEW_DEPENDENCIES = {
+    'dashboard': tuple(SEGMENTS),
+    'pantry': tuple(SEGMENTS),
+    'pantry_health': ('pantry',),
+    'expiring_suggestions': ('pantry', 'recipes', 'meals'),
+    'recipes': ('pantry', 'recipes', 'meals'),
+    'meal_plans': tuple(SEGMENTS),
+    'shopping_list': tuple(SEGMENTS),
+}
+
+# Collections kept encoded as JSON arrays (see HouseholdState.encoded),
+# by HouseholdState attribute, and the segments they are built from
+ENCODED_DEPENDENCIES = {
+    **{attr: (name,) for name, (attr, _) in SEGMENTS.items()},
+    **DERIVED_DEPENDENCIES,
+}
+
 
 class HouseholdState:
     """
@@ -68,7 +133,13 @@ class HouseholdState:
 
     The pantry is the heart, but the shopping list is what makes everything beat!
 
-    All calculations happen automatically when data changes.
+    Derived fields (reserved ingredients, shopping list, ready-to-cook
+    recipes) are computed on first access and memoized on the state, so an
+    endpoint that never reads the shopping list never pays for it. Each
+    field tracks the segments it depends on (DERIVED_DEPENDENCIES): a
+    single-entity write goes through the apply_* methods, which patch only
+    the memoized fields that depend on the touched segment, and only for
+    the name|unit keys the change touches.
     """
 
     def __init__(
@@ -77,8 +148,7 @@ class HouseholdState:
         pantry_items: List[PantryItem],
         recipes: List[Recipe],
         meal_plans: List[MealPlan],
-        manual_shopping_items: List[ShoppingItem] = None,
-        _skip_calculate: bool = False
+        manual_shopping_items: List[ShoppingItem] = None
     ):
         self.household_id = household_id
         self.pantry_items = pantry_items
@@ -87,80 +157,282 @@ class HouseholdState:
         self.manual_shopping_items = manual_shopping_items or []
 
         # O(1) lookup dictionaries (built once, used many times)
-        # Uses normalized names/units so "chicken breasts" matches "chicken breast"
-        self._pantry_lookup: Dict[tuple, PantryItem] = {}
+        # Uses normalized names/units so "chicken breasts" matches "chicken breast".
+        # Several items can share a normalized key; the last one wins lookups.
+        self._pantry_lookup: Dict[tuple, List[PantryItem]] = defaultdict(list)
+        self._pantry_by_id: Dict[str, PantryItem] = {}
         for item in self.pantry_items:
-            key = (normalize_name(item.name), normalize_unit(item.unit))
-            self._pantry_lookup[key] = item
+            self._index_pantry_item(item)
+
+        # Every dated location (lot) sorted by expiration date, as parallel
+        # lists (dates, (item, location)) for bisect. Built on first use,
+        # dropped on any pantry change.
+        self._expiry_index: Optional[tuple] = None
+        # Expiring-item windows already answered today: days -> items
+        self._expiring: Dict[int, List[dict]] = {}
+        self._expiring_day: Optional[date] = None
 
         self._recipe_lookup: Dict[str, Recipe] = {}
+        # Ingredient keys are normalized (name, unit) tuples; "name|unit"
+        # strings only appear in reserved_ingredients and the matrix columns
+        self._recipe_totals: Dict[str, Dict[tuple, float]] = {}  # recipe_id -> key -> summed qty
+        self._recipe_needs: Dict[str, Dict[str, float]] = {}     # recipe_id -> "name|unit" -> largest single qty
+        self._recipes_by_key: Dict[tuple, set] = defaultdict(set)
+        # Inverted index: normalized ingredient name -> recipe_id -> normalized unit -> quantity
+        self._recipes_by_name: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        # Recipe × ingredient matrix for the vectorized engine (built on demand,
+        # dropped whenever a recipe is indexed or unindexed)
+        self._recipe_matrix: Optional['ready_engine.RecipeMatrix'] = None
+        # recipe_id -> index in self.recipes (built on demand, dropped like the matrix)
+        self._recipe_positions: Optional[Dict[str, int]] = None
+        # Full-text search index (built in the background once the state is
+        # cached - see StateManager._l1_put - then kept in step with
+        # _index_recipe / _unindex_recipe)
+        self._search_index: Optional[RecipeSearchIndex] = None
+        self._search_index_lock = threading.Lock()
         for recipe in self.recipes:
-            self._recipe_lookup[recipe.id] = recipe
+            self._index_recipe(recipe)
+
+        # Uncooked meals grouped by recipe: recipe_id -> meal_id -> serving multiplier
+        self._meal_by_id: Dict[str, MealPlan] = {}
+        self._meals_by_recipe: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for meal in self.meal_plans:
+            self._index_meal(meal)
+
+        # Manual items override auto-generated lines with the same key:
+        # key -> IDs of the manual items doing so
+        self._manual_keys: Dict[tuple, set] = defaultdict(set)
+        for mi in self.manual_shopping_items:
+            self._manual_keys[normalize_ingredient(mi.name, mi.unit)].add(mi.id)
+
+        # Memoized derived fields: name -> value (see _derived_value)
+        self._derived: Dict[str, object] = {}
+        # Restored from cache but not decoded yet: name -> cached data
+        self._derived_cached: Dict[str, object] = {}
+        # Derived fields computed or patched since they were last cached
+        self.unsaved_derived: set = set()
 
-        # Calculated properties (set by calculate_all)
-        self.reserved_ingredients: Dict[str, float] = {}
-        self.shopping_list: List[ShoppingItem] = []
-        self.ready_to_cook_recipe_ids: List[int] = []
+        # Filled in while apply_change runs, if the caller asked for a delta
+        self._delta: Optional['StateDelta'] = None
+
+        # Segments whose lists and indexes are still shared with the state
+        # this one was copied from (see copy / _own)
+        self._shared_segments: set = set()
+
+        # Memoized route payloads: view name -> ((day, input versions), payload)
+        self._views: Dict[str, tuple] = {}
+        # Encoded collections: attribute -> (input versions, JSON bytes)
+        self._encoded: Dict[str, tuple] = {}
+
+        # Keyed working sets behind the calculated lists
+        self._auto_shopping: Dict[tuple, ShoppingItem] = {}
+        self._ready_ids: set = set()
 
         self.last_updated = datetime.now()
 
-        # Calculate everything on initialization (unless restoring from cache)
-        if not _skip_calculate:
-            self.calculate_all()
+        # Write stamps from StateManager — one counter per cache segment,
+        # bumped on every mutation of that segment
+        self.versions: Dict[str, int] = dict.fromkeys(SEGMENTS, 0)
+        # When each segment was last read from the database (epoch seconds)
+        self.loaded_at: Dict[str, float] = dict.fromkeys(SEGMENTS, time.time())
+
+    @property
+    def version(self) -> int:
+        """Monotonic household version (sum of the segment counters)."""
+        return sum(self.versions.values())
+
+    @property
+    def age(self) -> float:
+        """Seconds since the oldest segment was read from the database."""
+        return time.time() - min(self.loaded_at.values())
+
+    # ===== DERIVED FIELDS (LAZY) =====
+
+    @property
+    def reserved_ingredients(self) -> Dict[str, float]:
+        """"name|unit" -> quantity reserved by uncooked meals."""
+        return self._derived_value('reserved_ingredients')
+
+    @property
+    def shopping_list(self) -> List[ShoppingItem]:
+        """What to buy: meal shortfalls, threshold gaps and manual items."""
+        return self._derived_value('shopping_list')
+
+    @property
+    def ready_to_cook_recipe_ids(self) -> List[str]:
+        """Recipes that can be made right now, in recipe order."""
+        return self._derived_value('ready_to_cook_recipe_ids')
+
+    def is_calculated(self, field: str) -> bool:
+        """True if a derived field is already memoized (or restored from cache)."""
+        return field in self._derived or field in self._derived_cached
+
+    def is_ready_to_cook(self, recipe_id: str) -> bool:
+        """Ready-to-cook check for one recipe, without computing the whole list if it isn't memoized."""
+        if self.is_calculated('ready_to_cook_recipe_ids'):
+            self._derived_value('ready_to_cook_recipe_ids')  # decodes _ready_ids if still cached
+            return recipe_id in self._ready_ids
+        return recipe_id in self._recipe_lookup and self._recipe_is_ready(recipe_id)
+
+    def _derived_value(self, field: str):
+        """Memoized derived field: decoded from cache or computed on first access."""
+        try:
+            return self._derived[field]
+        except KeyError:
+            pass
+
+        if field in self._derived_cached:
+            value = self._decode_derived(field, self._derived_cached[field])
+            # Memoized before the cached data is dropped, so a copy taken
+            # meanwhile (see copy) always finds the field in one of them
+            self._derived[field] = value
+            self._derived_cached.pop(field, None)
+            return value
+
+        logger.info(f"🔄 Calculating {field} for household {self.household_id}")
+        if field == 'reserved_ingredients':
+            value = self._calculate_reserved()
+        elif field == 'shopping_list':
+            value = self._calculate_shopping_list()
+        else:
+            value = self._calculate_ready_recipes()
+        self.last_updated = datetime.now()
+
+        # Memoized before it is marked unsaved (see copy)
+        self._derived[field] = value
+        self.unsaved_derived.add(field)
+        return value
+
+    def _decode_derived(self, field: str, data):
+        """Turn cached data for one derived field back into its value."""
+        if field == 'shopping_list':
+            shopping = [ShoppingItem.from_cache(item) for item in data]
+            # Rebuild the keyed working set so apply_* can patch a cached state
+            self._auto_shopping = {
+                normalize_ingredient(item.name, item.unit): item
+                for item in shopping
+                if item.source != "Manual"
+            }
+            return shopping
+        if field == 'ready_to_cook_recipe_ids':
+            self._ready_ids = set(data)
+        return data
+
+    # ===== DERIVED VIEWS =====
+
+    def view(self, name: str, build):
+        """
+        Route payload memoized on this state.
+
+        Reused until one of the segments it reads (VIEW_DEPENDENCIES)
+        changes or the day rolls over — expiry windows and health scores
+        are relative to today. Callers share the payload: don't mutate it.
+
+        Args:
+            name: View name (a key of VIEW_DEPENDENCIES)
+            build: build(state) -> payload, called on a miss
+
+        Example:
+            return state.view('dashboard', build_dashboard)
+        """
+        stamp = (date.today(), tuple(self.versions[seg] for seg in VIEW_DEPENDENCIES[name]))
+        cached = self._views.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        payload = build(self)
+        self._views[name] = (stamp, payload)
+        return payload
+
+    def encoded(self, name: str) -> bytes:
+        """
+        A collection as a ready-to-send JSON array.
+
+        Encoded once per version of the segments it is built from
+        (ENCODED_DEPENDENCIES); routes splice it into response bodies with
+        utils.json_response.json_object instead of dumping the models.
+
+        Args:
+            name: Collection attribute ('pantry_items', 'shopping_list', ...)
+        """
+        stamp = tuple(self.versions[seg] for seg in ENCODED_DEPENDENCIES[name])
+        cached = self._encoded.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
 
-    def to_cache_dict(self) -> dict:
-        """Serialize state to a JSON-safe dictionary for Redis caching."""
+        body = json_dumps(getattr(self, name))
+        self._encoded[name] = (stamp, body)
+        return body
+
+    # ===== CACHE SERIALIZATION =====
+
+    def segment_to_cache(self, segment: str) -> dict:
+        """Serialize one input segment to plain data for the cache codec."""
+        attribute, _ = SEGMENTS[segment]
         return {
-            "household_id": self.household_id,
-            "pantry_items": [item.model_dump(mode='json') for item in self.pantry_items],
-            "recipes": [recipe.model_dump(mode='json') for recipe in self.recipes],
-            "meal_plans": [meal.model_dump(mode='json') for meal in self.meal_plans],
-            "manual_shopping_items": [item.model_dump(mode='json') for item in self.manual_shopping_items],
-            "reserved_ingredients": self.reserved_ingredients,
-            "shopping_list": [item.model_dump(mode='json') for item in self.shopping_list],
-            "ready_to_cook_recipe_ids": self.ready_to_cook_recipe_ids,
-            "last_updated": self.last_updated.isoformat()
+            "version": self.versions[segment],
+            "loaded_at": self.loaded_at[segment],
+            "items": [item.model_dump() for item in getattr(self, attribute)]
         }
 
-    @classmethod
-    def from_cache_dict(cls, data: dict) -> 'HouseholdState':
-        """Restore state from a cached JSON dictionary (skips recalculation)."""
-        pantry_items = [PantryItem.model_validate(item) for item in data["pantry_items"]]
-        recipes = [Recipe.model_validate(recipe) for recipe in data["recipes"]]
-        meal_plans = [MealPlan.model_validate(meal) for meal in data["meal_plans"]]
-        manual_shopping = [ShoppingItem.model_validate(item) for item in data.get("manual_shopping_items", [])]
-
-        state = cls(
-            household_id=data["household_id"],
-            pantry_items=pantry_items,
-            recipes=recipes,
-            meal_plans=meal_plans,
-            manual_shopping_items=manual_shopping,
-            _skip_calculate=True
-        )
+    @staticmethod
+    def segment_from_cache(segment: str, data: dict) -> list:
+        """Restore the models of one input segment (trusted, not re-validated)."""
+        _, model = SEGMENTS[segment]
+        return [model.from_cache(item) for item in data["items"]]
 
-        # Restore pre-calculated values
-        state.reserved_ingredients = data["reserved_ingredients"]
-        state.shopping_list = [ShoppingItem.model_validate(item) for item in data.get("shopping_list", [])]
-        state.ready_to_cook_recipe_ids = data.get("ready_to_cook_recipe_ids", [])
-        state.last_updated = datetime.fromisoformat(data["last_updated"])
+    def derived_to_cache(self) -> dict:
+        """
+        Serialize the derived fields this state has (computed or still
+        undecoded from cache), stamped with the input versions they came from.
+        """
+        data = {"versions": dict(self.versions), "last_updated": self.last_updated}
+        for field in DERIVED_DEPENDENCIES:
+            if field in self._derived:
+                value = self._derived[field]
+                data[field] = [item.model_dump() for item in value] if field == 'shopping_list' else value
+            elif field in self._derived_cached:
+                data[field] = self._derived_cached[field]
+        return data
+
+    def restore_derived(self, data: Optional[dict]) -> set:
+        """
+        Restore cached derived fields whose input segments haven't moved
+        since they were cached. They are decoded on first access.
 
-        return state
+        Returns:
+            Names of the derived fields that were restored
+        """
+        if not data:
+            return set()
+
+        cached_versions = data.get("versions", {})
+        restored = {
+            field for field, deps in DERIVED_DEPENDENCIES.items()
+            if field in data and all(cached_versions.get(seg) == self.versions[seg] for seg in deps)
+        }
+
+        for field in restored:
+            self._derived.pop(field, None)
+            self._derived_cached[field] = data[field]
+        if restored:
+            last_updated = data["last_updated"]
+            self.last_updated = datetime.fromisoformat(last_updated) if isinstance(last_updated, str) else last_updated
+
+        return restored
 
     def calculate_all(self):
         """
-        ONE method that calculates EVERYTHING.
-        Call this whenever ANY data changes.
+        Recalculate EVERYTHING now.
 
-        This is the synchronization magic!
+        Derived fields are otherwise computed on first access; use this to
+        force a full rebuild (drops memoized and cached values).
         """
-        logger.info(f"🔄 Recalculating state for household {self.household_id}")
-
-        self.reserved_ingredients = self._calculate_reserved()
-        self.shopping_list = self._calculate_shopping_list()
-        self.ready_to_cook_recipe_ids = self._calculate_ready_recipes()
+        self._derived.clear()
+        self._derived_cached.clear()
 
-        self.last_updated = datetime.now()
+        for field in DERIVED_DEPENDENCIES:
+            self._derived_value(field)
 
         logger.info(f"✅ State calculated: {len(self.shopping_list)} shopping items, "
                    f"{len(self.ready_to_cook_recipe_ids)} ready recipes")
@@ -179,18 +451,14 @@ class HouseholdState:
         """
         reserved = defaultdict(float)
 
-        for meal in self.meal_plans:
-            # Skip cooked meals
-            if meal.cooked:
-                continue
-
-            recipe = self._get_recipe(meal.recipe_id)
-            if not recipe:
-                continue
+        for recipe_id, meals in self._meals_by_recipe.items():
+            totals = self._recipe_totals.get(recipe_id)
+            if not totals or not meals:
+                continue  # Recipe deleted or no uncooked meals left
 
-            for ingredient in recipe.ingredients:
-                key = normalize_key(ingredient.name, ingredient.unit)
-                reserved[key] += ingredient.quantity * meal.serving_multiplier
+            multiplier = sum(meals.values())
+            for (name, unit), quantity in totals.items():
+                reserved[f"{name}|{unit}"] += quantity * multiplier
 
         return dict(reserved)
 
@@ -207,100 +475,131 @@ class HouseholdState:
         after buying meal shortfall and cooking, on-hand will drop.
         We need enough extra to restore the threshold AFTER cooking.
 
+        Built around a keyed accumulator: every uncooked meal adds what it
+        needs under its (name, unit) key, keys with a minimum threshold join
+        in, and each key becomes at most one line that records where its
+        quantity came from (see ShoppingItem.sources). Sorted once at the end.
+
         Returns:
             Complete shopping list
         """
-        shopping = []
-        added_keys = set()  # Track to avoid duplicates
+        # (name, unit) -> meal_id -> quantity that meal needs
+        meal_needs: Dict[tuple, Dict[str, float]] = {}
+        for recipe_id, meals in self._meals_by_recipe.items():
+            totals = self._recipe_totals.get(recipe_id)
+            if not totals:
+                continue  # Recipe deleted — its meals reserve nothing
+            for key, quantity in totals.items():
+                needs = meal_needs.setdefault(key, {})
+                for meal_id, multiplier in meals.items():
+                    needs[meal_id] = quantity * multiplier
+
+        for key, items in self._pantry_lookup.items():
+            if any(item.min_threshold > 0 for item in items):
+                meal_needs.setdefault(key, {})
+
+        self._auto_shopping = {}
+        for key, needs in meal_needs.items():
+            line = self._build_shopping_line(key, needs)
+            if line:
+                self._auto_shopping[key] = line
+
+        return self._assemble_shopping_list()
+
+    def _shopping_line_for_key(self, key: tuple) -> Optional[ShoppingItem]:
+        """Rebuild the auto-generated line for one key (incremental updates)."""
+        needs = {}
+        for recipe_id in self._recipes_by_key.get(key, ()):
+            quantity = self._recipe_totals[recipe_id][key]
+            for meal_id, multiplier in self._meals_by_recipe.get(recipe_id, {}).items():
+                needs[meal_id] = quantity * multiplier
+        return self._build_shopping_line(key, needs)
+
+    def _build_shopping_line(self, key: tuple, meal_needs: Dict[str, float]) -> Optional[ShoppingItem]:
+        """
+        Build the auto-generated shopping line for one (name, unit) key.
 
-        # Build set of manual item keys — manual overrides suppress auto-generated.
+        Meal shortfall and threshold gap are merged into a single line.
+        Returns None when nothing is needed or a manual item overrides the key.
+
+        Several pantry items can share a key. The meal shortfall compares
+        against the last of them (as every other lookup does). Each item
+        with a minimum threshold adds its own gap, so the line's total is
+        what one threshold line per item used to add up to.
+
+        Args:
+            key: Normalized (name, unit)
+            meal_needs: meal_id -> quantity each uncooked meal needs of it
+        """
         # When a user edits an auto-generated item, it becomes a manual item
         # with the same name|unit key. The manual version takes precedence.
-        manual_keys = set()
-        for mi in self.manual_shopping_items:
-            manual_keys.add(normalize_key(mi.name, mi.unit))
+        if self._manual_keys.get(key):
+            return None
 
-        # Part 1: What meals need
-        for key, needed_qty in self.reserved_ingredients.items():
-            name, unit = key.split("|", 1)
+        name, unit = key
+        pantry_item = self._pantry_item_for_key(name, unit)
+        available = pantry_item.total_quantity if pantry_item else 0
+        needed_qty = self.reserved_ingredients.get(f"{name}|{unit}", 0)
 
-            # Skip if user has a manual override for this item
-            if key in manual_keys:
-                continue
+        meal_shortfall = round(max(0, needed_qty - available), 2)
 
-            pantry_item = self._find_pantry_item(name, unit)
-            available = pantry_item.total_quantity if pantry_item else 0
-
-            meal_shortfall = round(max(0, needed_qty - available), 2)
-
-            if meal_shortfall > 0:
-                shopping.append(ShoppingItem(
-                    name=name.title(),
-                    quantity=meal_shortfall,
-                    unit=unit,
-                    category=pantry_item.category if pantry_item else "Other",
-                    source="Meals",
-                    checked=False,
-                    preferred_store=pantry_item.preferred_store if pantry_item else None,
-                    breakdown={"meals": meal_shortfall}
-                ))
-                added_keys.add(key)
-
-        # Part 2: Items below threshold (accounts for reserved ingredients)
-        for item in self.pantry_items:
+        threshold_gap = 0
+        threshold_item = None
+        for item in self._pantry_lookup.get(key, ()):
             if item.min_threshold <= 0:
-                continue  # No threshold set
-
-            key = normalize_key(item.name, item.unit)
-
-            # Skip if user has a manual override for this item
-            if key in manual_keys:
                 continue
-
-            reserved = self.reserved_ingredients.get(key, 0)
-
             # What will on-hand be after meals consume reserved ingredients?
             # (meal_shortfall covers the gap so we can cook, but stock still drops)
-            after_cooking = max(0, item.total_quantity - reserved)
-
-            threshold_gap = round(max(0, item.min_threshold - after_cooking), 2)
-
-            if threshold_gap <= 0:
-                continue  # Threshold satisfied even after cooking
-
-            if key in added_keys:
-                # Already have a meal shortfall item — add threshold gap on top
-                for shop_item in shopping:
-                    if (normalize_name(shop_item.name) == normalize_name(item.name) and
-                        normalize_unit(shop_item.unit) == normalize_unit(item.unit)):
-                        meal_qty = shop_item.quantity
-                        shop_item.quantity = round(meal_qty + threshold_gap, 2)
-                        shop_item.source = "Meals + Threshold"
-                        shop_item.breakdown = {
-                            "meals": meal_qty,
-                            "threshold": threshold_gap
-                        }
-                        if not shop_item.preferred_store and item.preferred_store:
-                            shop_item.preferred_store = item.preferred_store
-                        break
-            else:
-                # Threshold-only item (no meal shortfall, but stock drops after cooking)
-                shopping.append(ShoppingItem(
-                    name=item.name.title(),
-                    quantity=threshold_gap,
-                    unit=item.unit,
-                    category=item.category,
-                    source="Threshold",
-                    checked=False,
-                    preferred_store=item.preferred_store,
-                    breakdown={"threshold": threshold_gap}
-                ))
-
-        # Part 3: Manual items (the essentials!)
+            after_cooking = max(0, item.total_quantity - needed_qty)
+            gap = round(max(0, item.min_threshold - after_cooking), 2)
+            if gap > 0:
+                threshold_gap = round(threshold_gap + gap, 2)
+                threshold_item = item
+
+        if meal_shortfall > 0:
+            line = ShoppingItem(
+                name=name.title(),
+                quantity=meal_shortfall,
+                unit=unit,
+                category=pantry_item.category if pantry_item else "Other",
+                source="Meals",
+                checked=False,
+                preferred_store=pantry_item.preferred_store if pantry_item else None,
+                breakdown={"meals": meal_shortfall},
+                sources={"meals": {meal_id: round(qty, 2) for meal_id, qty in meal_needs.items()}}
+            )
+            if threshold_gap > 0:
+                # Meal shortfall item — add threshold gap on top
+                line.quantity = round(meal_shortfall + threshold_gap, 2)
+                line.source = "Meals + Threshold"
+                line.breakdown = {"meals": meal_shortfall, "threshold": threshold_gap}
+                line.sources["threshold"] = threshold_gap
+            return line
+
+        if threshold_gap > 0:
+            # Threshold-only item (no meal shortfall, but stock drops after cooking)
+            return ShoppingItem(
+                name=threshold_item.name.title(),
+                quantity=threshold_gap,
+                unit=threshold_item.unit,
+                category=threshold_item.category,
+                source="Threshold",
+                checked=False,
+                preferred_store=threshold_item.preferred_store,
+                breakdown={"threshold": threshold_gap},
+                sources={"threshold": threshold_gap}
+            )
+
+        return None
+
+    def _assemble_shopping_list(self) -> List[ShoppingItem]:
+        """Auto-generated lines plus manual items (the essentials!), sorted."""
+        shopping = list(self._auto_shopping.values())
         shopping.extend(self.manual_shopping_items)
 
-        # Sort by category then name
-        shopping.sort(key=lambda x: (x.category, x.name))
+        # Sort by category then name (unit breaks ties, so the order doesn't
+        # depend on how the keyed working set was filled)
+        shopping.sort(key=lambda x: (x.category, x.name, x.unit))
 
         return shopping
 
@@ -308,34 +607,520 @@ class HouseholdState:
         """
         Calculate which recipes can be made RIGHT NOW.
 
-        Accounts for reserved ingredients from planned meals.
+        Accounts for reserved ingredients from planned meals. Large
+        households go through the vectorized engine (utils/ready_engine.py)
+        when NumPy is installed.
 
         Returns:
             List of recipe IDs that are ready to cook
         """
-        ready = []
+        if self._use_recipe_matrix():
+            matrix = self._get_recipe_matrix()
+            ready = matrix.ready_ids(matrix.supply_vector(self._available_for_key))
+            self._ready_ids = set(ready)
+            return ready
+
+        self._ready_ids = {
+            recipe.id for recipe in self.recipes
+            if self._recipe_is_ready(recipe.id)
+        }
+        return [recipe.id for recipe in self.recipes if recipe.id in self._ready_ids]
 
-        for recipe in self.recipes:
-            can_make = True
+    def _recipe_is_ready(self, recipe_id: str) -> bool:
+        """Every ingredient is on hand after subtracting reserved quantities."""
+        for key, quantity in self._recipe_needs.get(recipe_id, {}).items():
+            if self._available_for_key(key) < quantity:
+                return False
+
+        return True
+
+    def _available_for_key(self, key: str) -> float:
+        """On-hand quantity for a name|unit key minus what meals have reserved."""
+        name, unit = key.split("|", 1)
+        pantry_item = self._pantry_item_for_key(name, unit)
+        available = pantry_item.total_quantity if pantry_item else 0
+
+        # Subtract reserved ingredients
+        return available - self.reserved_ingredients.get(key, 0)
+
+    def _use_recipe_matrix(self) -> bool:
+        return ready_engine.available() and len(self.recipes) >= ready_engine.VECTORIZE_MIN_RECIPES
+
+    def _get_recipe_matrix(self) -> 'ready_engine.RecipeMatrix':
+        """Requirement matrix for the current recipes (rebuilt only after recipe changes)."""
+        if self._recipe_matrix is None:
+            self._recipe_matrix = ready_engine.RecipeMatrix(
+                [recipe.id for recipe in self.recipes], self._recipe_needs
+            )
+        return self._recipe_matrix
+
+    # ===== INCREMENTAL UPDATES =====
+
+    def copy(self) -> 'HouseholdState':
+        """
+        A copy to patch (or encode) while this state keeps serving reads.
+
+        Entity models are shared — patches replace them, never mutate them.
+        The derived fields and their working sets are copied now; a
+        segment's lists and indexes stay shared until the copy first writes
+        to that segment (see _own). Safe to call while other threads read
+        this state.
+        """
+        clone = object.__new__(HouseholdState)
+        clone.__dict__.update(self.__dict__)
+        clone._shared_segments = set(SEGMENTS)
+        clone._delta = None
+        clone._search_index_lock = threading.Lock()
+        # Unsaved marks first, memoized values last: a field a reader
+        # computes meanwhile may be saved twice, but is never marked saved
+        # without its value
+        clone.unsaved_derived = set(self.unsaved_derived)
+        clone._derived_cached = dict(self._derived_cached)
+        clone._derived = dict(self._derived)
+        if 'reserved_ingredients' in clone._derived:
+            clone._derived['reserved_ingredients'] = dict(clone._derived['reserved_ingredients'])
+        clone._auto_shopping = dict(self._auto_shopping)
+        clone._ready_ids = set(self._ready_ids)
+        clone._views = dict(self._views)
+        clone._encoded = dict(self._encoded)
+        clone._expiring = dict(self._expiring)
+        clone.versions = dict(self.versions)
+        clone.loaded_at = dict(self.loaded_at)
+        return clone
+
+    def _own(self, segment: str):
+        """Copy a segment's lists and indexes before the first write, if still shared (see copy)."""
+        if segment not in self._shared_segments:
+            return
+        self._shared_segments.discard(segment)
+
+        if segment == 'pantry':
+            self.pantry_items = list(self.pantry_items)
+            self._pantry_by_id = dict(self._pantry_by_id)
+            self._pantry_lookup = defaultdict(list, {
+                key: list(items) for key, items in dict(self._pantry_lookup).items()
+            })
+        elif segment == 'recipes':
+            self.recipes = list(self.recipes)
+            self._recipe_lookup = dict(self._recipe_lookup)
+            self._recipe_totals = dict(self._recipe_totals)
+            self._recipe_needs = dict(self._recipe_needs)
+            self._recipes_by_key = defaultdict(set, {
+                key: set(ids) for key, ids in dict(self._recipes_by_key).items()
+            })
+            self._recipes_by_name = defaultdict(dict, {
+                name: dict(uses) for name, uses in dict(self._recipes_by_name).items()
+            })
+            if self._search_index is not None:
+                self._search_index = self._search_index.copy()
+        elif segment == 'meals':
+            self.meal_plans = list(self.meal_plans)
+            self._meal_by_id = dict(self._meal_by_id)
+            self._meals_by_recipe = defaultdict(dict, {
+                recipe_id: dict(meals) for recipe_id, meals in dict(self._meals_by_recipe).items()
+            })
+        elif segment == 'manual':
+            self.manual_shopping_items = list(self.manual_shopping_items)
+            self._manual_keys = defaultdict(set, {
+                key: set(ids) for key, ids in dict(self._manual_keys).items()
+            })
+
+    def apply_pantry_change(self, item: Optional[PantryItem] = None, removed_id: Optional[str] = None):
+        """
+        Insert, replace or remove one pantry item, then recompute only the
+        keys it touches (its old and new name|unit).
+
+        Args:
+            item: New version of the item (None when removing)
+            removed_id: ID of the item to remove (ignored when item is given)
+        """
+        self._own('pantry')
+        item_id = item.id if item else removed_id
+        old = self._pantry_by_id.get(item_id)
+        affected = set()
+        self._expiry_index = None
+        self._expiring = {}
+
+        if old is not None:
+            affected.add(old.norm_key)
+            self._unindex_pantry_item(old)
+        if item is not None:
+            affected.add(item.norm_key)
+
+        self.pantry_items = self._replace_in_list(self.pantry_items, old, item)
+        if item is not None:
+            self._index_pantry_item(item)
+            self._restore_bucket_order(item.norm_key)
+        if self._delta is not None:
+            self._delta.record('pantry_items', item_id, old, item_id, item)
+
+        self._refresh_keys('pantry', affected)
+
+    def apply_recipe_change(self, recipe: Optional[Recipe] = None, removed_id: Optional[str] = None):
+        """
+        Insert, replace or remove one recipe, then recompute the keys used by
+        its old and new ingredient lists.
+
+        Args:
+            recipe: New version of the recipe (None when removing)
+            removed_id: ID of the recipe to remove (ignored when recipe is given)
+        """
+        self._own('recipes')
+        recipe_id = recipe.id if recipe else removed_id
+        old = self._recipe_lookup.get(recipe_id)
+        affected = set()
+
+        if old is not None:
+            affected.update(self._recipe_totals.get(old.id, {}))
+            self._unindex_recipe(old)
 
-            for ingredient in recipe.ingredients:
-                pantry_item = self._find_pantry_item(ingredient.name, ingredient.unit)
-                available = pantry_item.total_quantity if pantry_item else 0
+        self.recipes = self._replace_in_list(self.recipes, old, recipe)
+        if recipe is not None:
+            self._index_recipe(recipe)
+            affected.update(self._recipe_totals[recipe.id])
+        if self._delta is not None:
+            self._delta.record('recipes', recipe_id, old, recipe_id, recipe)
 
-                # Subtract reserved ingredients
-                key = normalize_key(ingredient.name, ingredient.unit)
-                reserved = self.reserved_ingredients.get(key, 0)
+        self._refresh_keys('recipes', affected, recipe_ids={recipe_id})
+
+    def apply_meal_change(self, meal: Optional[MealPlan] = None, removed_id: Optional[str] = None):
+        """
+        Insert, replace or remove one meal plan, then recompute the keys of
+        the recipes it reserved before and after the change.
+
+        Cooked meals in the past drop out of state, matching what
+        db.meal_plans.get_active would load.
+
+        Args:
+            meal: New version of the meal (None when removing)
+            removed_id: ID of the meal to remove (ignored when meal is given)
+        """
+        self._own('meals')
+        meal_id = meal.id if meal else removed_id
+        old = self._meal_by_id.get(meal_id)
+        affected = set()
 
-                actual_available = available - reserved
+        if old is not None:
+            affected.update(self._recipe_totals.get(old.recipe_id, {}))
+            self._unindex_meal(old)
 
-                if actual_available < ingredient.quantity:
-                    can_make = False
-                    break
+        if meal is not None and meal.cooked and meal.date < date.today():
+            meal = None
 
-            if can_make:
-                ready.append(recipe.id)
+        self.meal_plans = self._replace_in_list(self.meal_plans, old, meal)
+        if meal is not None:
+            self._index_meal(meal)
+            affected.update(self._recipe_totals.get(meal.recipe_id, {}))
+        if self._delta is not None:
+            self._delta.record('meal_plans', meal_id, old, meal_id, meal)
 
-        return ready
+        self._refresh_keys('meals', affected)
+
+    def apply_manual_item_change(self, item: Optional[ShoppingItem] = None, removed_id: Optional[str] = None):
+        """
+        Insert, replace or remove one manual shopping item, then recompute the
+        auto-generated line it overrides (old and new name|unit).
+
+        Args:
+            item: New version of the manual item (None when removing)
+            removed_id: ID of the item to remove (ignored when item is given)
+        """
+        self._own('manual')
+        item_id = item.id if item else removed_id
+        old = next((mi for mi in self.manual_shopping_items if mi.id == item_id), None)
+        affected = set()
+
+        if old is not None:
+            key = normalize_ingredient(old.name, old.unit)
+            affected.add(key)
+            self._manual_keys[key].discard(old.id)
+            if not self._manual_keys[key]:
+                del self._manual_keys[key]
+        if item is not None:
+            key = normalize_ingredient(item.name, item.unit)
+            affected.add(key)
+            self._manual_keys[key].add(item.id)
+
+        self.manual_shopping_items = self._replace_in_list(self.manual_shopping_items, old, item)
+        if self._delta is not None:
+            self._delta.record('shopping_list', item_id, old, item_id, item)
+
+        self._refresh_keys('manual', affected)
+
+    def apply_change(self, change: 'StateChange', delta: Optional['StateDelta'] = None) -> bool:
+        """
+        Apply the rows a mutation wrote (see StateChange) to this state.
+
+        Args:
+            change: Rows written by the mutation
+            delta: Filled in with the entities that were added, changed or
+                removed, derived fields included (see StateDelta)
+
+        Returns:
+            False if the change can't be applied to this state (e.g. it
+            touches a pantry item the cached state doesn't have). The state
+            may be partially patched at that point and must be discarded.
+        """
+        if not change.patchable:
+            return False
+
+        if delta is None:
+            return self._apply_ops(change)
+
+        # Derived fields are only patched (and so only reported) when live
+        for field, deps in DERIVED_DEPENDENCIES.items():
+            if change.segments.intersection(deps):
+                self._derived_value(field)
+        self._delta = delta
+        try:
+            return self._apply_ops(change)
+        finally:
+            self._delta = None
+
+    def _apply_ops(self, change: 'StateChange') -> bool:
+        """apply_change() without the delta bookkeeping."""
+        for op, args in change.ops:
+            if op == "pantry_item":
+                row, location_rows = args
+                row = dict(row)
+                nested = row.pop('pantry_locations', None)
+                if location_rows is None:
+                    location_rows = nested
+                if location_rows is None:
+                    item = PantryItem.from_supabase(row, [])
+                    existing = self._pantry_by_id.get(item.id)
+                    if existing is not None:
+                        item.locations = list(existing.locations)
+                else:
+                    item = PantryItem.from_supabase(row, [
+                        {**loc, 'pantry_item_id': row['id']} for loc in location_rows
+                    ])
+                self.apply_pantry_change(item)
+
+            elif op in ("pantry_locations", "pantry_location"):
+                item_id, rows = args
+                existing = self._pantry_by_id.get(item_id)
+                if existing is None:
+                    return False
+                item = existing.model_copy()
+                if op == "pantry_locations":
+                    item.locations = [PantryLocation.from_supabase(row) for row in rows]
+                else:
+                    location = PantryLocation.from_supabase(rows)
+                    item.locations = [loc for loc in existing.locations if loc.id != location.id]
+                    item.locations.append(location)
+                self.apply_pantry_change(item)
+
+            elif op == "pantry_removed":
+                self.apply_pantry_change(removed_id=args)
+
+            elif op == "recipe":
+                self.apply_recipe_change(Recipe.from_supabase(args))
+
+            elif op == "recipe_removed":
+                self.apply_recipe_change(removed_id=args)
+
+            elif op == "meal":
+                self.apply_meal_change(MealPlan.from_supabase(args))
+
+            elif op == "meal_removed":
+                self.apply_meal_change(removed_id=args)
+
+            elif op == "manual_item":
+                self.apply_manual_item_change(ShoppingItem.from_supabase(args, self.household_id))
+
+            elif op == "manual_removed":
+                self.apply_manual_item_change(removed_id=args)
+
+            elif op == "manual_checked_cleared":
+                for item in [mi for mi in self.manual_shopping_items if mi.checked]:
+                    self.apply_manual_item_change(removed_id=item.id)
+
+            else:
+                return False
+
+        return True
+
+    def _refresh_keys(self, segment: str, keys: set, recipe_ids: set = frozenset()):
+        """
+        Patch the memoized derived fields that depend on `segment`, for the
+        given name|unit keys only. Fields not computed yet are left alone
+        (they'll see the change when first read); cached data for them is
+        dropped.
+
+        Args:
+            segment: Input segment that changed
+            keys: Normalized (name, unit) keys whose inputs changed
+            recipe_ids: Extra recipes to re-check (e.g. a recipe that was edited)
+        """
+        for name, deps in VIEW_DEPENDENCIES.items():
+            if segment in deps:
+                self._views.pop(name, None)
+        for name, deps in ENCODED_DEPENDENCIES.items():
+            if segment in deps:
+                self._encoded.pop(name, None)
+
+        patched = []
+        for field, deps in DERIVED_DEPENDENCIES.items():
+            if segment in deps:
+                self._derived_cached.pop(field, None)
+                if field in self._derived:
+                    patched.append(field)
+
+        delta = self._delta
+
+        if 'reserved_ingredients' in patched:
+            reserved_ingredients = self._derived['reserved_ingredients']
+            for key in keys:
+                column = f"{key[0]}|{key[1]}"
+                old = reserved_ingredients.get(column)
+                reserved = self._reserved_for_key(key)
+                if reserved is None:
+                    reserved_ingredients.pop(column, None)
+                else:
+                    reserved_ingredients[column] = reserved
+                if delta is not None:
+                    delta.record('reserved_ingredients', column, old, column, reserved)
+
+        if 'shopping_list' in patched:
+            for key in keys:
+                old = self._auto_shopping.get(key)
+                line = self._shopping_line_for_key(key)
+                if line:
+                    self._auto_shopping[key] = line
+                else:
+                    self._auto_shopping.pop(key, None)
+                if delta is not None:
+                    # Keyed like the client keys auto lines: display name|unit
+                    delta.record('shopping_list',
+                                 old and f"{old.name}|{old.unit}", old,
+                                 line and f"{line.name}|{line.unit}", line)
+            self._derived['shopping_list'] = self._assemble_shopping_list()
+
+        if 'ready_to_cook_recipe_ids' in patched:
+            affected_recipes = set(recipe_ids)
+            for key in keys:
+                affected_recipes.update(self._recipes_by_key.get(key, ()))
+
+            for recipe_id in affected_recipes:
+                was_ready = recipe_id in self._ready_ids
+                if recipe_id in self._recipe_lookup and self._recipe_is_ready(recipe_id):
+                    self._ready_ids.add(recipe_id)
+                else:
+                    self._ready_ids.discard(recipe_id)
+                if delta is not None and was_ready != (recipe_id in self._ready_ids):
+                    delta.record('ready_to_cook_recipe_ids',
+                                 recipe_id, recipe_id if was_ready else None,
+                                 recipe_id, None if was_ready else recipe_id)
+            self._derived['ready_to_cook_recipe_ids'] = [r.id for r in self.recipes if r.id in self._ready_ids]
+
+        self.unsaved_derived.update(patched)
+        self.last_updated = datetime.now()
+
+    def _reserved_for_key(self, key: tuple) -> Optional[float]:
+        """Reserved quantity for one key, or None if no uncooked meal uses it."""
+        total = 0.0
+        found = False
+
+        for recipe_id in self._recipes_by_key.get(key, ()):
+            meals = self._meals_by_recipe.get(recipe_id)
+            if not meals:
+                continue
+            found = True
+            total += self._recipe_totals[recipe_id][key] * sum(meals.values())
+
+        return total if found else None
+
+    # ===== INDEX MAINTENANCE =====
+
+    def _index_pantry_item(self, item: PantryItem):
+        self._pantry_by_id[item.id] = item
+        self._pantry_lookup[item.norm_key].append(item)
+
+    def _unindex_pantry_item(self, item: PantryItem):
+        self._pantry_by_id.pop(item.id, None)
+        key = item.norm_key
+        bucket = self._pantry_lookup.get(key, [])
+        bucket[:] = [other for other in bucket if other is not item]
+        if not bucket:
+            self._pantry_lookup.pop(key, None)
+
+    def _restore_bucket_order(self, key: tuple):
+        """Keep items sharing a normalized key in list order so the last one wins."""
+        bucket = self._pantry_lookup.get(key)
+        if bucket and len(bucket) > 1:
+            members = {id(item) for item in bucket}
+            bucket[:] = [item for item in self.pantry_items if id(item) in members]
+
+    def _index_recipe(self, recipe: Recipe):
+        totals = defaultdict(float)
+        needs = {}
+        for ingredient in recipe.ingredients:
+            key = ingredient.norm_key
+            totals[key] += ingredient.quantity
+            column = f"{key[0]}|{key[1]}"
+            needs[column] = max(needs.get(column, ingredient.quantity), ingredient.quantity)
+
+        self._recipe_matrix = None
+        self._recipe_positions = None
+        if self._search_index is not None:
+            self._search_index.add(recipe)
+        self._recipe_lookup[recipe.id] = recipe
+        self._recipe_totals[recipe.id] = dict(totals)
+        self._recipe_needs[recipe.id] = needs
+        for key, quantity in totals.items():
+            self._recipes_by_key[key].add(recipe.id)
+            name, unit = key
+            self._recipes_by_name[name].setdefault(recipe.id, {})[unit] = quantity
+
+    def _unindex_recipe(self, recipe: Recipe):
+        self._recipe_matrix = None
+        self._recipe_positions = None
+        if self._search_index is not None:
+            self._search_index.remove(recipe.id)
+        for key in self._recipe_totals.pop(recipe.id, {}):
+            recipe_ids = self._recipes_by_key.get(key)
+            if recipe_ids is not None:
+                recipe_ids.discard(recipe.id)
+                if not recipe_ids:
+                    del self._recipes_by_key[key]
+            name = key[0]
+            uses = self._recipes_by_name.get(name)
+            if uses is not None:
+                uses.pop(recipe.id, None)
+                if not uses:
+                    del self._recipes_by_name[name]
+        self._recipe_needs.pop(recipe.id, None)
+        self._recipe_lookup.pop(recipe.id, None)
+
+    def _index_meal(self, meal: MealPlan):
+        self._meal_by_id[meal.id] = meal
+        # Skip cooked meals — they no longer reserve anything
+        if not meal.cooked:
+            self._meals_by_recipe[meal.recipe_id][meal.id] = meal.serving_multiplier
+
+    def _unindex_meal(self, meal: MealPlan):
+        self._meal_by_id.pop(meal.id, None)
+        meals = self._meals_by_recipe.get(meal.recipe_id)
+        if meals is not None:
+            meals.pop(meal.id, None)
+            if not meals:
+                del self._meals_by_recipe[meal.recipe_id]
+
+    @staticmethod
+    def _replace_in_list(items: list, old, new) -> list:
+        """Swap old for new in place (append if new, drop if new is None)."""
+        if old is None:
+            if new is not None:
+                items.append(new)
+            return items
+
+        index = next(i for i, existing in enumerate(items) if existing is old)
+        if new is None:
+            del items[index]
+        else:
+            items[index] = new
+        return items
 
     # ===== SMART FEATURES =====
 
@@ -343,44 +1128,72 @@ class HouseholdState:
         """
         Get items expiring in next N days.
 
+        A bisect over the expiration index, so any window costs
+        O(log n + k). Answers are kept per window for the rest of the day
+        and shared between callers (the dashboard asks three times) — don't
+        mutate the returned list.
+
         Args:
             days: Number of days to look ahead
 
         Returns:
-            List of expiring items with details
+            List of expiring items with details (soonest first)
         """
-        expiring = []
-        cutoff = date.today() + timedelta(days=days)
+        today = date.today()
+        if self._expiring_day != today:
+            self._expiring = {}
+            self._expiring_day = today
+        cached = self._expiring.get(days)
+        if cached is not None:
+            return cached
 
-        for item in self.pantry_items:
-            for location in item.locations:
-                if location.expiration_date and location.expiration_date <= cutoff:
-                    days_until = (location.expiration_date - date.today()).days
-                    expiring.append({
-                        "item_name": item.name,
-                        "item_id": item.id,
-                        "location": location.location,
-                        "quantity": location.quantity,
-                        "unit": item.unit,
-                        "expires_on": location.expiration_date,
-                        "expires_in_days": days_until,
-                        "is_expired": days_until < 0
-                    })
-
-        # Sort by expiration date (soonest first)
-        expiring.sort(key=lambda x: x['expires_on'])
+        dates, lots = self._get_expiry_index()
+        end = bisect_right(dates, today + timedelta(days=days))
 
+        expiring = []
+        for item, location in lots[:end]:
+            days_until = (location.expiration_date - today).days
+            expiring.append({
+                "item_name": item.name,
+                "item_id": item.id,
+                "location": location.location,
+                "quantity": location.quantity,
+                "unit": item.unit,
+                "expires_on": location.expiration_date,
+                "expires_in_days": days_until,
+                "is_expired": days_until < 0
+            })
+
+        self._expiring[days] = expiring
         return expiring
 
+    def _get_expiry_index(self) -> tuple:
+        """(sorted expiration dates, matching (item, location) lots), built once per pantry version."""
+        if self._expiry_index is None:
+            lots = [
+                (location.expiration_date, item, location)
+                for item in self.pantry_items
+                for location in item.locations
+                if location.expiration_date
+            ]
+            # Stable sort: pantry order within a date
+            lots.sort(key=lambda lot: lot[0])
+            self._expiry_index = ([lot[0] for lot in lots], [lot[1:] for lot in lots])
+        return self._expiry_index
+
     def suggest_recipes_for_expiring_items(self) -> List[dict]:
         """
         Smart suggestions: Recipes that use expiring ingredients.
 
-        This makes the app feel ALIVE and intelligent!
+        This makes the app feel ALIVE and intelligent! Memoized as the
+        'expiring_suggestions' view.
 
         Returns:
             List of suggestions with expiring item and matching recipes
         """
+        return self.view('expiring_suggestions', HouseholdState._calculate_expiring_suggestions)
+
+    def _calculate_expiring_suggestions(self) -> List[dict]:
         expiring = self.get_expiring_soon(days=3)
         suggestions = []
         seen_items = set()
@@ -391,18 +1204,21 @@ class HouseholdState:
                 continue
             seen_items.add(exp_item['item_name'])
 
-            # Find recipes that use this ingredient
+            # Find recipes that use this ingredient (inverted index lookup),
+            # listed in recipe order - the index's own order changes with edits
+            name, unit = self._pantry_by_id[exp_item['item_id']].norm_key
+            uses = self._recipes_by_name.get(name, {})
             matching_recipes = []
-            for recipe in self.recipes:
-                for ingredient in recipe.ingredients:
-                    if normalize_name(ingredient.name) == normalize_name(exp_item['item_name']):
-                        matching_recipes.append({
-                            "id": recipe.id,
-                            "name": recipe.name,
-                            "tags": recipe.tags,
-                            "ready_to_cook": recipe.id in self.ready_to_cook_recipe_ids
-                        })
-                        break
+            for recipe_id in sorted(uses, key=self._recipe_position_map().__getitem__):
+                recipe = self._recipe_lookup[recipe_id]
+                quantities = uses[recipe_id]
+                matching_recipes.append({
+                    "id": recipe.id,
+                    "name": recipe.name,
+                    "tags": recipe.tags,
+                    "ready_to_cook": self.is_ready_to_cook(recipe.id),
+                    "quantity_needed": quantities.get(unit)
+                })
 
             if matching_recipes:
                 suggestions.append({
@@ -415,6 +1231,133 @@ class HouseholdState:
 
         return suggestions
 
+    def _recipe_position_map(self) -> Dict[str, int]:
+        """recipe_id -> index in self.recipes."""
+        if self._recipe_positions is None:
+            self._recipe_positions = {recipe.id: i for i, recipe in enumerate(self.recipes)}
+        return self._recipe_positions
+
+    def recipes_using(self, ingredient_name: str) -> Dict[str, Dict[str, float]]:
+        """
+        Recipes that use an ingredient, from the inverted index.
+
+        Returns:
+            recipe_id -> normalized unit -> quantity the recipe needs
+        """
+        return self._recipes_by_name.get(normalize_name(ingredient_name), {})
+
+    def search_index(self) -> RecipeSearchIndex:
+        """
+        The full-text index over the recipes, built now if it isn't yet.
+
+        A search arriving while the background build runs waits for that
+        build rather than starting another.
+        """
+        index = self._search_index
+        if index is None:
+            with self._search_index_lock:
+                if self._search_index is None:
+                    self._search_index = RecipeSearchIndex(self.recipes)
+                index = self._search_index
+        return index
+
+    def adopt_search_index(self, other: 'HouseholdState') -> bool:
+        """
+        Share another state's search index if it covers the very same recipe
+        models (a reload that kept the recipes segment). The index is copied
+        before this state's first recipe write, like a copy()'s.
+
+        Returns:
+            True if the index was adopted
+        """
+        index = other._search_index
+        if (index is None or len(other.recipes) != len(self.recipes)
+                or any(a is not b for a, b in zip(other.recipes, self.recipes))):
+            return False
+        self._search_index = index
+        self._shared_segments.add('recipes')
+        return True
+
+    def search_recipes(
+        self,
+        query: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        ready_only: bool = False,
+        has_ingredients: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> tuple:
+        """
+        Ranked recipe search over the full-text index.
+
+        Filters narrow by set intersection (tags and ingredients each match
+        any of the given values); a text query ranks by relevance, otherwise
+        recipe order is kept.
+
+        Returns:
+            (page of (recipe, score) pairs, total matches before paging);
+            score is None when there is no text query
+        """
+        index = self.search_index()
+
+        candidates: Optional[set] = None
+
+        def narrow(ids):
+            nonlocal candidates
+            candidates = set(ids) if candidates is None else candidates & set(ids)
+
+        if tags:
+            narrow(index.with_tags(tags))
+        if has_ingredients:
+            narrow(rid for ingredient in has_ingredients for rid in self.recipes_using(ingredient))
+        if ready_only:
+            self._derived_value('ready_to_cook_recipe_ids')  # fills _ready_ids
+            narrow(self._ready_ids)
+
+        end = None if limit is None else offset + limit
+        if query and query.strip():
+            # Scores only as far as the requested page needs
+            scores, total = index.match(query, top=end, within=candidates)
+            ranked = index.rank(scores)[offset:end]
+            return [(self._recipe_lookup[rid], round(scores[rid], 3)) for rid in ranked], total
+
+        if candidates is not None:
+            hits = [(recipe, None) for recipe in self.recipes if recipe.id in candidates]
+        else:
+            hits = [(recipe, None) for recipe in self.recipes]
+        return hits[offset:end], len(hits)
+
+    def get_recipe_availability(self) -> List[dict]:
+        """
+        How close every recipe is to being cookable.
+
+        Uses the same on-hand-minus-reserved rule as ready-to-cook.
+
+        Returns:
+            One entry per recipe (in recipe order): recipe_id,
+            percent_available (share of its ingredients covered) and missing
+            ("name|unit" -> quantity short)
+        """
+        if self._use_recipe_matrix():
+            matrix = self._get_recipe_matrix()
+            return matrix.availability(matrix.supply_vector(self._available_for_key))
+
+        availability = []
+        for recipe in self.recipes:
+            needs = self._recipe_needs.get(recipe.id, {})
+            missing = {}
+            for key, quantity in needs.items():
+                supply = self._available_for_key(key)
+                if supply < quantity:
+                    missing[key] = round(quantity - supply, 2)
+            percent = (len(needs) - len(missing)) * 100 / len(needs) if needs else 100
+            availability.append({
+                "recipe_id": recipe.id,
+                "percent_available": round(percent),
+                "missing": missing
+            })
+        return availability
+
     def validate_can_cook_meal(self, meal_id: str) -> dict:
         """
         Validate if a meal can be cooked with current pantry.
@@ -454,11 +1397,14 @@ class HouseholdState:
 
     def get_pantry_health(self) -> dict:
         """
-        Overall pantry health score.
+        Overall pantry health score (memoized as the 'pantry_health' view).
 
         Returns:
             Health metrics and score
         """
+        return self.view('pantry_health', HouseholdState._calculate_pantry_health)
+
+    def _calculate_pantry_health(self) -> dict:
         total_items = len(self.pantry_items)
         below_threshold = sum(
             1 for item in self.pantry_items
@@ -487,179 +1433,1461 @@ class HouseholdState:
 
     def _find_pantry_item(self, name: str, unit: str) -> Optional[PantryItem]:
         """Find pantry item by name and unit — O(1) normalized lookup"""
-        return self._pantry_lookup.get((normalize_name(name), normalize_unit(unit)))
+        return self._pantry_item_for_key(normalize_name(name), normalize_unit(unit))
+
+    def _pantry_item_for_key(self, name: str, unit: str) -> Optional[PantryItem]:
+        """Find pantry item by an already-normalized name and unit"""
+        items = self._pantry_lookup.get((name, unit))
+        return items[-1] if items else None
 
     def _get_recipe(self, recipe_id: str) -> Optional[Recipe]:
         """Get recipe by ID — O(1) dictionary lookup"""
         return self._recipe_lookup.get(recipe_id)
 
 
+class StateDelta:
+    """
+    What patching a change added, changed and removed, per collection.
+
+    Pass one to update_and_apply() to have HouseholdState.apply_change fill
+    it in. Collections are the HouseholdState attributes the routes return
+    (pantry_items, recipes, meal_plans, shopping_list,
+    ready_to_cook_recipe_ids, reserved_ingredients). Entities are keyed the
+    way the client keys them: by ID, by name|unit for reserved ingredients
+    and for auto-generated shopping lines (which have no ID).
+
+    `applied` stays False when the state was reloaded instead of patched —
+    there is no delta then, send the full lists.
+    """
+
+    # Collections sent as key -> value (their values don't carry the key)
+    KEYED = {'reserved_ingredients'}
+
+    def __init__(self):
+        self.applied = False
+        self._collections: Dict[str, dict] = {}
+
+    def record(self, collection: str, old_key, old, new_key, new):
+        """One entity went from old to new (None: absent) — a no-op if nothing changed."""
+        if old is not None and (new is None or old_key != new_key):
+            self._remove(collection, old_key)
+        if new is not None:
+            if old is None or old_key != new_key:
+                self._upsert(collection, new_key, new, existed=False)
+            elif new != old:
+                self._upsert(collection, new_key, new, existed=True)
+
+    def _entry(self, collection: str) -> dict:
+        return self._collections.setdefault(collection, {"added": {}, "changed": {}, "removed": set()})
+
+    def _upsert(self, collection: str, key, value, existed: bool):
+        entry = self._entry(collection)
+        if key in entry["added"]:
+            entry["added"][key] = value
+        elif existed or key in entry["removed"]:
+            entry["removed"].discard(key)
+            entry["changed"][key] = value
+        else:
+            entry["added"][key] = value
+
+    def _remove(self, collection: str, key):
+        entry = self._entry(collection)
+        if key in entry["added"]:
+            del entry["added"][key]
+        else:
+            entry["changed"].pop(key, None)
+            entry["removed"].add(key)
+
+    def to_dict(self) -> dict:
+        """collection -> {"added", "changed", "removed"}; collections without changes are left out."""
+        changes = {}
+        for collection, entry in self._collections.items():
+            if not (entry["added"] or entry["changed"] or entry["removed"]):
+                continue
+            if collection in self.KEYED:
+                added, changed = entry["added"], entry["changed"]
+            else:
+                added, changed = list(entry["added"].values()), list(entry["changed"].values())
+            changes[collection] = {"added": added, "changed": changed, "removed": sorted(entry["removed"])}
+        return changes
+
+
+class StateChange:
+    """
+    The rows a mutation wrote, so the cached state can be patched in place.
+
+    Update callbacks passed to StateManager.update_and_apply return one of
+    these instead of a bare result:
+
+        def update():
+            rows = db.pantry.create_item(data)
+            return StateChange(result=rows[0]['id']).pantry_item(rows[0], locations=[])
+
+    Rows are the dicts the provider returned (same shape as the loaders see).
+    Call rebuild() when the write can't be described row by row — the cache
+    is then invalidated and the next read reloads from the database.
+    """
+
+    # Op name prefix -> cache segment it modifies
+    OP_SEGMENTS = {'pantry': 'pantry', 'recipe': 'recipes', 'meal': 'meals', 'manual': 'manual'}
+
+    def __init__(self, result=None):
+        self.result = result
+        self.ops: List[tuple] = []
+        self.patchable = True
+        self._rebuild_segments: set = set()
+
+    @property
+    def segments(self) -> set:
+        """Cache segments this change touches (all of them if unknown)."""
+        touched = {self.OP_SEGMENTS[op.split('_', 1)[0]] for op, _ in self.ops}
+        touched |= self._rebuild_segments
+        if not touched and not self.patchable:
+            return set(SEGMENTS)
+        return touched
+
+    def pantry_item(self, row: dict, locations: Optional[List[dict]] = None) -> 'StateChange':
+        """Item row was inserted/updated. locations=None keeps cached locations."""
+        self.ops.append(("pantry_item", (row, locations)))
+        return self
+
+    def pantry_locations(self, item_id: str, rows: List[dict]) -> 'StateChange':
+        """All locations of an item were replaced."""
+        self.ops.append(("pantry_locations", (item_id, rows)))
+        return self
+
+    def pantry_location(self, item_id: str, row: dict) -> 'StateChange':
+        """One location of an item was inserted/updated."""
+        self.ops.append(("pantry_location", (item_id, row)))
+        return self
+
+    def pantry_removed(self, item_id: str) -> 'StateChange':
+        self.ops.append(("pantry_removed", item_id))
+        return self
+
+    def recipe(self, row: dict) -> 'StateChange':
+        self.ops.append(("recipe", row))
+        return self
+
+    def recipe_removed(self, recipe_id: str) -> 'StateChange':
+        self.ops.append(("recipe_removed", recipe_id))
+        return self
+
+    def meal(self, row: dict) -> 'StateChange':
+        self.ops.append(("meal", row))
+        return self
+
+    def meal_removed(self, meal_id: str) -> 'StateChange':
+        self.ops.append(("meal_removed", meal_id))
+        return self
+
+    def manual_item(self, row: dict) -> 'StateChange':
+        self.ops.append(("manual_item", row))
+        return self
+
+    def manual_removed(self, item_id: str) -> 'StateChange':
+        self.ops.append(("manual_removed", item_id))
+        return self
+
+    def manual_checked_cleared(self) -> 'StateChange':
+        """Every checked manual item was deleted."""
+        self.ops.append(("manual_checked_cleared", None))
+        return self
+
+    def rebuild(self, *segments: str) -> 'StateChange':
+        """
+        Give up on patching — invalidate and reload instead.
+
+        Args:
+            segments: Cache segments to reload (default: everything this
+                change touches, or all segments if it has no ops)
+        """
+        self.patchable = False
+        self._rebuild_segments.update(segments)
+        return self
+
+
 class StateManager:
     """
     Manages state for all households with intelligent caching.
 
     This is the API that endpoints use.
+
+    The cache is split into segments (pantry, recipes, meals, manual items)
+    plus the derived results, each under its own Redis key. Every segment has
+    its own version counter, bumped on every write to it; a cached segment
+    whose version doesn't match its counter is reloaded from the database on
+    its own, and derived fields are recomputed only when a segment they
+    depend on moved.
+
+    Writes go through update_and_apply(): a copy of the cached state is
+    patched with the rows the write returned, the touched segments are
+    stored again (write-through) and the copy replaces the cached state,
+    so the response and the next read don't pay for a reload. A state
+    other requests can see is never patched in place.
+
+    In front of Redis sits a bounded in-process LRU (L1) of live
+    HouseholdState objects. An L1 entry is served as long as its segment
+    versions match the counters in Redis — one small MGET instead of
+    decoding and validating every entity. Without Redis the L1 is the
+    cache: versions are kept in-process.
+
+    Freshness is stale-while-revalidate: state older than SOFT_TTL is still
+    served, and a background refresh re-reads it from the database. Only
+    explicit invalidation (a version bump) or HARD_TTL forces a reload on
+    the request path. The age of the served state is reported back in the
+    X-State-Age response header.
     """
 
-    CACHE_TTL = 300  # 5 minutes
+    SOFT_TTL = 300  # 5 minutes - serve, refresh in background
+    HARD_TTL = 3600  # 1 hour - reload before serving
+    L1_MAX_HOUSEHOLDS = 256
+    LOAD_LOCK_LEASE = 10  # seconds a worker may hold a household's load lock
+    LOAD_WAIT = 5  # seconds to wait for another load before loading anyway
+
+    # In-process state: household_id -> HouseholdState (most recently used last)
+    _l1: 'OrderedDict[str, HouseholdState]' = OrderedDict()
+    _l1_lock = threading.Lock()
+    # Version counters when Redis is unavailable: household_id -> segment -> version.
+    # Kept when a household leaves L1: ETags are built from them, so they only go up
+    _local_versions: Dict[str, Dict[str, int]] = {}
+    # Loads in progress in this process: household_id -> Future[HouseholdState]
+    _inflight: Dict[str, Future] = {}
+    # Background refreshes queued or running: household_ids
+    _refreshing: set = set()
+    # Derived-field write-backs queued or running: household_ids
+    _storing_derived: set = set()
+    _refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="state-refresh")
+
+    # ETags embed an epoch token so version counters that start over (Redis
+    # flushed, or in-process counters after a restart) can't repeat old tags
+    ETAG_EPOCH_KEY = "state_epoch"
+    ETAG_EPOCH_TTL = 60  # seconds before the token is re-read from Redis
+    _local_epoch = uuid.uuid4().hex[:12]
+    _etag_epoch: Optional[tuple] = None  # (token, monotonic time read)
+
+    @staticmethod
+    def _segment_key(household_id: str, segment: str) -> str:
+        return f"state:{household_id}:{segment}"
+
+    @staticmethod
+    def _version_key(household_id: str, segment: str) -> str:
+        return f"state_version:{household_id}:{segment}"
+
+    @staticmethod
+    def _lock_key(household_id: str) -> str:
+        return f"state_lock:{household_id}"
 
     @classmethod
     def get_state(cls, household_id: str) -> HouseholdState:
         """
         Get state for household.
 
-        Checks cache first, loads from DB if needed.
+        Checks the in-process cache, then Redis, and loads only missing or
+        outdated segments from DB. Concurrent misses for the same household
+        share one load (single-flight).
         """
-        # Try cache
-        if redis_client:
-            cache_key = f"state:{household_id}"
-            try:
-                cached_data = redis_client.get(cache_key)
+        local = cls._l1_get(household_id)
+        if local is not None and local.versions == cls._read_versions(household_id):
+            logger.debug(f"⚡ L1 HIT for household {household_id}")
+            return cls._serve(local)
 
-                if cached_data:
-                    logger.info(f"💰 Cache HIT for household {household_id}")
-                    return HouseholdState.from_cache_dict(json.loads(cached_data))
-            except Exception as e:
-                logger.warning(f"Cache read error: {e}")
+        state = cls._single_flight(household_id, lambda: cls._build_state(household_id, local))
+        return cls._serve(state)
+
+    @classmethod
+    def _serve(cls, state: HouseholdState) -> HouseholdState:
+        """
+        Report the state's age for this request and refresh it if past SOFT_TTL.
 
-        # Load from database
-        logger.info(f"📀 Cache MISS - Loading household {household_id} from database")
-        state = cls._load_from_database(household_id)
+        Derived fields computed by earlier requests (they're calculated on
+        first access, after the state was cached) are written back in the
+        background here.
+        """
+        age = state.age
+        meta = _request_meta.get()
+        if meta is not None:
+            meta["state_age"] = max(meta.get("state_age", 0), age)
+        if age > cls.SOFT_TTL:
+            cls._schedule_refresh(state)
+        elif state.unsaved_derived and redis_client:
+            cls._schedule_derived_store(state)
+        return state
 
-        # Cache it
-        if redis_client:
-            cache_key = f"state:{household_id}"
+    @classmethod
+    def _single_flight(cls, household_id: str, build):
+        """
+        Run `build` once per household at a time in this process.
+
+        The first caller builds; callers arriving meanwhile wait for its
+        result. A waiter only takes the shared result if it's still current
+        (a write may have landed while the build was running).
+        """
+        with cls._l1_lock:
+            flight = cls._inflight.get(household_id)
+            leader = flight is None
+            if leader:
+                flight = cls._inflight[household_id] = Future()
+
+        if not leader:
+            logger.info(f"⏳ Waiting for in-flight load of household {household_id}")
             try:
-                redis_client.setex(
-                    cache_key,
-                    cls.CACHE_TTL,
-                    json.dumps(state.to_cache_dict())
-                )
-                logger.info(f"💾 Cached state for household {household_id}")
+                state = flight.result(timeout=cls.LOAD_WAIT)
+                if state.versions == cls._read_versions(household_id):
+                    return state
             except Exception as e:
-                logger.warning(f"Cache write error: {e}")
+                logger.warning(f"In-flight load failed, loading again: {e}")
+            return build()
+
+        try:
+            state = build()
+            flight.set_result(state)
+            return state
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with cls._l1_lock:
+                if cls._inflight.get(household_id) is flight:
+                    del cls._inflight[household_id]
 
-        return state
+    @classmethod
+    def _build_state(cls, household_id: str, local: Optional[HouseholdState]) -> HouseholdState:
+        """Assemble state from L1 leftovers, Redis and (for the rest) the database."""
+        if local is None:
+            # One round-trip for every segment and counter
+            segments, versions, derived, loaded_at = cls._read_cache(household_id, list(SEGMENTS))
+        else:
+            versions = cls._read_versions(household_id)
+            segments, loaded_at = cls._l1_leftovers(local, versions)
+            stale = [seg for seg in SEGMENTS if seg not in segments]
+            cached, _, derived, cached_loaded_at = cls._read_cache(household_id, stale, versions)
+            segments.update(cached)
+            loaded_at.update(cached_loaded_at)
+
+        missing = [seg for seg in SEGMENTS if seg not in segments]
+        if not missing:
+            logger.info(f"💰 Cache HIT for household {household_id}")
+            state = cls._assemble(household_id, segments, versions, derived, loaded_at)
+            cls._l1_put(state)
+            return state
+
+        lock = cls._acquire_load_lock(household_id)
+        try:
+            if lock is not None and lock.waited:
+                # Another worker just loaded this household - use what it cached
+                cached, _, fresh_derived, cached_loaded_at = cls._read_cache(household_id, missing, versions)
+                segments.update(cached)
+                loaded_at.update(cached_loaded_at)
+                derived = fresh_derived or derived
+                missing = [seg for seg in missing if seg not in cached]
+
+            if missing:
+                # Load from database
+                logger.info(f"📀 Cache MISS ({', '.join(missing)}) - Loading household {household_id} from database")
+                loaded = cls._load_segments(household_id, missing)
+                derived = cls._merge_loaded(segments, loaded_at, derived, loaded)
+
+            state = cls._assemble(household_id, segments, versions, derived, loaded_at)
+
+            # Cache what we had to load
+            if missing:
+                cls._store(state, missing)
+            cls._l1_put(state)
+            return state
+        finally:
+            cls._release_load_lock(lock)
+
+    @staticmethod
+    def _l1_leftovers(local: HouseholdState, versions: Dict[str, int]):
+        """Segments of an L1 state that are still current (no need to decode them again)."""
+        segments = {
+            seg: list(getattr(local, attribute))
+            for seg, (attribute, _) in SEGMENTS.items()
+            if local.versions[seg] == versions[seg]
+        }
+        loaded_at = {seg: local.loaded_at[seg] for seg in segments}
+        return segments, loaded_at
+
+    @staticmethod
+    def _merge_loaded(segments: dict, loaded_at: dict, derived: Optional[dict], loaded: dict) -> Optional[dict]:
+        """Add freshly loaded segments; returns derived minus what they invalidate."""
+        segments.update(loaded)
+        loaded_at.update(dict.fromkeys(loaded, time.time()))
+        if not derived:
+            return derived
+        # Past HARD_TTL a reload can differ at the same version -
+        # don't reuse derived fields computed from the old rows
+        return dict(derived, versions={
+            seg: v for seg, v in derived.get("versions", {}).items() if seg not in loaded
+        })
 
     @classmethod
-    def _load_from_database(cls, household_id: str) -> HouseholdState:
-        """Load all data from database in parallel for faster cache misses."""
-        db = get_db()
+    def _acquire_load_lock(cls, household_id: str):
+        """
+        Take the cross-worker load lock for a household (short lease).
+
+        Returns the lock with `.waited` set if another worker held it first,
+        or None without Redis / when waiting timed out (load anyway).
+        """
+        if not redis_client:
+            return None
+        try:
+            lock = redis_client.lock(cls._lock_key(household_id), timeout=cls.LOAD_LOCK_LEASE)
+            lock.waited = False
+            if lock.acquire(blocking=False):
+                return lock
+
+            logger.info(f"⏳ Household {household_id} is being loaded by another worker, waiting")
+            lock.waited = True
+            if lock.acquire(blocking=True, blocking_timeout=cls.LOAD_WAIT):
+                return lock
+        except Exception as e:
+            logger.warning(f"Cache lock error: {e}")
+        return None
+
+    @staticmethod
+    def _release_load_lock(lock):
+        if lock is None:
+            return
+        try:
+            lock.release()
+        except Exception as e:
+            # Lease expired - someone else may hold it now, nothing to undo
+            logger.warning(f"Cache lock release error: {e}")
+
+    # ===== STALE-WHILE-REVALIDATE =====
+
+    @classmethod
+    def _schedule_refresh(cls, state: HouseholdState):
+        """Queue a background refresh of a state past SOFT_TTL (once per household)."""
+        with cls._l1_lock:
+            if state.household_id in cls._refreshing:
+                return
+            cls._refreshing.add(state.household_id)
+
+        logger.info(f"🔁 State for household {state.household_id} is {state.age:.0f}s old - refreshing in background")
+        cls._refresh_executor.submit(cls._refresh, state)
 
-        def load_pantry():
+    @classmethod
+    def _schedule_derived_store(cls, state: HouseholdState):
+        """Queue a write of the state's newly computed derived fields (once per household)."""
+        with cls._l1_lock:
+            if state.household_id in cls._storing_derived:
+                return
+            cls._storing_derived.add(state.household_id)
+
+        def store():
             try:
-                rows = db.pantry.get_items_with_locations(household_id)
-                items = []
-                for item_data in rows:
-                    locations = item_data.pop('pantry_locations', [])
-                    items.append(PantryItem.from_supabase(item_data, locations))
-                return items
-            except Exception as e:
-                logger.warning(f"Could not load pantry items: {e}")
-                return []
+                cls._store(state, [])
+            finally:
+                with cls._l1_lock:
+                    cls._storing_derived.discard(state.household_id)
+
+        cls._refresh_executor.submit(store)
+
+    @classmethod
+    def _refresh(cls, state: HouseholdState):
+        """
+        Re-read the segments of `state` older than SOFT_TTL from the database.
+
+        Segments whose data is unchanged keep their version and only get a
+        new load time. Changed segments get a version bump, so every worker
+        drops its copy. Gives up (leaving the next request to reload) if a
+        write lands meanwhile or another worker holds the load lock.
+        """
+        household_id = state.household_id
+        lock = None
+        try:
+            if redis_client:
+                lock = redis_client.lock(cls._lock_key(household_id), timeout=cls.LOAD_LOCK_LEASE)
+                if not lock.acquire(blocking=False):
+                    logger.info(f"⏭️ Household {household_id} is being loaded elsewhere - skipping refresh")
+                    lock = None
+                    return
+
+            versions = cls._read_versions(household_id)
+            if versions != state.versions:
+                return
+
+            stale = [seg for seg in SEGMENTS if time.time() - state.loaded_at[seg] > cls.SOFT_TTL]
+            segments = {seg: list(getattr(state, attribute)) for seg, (attribute, _) in SEGMENTS.items()}
+            loaded_at = dict(state.loaded_at)
+
+            # Another worker may have refreshed some of them already
+            cached, _, _, cached_loaded_at = cls._read_cache(household_id, stale, versions)
+            for seg in stale:
+                if seg in cached and time.time() - cached_loaded_at[seg] <= cls.SOFT_TTL:
+                    segments[seg] = cached[seg]
+                    loaded_at[seg] = cached_loaded_at[seg]
+            reload = [seg for seg in stale if loaded_at[seg] == state.loaded_at[seg]]
+
+            if reload:
+                logger.info(f"🔁 Refreshing {', '.join(reload)} for household {household_id} from database")
+                segments.update(cls._load_segments(household_id, reload, strict=True))
+                loaded_at.update(dict.fromkeys(reload, time.time()))
+
+            changed = [seg for seg in reload if segments[seg] != getattr(state, SEGMENTS[seg][0])]
+            if changed:
+                new_versions = cls._bump_versions(household_id, changed)
+                if new_versions is None or any(new_versions[seg] != versions[seg] + 1 for seg in changed):
+                    # A write raced the refresh - let the next read reload
+                    cls._drop_segments(household_id, changed)
+                    cls._l1_evict(household_id)
+                    return
+                versions.update(new_versions)
+                logger.info(f"🔁 {', '.join(changed)} changed outside the app for household {household_id}")
+
+            fresh = cls._assemble(household_id, segments, versions, state.derived_to_cache(), loaded_at)
+            cls._store(fresh, reload)
+            cls._l1_put(fresh)
+        except Exception as e:
+            logger.warning(f"Background refresh failed for household {household_id}: {e}")
+        finally:
+            cls._release_load_lock(lock)
+            with cls._l1_lock:
+                cls._refreshing.discard(household_id)
+
+    @staticmethod
+    def track_request(client_id: Optional[str] = None) -> dict:
+        """
+        Start collecting state metadata for the current request.
 
-        def load_recipes():
+        Args:
+            client_id: The caller's X-Client-Id, stamped on the state events
+                its writes publish
+
+        Returns the dict StateManager fills in (state_age: seconds since the
+        served state was read from the database).
+        """
+        meta = {"client_id": client_id}
+        _request_meta.set(meta)
+        return meta
+
+    @classmethod
+    def _read_versions(cls, household_id: str) -> Dict[str, int]:
+        """Current segment version counters (from Redis, or in-process without it)."""
+        if redis_client:
             try:
-                rows = db.recipes.get_all(household_id)
-                return [Recipe.from_supabase(r) for r in rows]
+                counters = redis_client.mget([cls._version_key(household_id, seg) for seg in SEGMENTS])
+                return {seg: int(v or 0) for seg, v in zip(SEGMENTS, counters)}
             except Exception as e:
-                logger.warning(f"Could not load recipes: {e}")
-                return []
+                logger.warning(f"Cache version read error: {e}")
+
+        with cls._l1_lock:
+            return dict(cls._local_versions.get(household_id) or dict.fromkeys(SEGMENTS, 0))
+
+    @classmethod
+    def _read_cache(cls, household_id: str, names: List[str], versions: Optional[Dict[str, int]] = None):
+        """
+        Read the given segments (plus derived results) in one round-trip.
+
+        Args:
+            household_id: Household to read
+            names: Segments to read
+            versions: Known version counters; read alongside the blobs if None
+
+        Returns:
+            (segments, versions, derived, loaded_at) — segments maps name ->
+            models for the segments that are cached, current and younger than
+            HARD_TTL; versions maps name -> counter; derived is the raw
+            derived dict or None; loaded_at maps name -> load time of the
+            returned segments.
+        """
+        if not redis_client:
+            return {}, versions or cls._read_versions(household_id), None, {}
 
-        def load_meals():
+        try:
+            values = redis_client.mget(cls._cache_keys(household_id, names, versions is None))
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+            values = None
+        return cls._decode_cache(household_id, names, versions, values)
+
+    @classmethod
+    def _cache_keys(cls, household_id: str, names: List[str], with_versions: bool) -> List[str]:
+        """Keys for one read: the segment blobs, derived, and optionally all counters."""
+        keys = [cls._segment_key(household_id, seg) for seg in names]
+        keys.append(cls._segment_key(household_id, 'derived'))
+        if with_versions:
+            keys.extend(cls._version_key(household_id, seg) for seg in SEGMENTS)
+        return keys
+
+    @classmethod
+    def _decode_cache(cls, household_id: str, names: List[str], versions: Optional[Dict[str, int]], values):
+        """Turn the MGET result of _cache_keys() into (segments, versions, derived, loaded_at)."""
+        read_versions = versions is None
+        versions = dict.fromkeys(SEGMENTS, 0) if read_versions else versions
+        segments = {}
+        loaded_at = {}
+        derived = None
+
+        if values is None:
+            return segments, versions, derived, loaded_at
+
+        blobs = values[:len(names)]
+        derived_blob = values[len(names)]
+        if read_versions:
+            for seg, counter in zip(SEGMENTS, values[len(names) + 1:]):
+                versions[seg] = int(counter or 0)
+
+        for seg, blob in zip(names, blobs):
+            if not blob:
+                continue
             try:
-                rows = db.meal_plans.get_active(household_id, date.today().isoformat())
-                plans = []
-                for meal_data in rows:
-                    try:
-                        plans.append(MealPlan.from_supabase(meal_data))
-                    except Exception as e:
-                        logger.warning(f"Could not parse meal plan: {e}")
-                return plans
+                data = cache_codec.decode(blob)
+                if data.get("version") != versions[seg]:
+                    logger.info(f"⏭️ Stale {seg} segment (v{data.get('version')}, current v{versions[seg]}) for household {household_id}")
+                    continue
+                if time.time() - data["loaded_at"] > cls.HARD_TTL:
+                    logger.info(f"⏭️ Expired {seg} segment for household {household_id}")
+                    continue
+                segments[seg] = HouseholdState.segment_from_cache(seg, data)
+                loaded_at[seg] = data["loaded_at"]
+            except CacheCodecError as e:
+                logger.info(f"⏭️ Rejected cached {seg} segment for household {household_id}: {e}")
             except Exception as e:
-                logger.warning(f"Could not load meal plans: {e}")
-                return []
+                logger.warning(f"Cache decode error ({seg}): {e}")
 
-        def load_shopping():
+        if derived_blob:
             try:
-                rows = db.shopping.get_manual_items(household_id)
-                return [
-                    ShoppingItem(
-                        id=str(item['id']),
-                        name=item['name'],
-                        quantity=item['quantity'],
-                        unit=item['unit'],
-                        category=item.get('category', 'Other'),
-                        source="Manual",
-                        checked=item.get('checked', False),
-                        checked_at=item.get('checked_at'),
-                        checked_by=item.get('checked_by'),
-                        household_id=household_id
-                    )
-                    for item in rows
-                ]
+                derived = cache_codec.decode(derived_blob)
+            except CacheCodecError as e:
+                logger.info(f"⏭️ Rejected cached derived fields for household {household_id}: {e}")
             except Exception as e:
-                logger.warning(f"Manual shopping items not loaded: {e}")
-                return []
+                logger.warning(f"Cache decode error (derived): {e}")
+
+        return segments, versions, derived, loaded_at
 
-        # Run all 4 queries in parallel (limited by slowest query, not sum)
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            pantry_future = executor.submit(load_pantry)
-            recipes_future = executor.submit(load_recipes)
-            meals_future = executor.submit(load_meals)
-            shopping_future = executor.submit(load_shopping)
+    # ===== L1 (IN-PROCESS) CACHE =====
 
-            pantry_items = pantry_future.result()
-            recipes = recipes_future.result()
-            meal_plans = meals_future.result()
-            manual_shopping_items = shopping_future.result()
+    @classmethod
+    def _l1_get(cls, household_id: str) -> Optional[HouseholdState]:
+        """Live state from the in-process LRU, or None if absent/expired."""
+        with cls._l1_lock:
+            state = cls._l1.get(household_id)
+            if state is None:
+                return None
+            if state.age > cls.HARD_TTL:
+                del cls._l1[household_id]
+                return None
+            cls._l1.move_to_end(household_id)
+            return state
+
+    @classmethod
+    def _l1_put(cls, state: HouseholdState):
+        """
+        Remember a live state, evicting the least recently used household.
+
+        A state without a search index takes over the previous one's when
+        the recipes are the same, or gets it built in the background - so
+        the first search doesn't pay for it.
+        """
+        with cls._l1_lock:
+            previous = cls._l1.get(state.household_id)
+            cls._l1[state.household_id] = state
+            cls._l1.move_to_end(state.household_id)
+            while len(cls._l1) > cls.L1_MAX_HOUSEHOLDS:
+                cls._l1.popitem(last=False)
+
+        if state._search_index is None and state.recipes:
+            if previous is None or not state.adopt_search_index(previous):
+                cls._refresh_executor.submit(cls._build_search_index, state)
+
+    @staticmethod
+    def _build_search_index(state: HouseholdState):
+        try:
+            start = time.perf_counter()
+            state.search_index()
+            logger.debug(f"🔎 Search index for household {state.household_id} built in "
+                         f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"Search index build failed for household {state.household_id}: {e}")
+
+    @classmethod
+    def _l1_evict(cls, household_id: str):
+        with cls._l1_lock:
+            cls._l1.pop(household_id, None)
+
+    @staticmethod
+    def _assemble(household_id: str, segments: dict, versions: dict, derived: Optional[dict], loaded_at: dict):
+        """
+        Build a HouseholdState from segment models, reusing cached derived
+        fields whose inputs haven't moved. Nothing is calculated here —
+        missing derived fields are computed when first read.
+        """
+        state = HouseholdState(
+            household_id=household_id,
+            pantry_items=segments['pantry'],
+            recipes=segments['recipes'],
+            meal_plans=segments['meals'],
+            manual_shopping_items=segments['manual']
+        )
+        state.versions = dict(versions)
+        state.loaded_at = dict(loaded_at)
+        state.restore_derived(derived)
+        return state
+
+    @classmethod
+    def _get_cached_state(cls, household_id: str) -> Optional[HouseholdState]:
+        """Cached state if every segment is cached and current (no DB fallback), or None."""
+        local = cls._l1_get(household_id)
+        if local is not None and local.versions == cls._read_versions(household_id):
+            return local
+
+        segments, versions, derived, loaded_at = cls._read_cache(household_id, list(SEGMENTS))
+        if len(segments) < len(SEGMENTS):
+            return None
+        return cls._assemble(household_id, segments, versions, derived, loaded_at)
+
+    @classmethod
+    def _store(cls, state: HouseholdState, segments):
+        """
+        Write the given segments to Redis with the standard TTL, plus the
+        derived fields if any were computed or patched since last written.
+        """
+        if not redis_client:
+            return
+        try:
+            snapshot = state.copy()
+            entries = cls._cache_entries(snapshot, segments)
+            if not entries:
+                return
+            pipe = redis_client.pipeline(transaction=False)
+            for key, blob in entries:
+                pipe.setex(key, cls.HARD_TTL, blob)
+            pipe.execute()
+            # Only what was written is saved; fields computed since stay marked
+            state.unsaved_derived.difference_update(snapshot.unsaved_derived)
+            logger.info(f"💾 Cached {', '.join(segments) or 'derived'} for household {state.household_id} "
+                        f"(versions {state.versions})")
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+
+    @classmethod
+    def _cache_entries(cls, snapshot: HouseholdState, segments) -> list:
+        """
+        Encoded (key, blob) pairs for the given segments and the unsaved
+        derived fields. Reads `snapshot` only: pass a copy (see
+        HouseholdState.copy) nothing else touches, so encoding can run on
+        another thread while the state keeps serving reads.
+        """
+        entries = [
+            (cls._segment_key(snapshot.household_id, seg), cache_codec.encode(snapshot.segment_to_cache(seg)))
+            for seg in segments
+        ]
+        if snapshot.unsaved_derived:
+            entries.append((cls._segment_key(snapshot.household_id, 'derived'),
+                            cache_codec.encode(snapshot.derived_to_cache())))
+        return entries
+
+    @classmethod
+    def _bump_versions(cls, household_id: str, segments) -> Optional[Dict[str, int]]:
+        """Increment the write counters of the given segments. None on Redis errors."""
+        segments = list(segments)
+        if not segments:
+            return None
+
+        if not redis_client:
+            with cls._l1_lock:
+                counters = cls._local_versions.setdefault(household_id, dict.fromkeys(SEGMENTS, 0))
+                for seg in segments:
+                    counters[seg] += 1
+                return {seg: counters[seg] for seg in segments}
+
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for seg in segments:
+                pipe.incr(cls._version_key(household_id, seg))
+            return {seg: int(v) for seg, v in zip(segments, pipe.execute())}
+        except Exception as e:
+            logger.warning(f"Cache version bump error: {e}")
+            # Counters are unknown now — don't trust the in-process copy
+            cls._l1_evict(household_id)
+            return None
+
+    @classmethod
+    def _drop_segments(cls, household_id: str, segments):
+        """Delete cached segments so the next read reloads them."""
+        if not redis_client or not segments:
+            return
+        try:
+            redis_client.delete(*(cls._segment_key(household_id, seg) for seg in segments))
+        except Exception as e:
+            logger.warning(f"Cache delete error: {e}")
+
+    @classmethod
+    def _load_from_database(cls, household_id: str) -> HouseholdState:
+        """Load all data from database and calculate everything."""
+        segments = cls._load_segments(household_id, list(SEGMENTS))
 
         logger.info(f"✨ Creating state for household {household_id}")
         return HouseholdState(
             household_id=household_id,
-            pantry_items=pantry_items,
-            recipes=recipes,
-            meal_plans=meal_plans,
-            manual_shopping_items=manual_shopping_items
+            pantry_items=segments['pantry'],
+            recipes=segments['recipes'],
+            meal_plans=segments['meals'],
+            manual_shopping_items=segments['manual']
         )
 
     @classmethod
-    def invalidate(cls, household_id: str):
+    def _load_segments(cls, household_id: str, segments, strict: bool = False) -> Dict[str, list]:
         """
-        Invalidate cache for a household.
+        Load the given segments from database in parallel for faster cache misses.
 
-        Next request will reload from DB and recalculate.
+        A failing query yields an empty segment, unless strict is set (used by
+        background refreshes, which must not replace good data with nothing).
+        Providers that can batch (get_household_rows) load them in one round-trip.
         """
-        if redis_client:
-            cache_key = f"state:{household_id}"
+        db = get_db()
+        try:
+            batch = db.get_household_rows(household_id, list(segments), date.today().isoformat())
+        except Exception as e:
+            logger.warning(f"Batch load failed, loading segments one by one: {e}")
+            if strict:
+                raise
+            batch = None
+        if batch is not None:
+            return cls._parse_batch(household_id, batch, strict)
+
+        queries = cls._segment_queries(db, household_id)
+
+        def load(seg):
             try:
-                redis_client.delete(cache_key)
-                logger.info(f"🗑️ Cache invalidated for household {household_id}")
+                return cls._parse_segment(household_id, seg, queries[seg]())
             except Exception as e:
-                logger.warning(f"Cache delete error: {e}")
+                logger.warning(f"Could not load {seg}: {e}")
+                if strict:
+                    raise
+                return []
+
+        if len(segments) == 1:
+            return {segments[0]: load(segments[0])}
+
+        # Run the queries in parallel (limited by slowest query, not sum)
+        with ThreadPoolExecutor(max_workers=len(segments)) as executor:
+            futures = {seg: executor.submit(load, seg) for seg in segments}
+            return {seg: future.result() for seg, future in futures.items()}
+
+    @staticmethod
+    def _segment_queries(db, household_id: str) -> dict:
+        """Row query per segment. Works for the sync and the async provider (returns awaitables)."""
+        return {
+            'pantry': lambda: db.pantry.get_items_with_locations(household_id),
+            'recipes': lambda: db.recipes.get_all(household_id),
+            'meals': lambda: db.meal_plans.get_active(household_id, date.today().isoformat()),
+            'manual': lambda: db.shopping.get_manual_items(household_id),
+        }
+
+    @classmethod
+    def _parse_batch(cls, household_id: str, batch: Dict[str, list], strict: bool = False) -> Dict[str, list]:
+        """Parse the rows of a get_household_rows() load (failures handled as in _load_segments)."""
+        segments = {}
+        for seg, rows in batch.items():
+            try:
+                segments[seg] = cls._parse_segment(household_id, seg, rows)
+            except Exception as e:
+                logger.warning(f"Could not load {seg}: {e}")
+                if strict:
+                    raise
+                segments[seg] = []
+        return segments
+
+    @staticmethod
+    def _parse_segment(household_id: str, segment: str, rows: List[dict]) -> list:
+        """Turn the rows of one segment query into models."""
+        if segment == 'pantry':
+            items = []
+            for item_data in rows:
+                locations = item_data.pop('pantry_locations', [])
+                items.append(PantryItem.from_supabase(item_data, locations))
+            return items
+
+        if segment == 'recipes':
+            return [Recipe.from_supabase(r) for r in rows]
+
+        if segment == 'meals':
+            plans = []
+            for meal_data in rows:
+                try:
+                    plans.append(MealPlan.from_supabase(meal_data))
+                except Exception as e:
+                    logger.warning(f"Could not parse meal plan: {e}")
+            return plans
+
+        return [ShoppingItem.from_supabase(item, household_id) for item in rows]
+
+    @classmethod
+    def invalidate(cls, household_id: str, segments=None):
+        """
+        Invalidate cache for a household.
+
+        Next request will reload the dropped segments from DB and recalculate.
+
+        Args:
+            household_id: Household to invalidate
+            segments: Segment names to drop (default: all)
+        """
+        segments = list(segments or SEGMENTS)
+        cls._bump_versions(household_id, segments)
+        cls._drop_segments(household_id, segments)
+        logger.info(f"🗑️ Cache invalidated ({', '.join(segments)}) for household {household_id}")
 
     @classmethod
-    def update_and_invalidate(cls, household_id: str, update_function):
+    def update_and_invalidate(cls, household_id: str, update_function, segments=None):
         """
         Execute database update and invalidate cache.
 
-        Use this for ALL data modifications!
+        Prefer update_and_apply — this always forces a reload.
 
         Example:
             def update():
-                supabase.table('pantry_items').insert(data).execute()
+                db.pantry.create_item(data)
 
-            StateManager.update_and_invalidate(household_id, update)
+            StateManager.update_and_invalidate(household_id, update, segments=['pantry'])
 
         Args:
             household_id: Household to invalidate
             update_function: Function that performs the database update
+            segments: Segment names the update touches (default: all)
         """
         # Execute the update
         logger.info(f"📝 Executing update for household {household_id}")
         result = update_function()
 
         # Invalidate cache
-        cls.invalidate(household_id)
+        cls.invalidate(household_id, segments)
 
         return result
+
+    @classmethod
+    def update_and_apply(cls, household_id: str, update_function, delta: Optional[StateDelta] = None):
+        """
+        Execute database update and patch the cached state (write-through).
+
+        Use this for ALL data modifications!
+
+        Example:
+            def update():
+                rows = db.pantry.create_item(data)
+                return StateChange(result=rows[0]['id']).pantry_item(rows[0], locations=[])
+
+            item_id, state = StateManager.update_and_apply(household_id, update)
+
+        Only the segments the change touches get new versions and are stored
+        again. Falls back to dropping those segments + reloading them when
+        the change can't be patched: nothing cached, another write landed in
+        between (version gap), or the callback returned something other than
+        a patchable StateChange.
+
+        Args:
+            household_id: Household being modified
+            update_function: Performs the database update and returns a StateChange
+            delta: Filled in with what the patch changed (see StateDelta);
+                its `applied` stays False if the state was reloaded instead
+
+        Returns:
+            (change.result, fresh HouseholdState)
+        """
+        logger.info(f"📝 Executing update for household {household_id}")
+        change = update_function()
+        if not isinstance(change, StateChange):
+            change = StateChange(result=change).rebuild()
+
+        segments = change.segments
+        if not segments:
+            if delta is not None:
+                delta.applied = True
+            return change.result, cls.get_state(household_id)
+
+        cached = cls._get_cached_state(household_id) if change.patchable else None
+        new_versions = cls._bump_versions(household_id, segments)
+
+        if (cached is not None and new_versions is not None and
+                all(new_versions[seg] == cached.versions[seg] + 1 for seg in segments)):
+            # The diff (and the derived fields it reports) is only worked out
+            # for a caller that wants it or for open streams; without either
+            # the event says "reload" and derived fields stay lazy
+            if delta is None and cls._has_subscribers(household_id):
+                delta = StateDelta()
+
+            # Patch a copy: the cached state keeps serving reads (and other
+            # writes) until the patched one is complete and stored
+            state = cached.copy()
+            try:
+                if state.apply_change(change, delta):
+                    state.versions.update(new_versions)
+                    cls._store(state, segments)
+                    cls._l1_put(state)
+                    logger.info(f"✏️ Patched cached {', '.join(segments)} for household {household_id}")
+                    if delta is not None:
+                        delta.applied = True
+                    cls._publish(household_id, cls._state_event(household_id, segments, state.versions, delta))
+                    return change.result, state
+            except Exception as e:
+                logger.warning(f"Could not patch cached state, reloading: {e}")
+
+        # Can't patch — drop the touched segments and reload them
+        cls._drop_segments(household_id, segments)
+
+        state = cls.get_state(household_id)
+        cls._publish(household_id, cls._state_event(household_id, segments, state.versions))
+        return change.result, state
+
+    # ===== STATE EVENTS =====
+
+    # In-process subscribers: callback(household_id, payload). Events reach
+    # them through Redis pub/sub when there is Redis, directly otherwise.
+    _event_listeners: List = []
+
+    @staticmethod
+    def events_channel(household_id: str) -> str:
+        """Redis pub/sub channel carrying a household's state events."""
+        return f"state_events:{household_id}"
+
+    @classmethod
+    def add_event_listener(cls, callback):
+        """Call callback(household_id, payload) for events published without Redis."""
+        cls._event_listeners.append(callback)
+
+    # In-process stream checks: watching(household_id) -> bool
+    _event_watchers: List = []
+
+    @classmethod
+    def add_event_watcher(cls, watching):
+        """Ask watching(household_id) whether a stream is open, when there is no Redis to count them."""
+        cls._event_watchers.append(watching)
+
+    @classmethod
+    def _has_subscribers(cls, household_id: str) -> bool:
+        """Whether any worker streams the household's events (True when unsure)."""
+        if redis_client:
+            try:
+                [(_, count)] = redis_client.pubsub_numsub(cls.events_channel(household_id))
+                return count > 0
+            except Exception as e:
+                logger.warning(f"State subscriber count error: {e}")
+                return True
+        return any(watching(household_id) for watching in cls._event_watchers)
+
+    @classmethod
+    async def _ahas_subscribers(cls, household_id: str) -> bool:
+        """Async _has_subscribers()."""
+        if async_redis_client:
+            try:
+                [(_, count)] = await async_redis_client.pubsub_numsub(cls.events_channel(household_id))
+                return count > 0
+            except Exception as e:
+                logger.warning(f"State subscriber count error: {e}")
+                return True
+        return any(watching(household_id) for watching in cls._event_watchers)
+
+    @classmethod
+    def _state_event(cls, household_id: str, segments: set, versions: Dict[str, int],
+                     delta: Optional[StateDelta] = None) -> bytes:
+        """
+        Encode the event broadcast after a write.
+
+        Carries the new segment versions and, when the cached state was
+        patched with a delta recorded (a stream was open, or the writer
+        asked for one), the diff (see StateDelta); otherwise "reload": true
+        and subscribers re-fetch the segments. "origin" is the X-Client-Id of
+        the request that wrote, so its own tab can skip the echo.
+        """
+        meta = _request_meta.get()
+        event = {
+            "household_id": household_id,
+            "segments": sorted(segments),
+            "versions": dict(versions),
+            "origin": meta.get("client_id") if meta else None,
+        }
+        if delta is not None and delta.applied:
+            event["changes"] = delta.to_dict()
+        else:
+            event["reload"] = True
+        return json_dumps(event)
+
+    @classmethod
+    def _publish(cls, household_id: str, payload: bytes):
+        """Broadcast a state event to every worker's subscribers."""
+        if redis_client:
+            try:
+                redis_client.publish(cls.events_channel(household_id), payload)
+                return
+            except Exception as e:
+                logger.warning(f"State event publish error: {e}")
+        cls._notify_local(household_id, payload)
+
+    @classmethod
+    async def _apublish(cls, household_id: str, payload: bytes):
+        """Async _publish()."""
+        if async_redis_client:
+            try:
+                await async_redis_client.publish(cls.events_channel(household_id), payload)
+                return
+            except Exception as e:
+                logger.warning(f"State event publish error: {e}")
+        cls._notify_local(household_id, payload)
+
+    @classmethod
+    def _notify_local(cls, household_id: str, payload: bytes):
+        for callback in cls._event_listeners:
+            try:
+                callback(household_id, payload)
+            except Exception as e:
+                logger.warning(f"State event listener error: {e}")
+
+    @classmethod
+    async def aversions(cls, household_id: str) -> Dict[str, int]:
+        """Current segment versions (what the next state event builds on)."""
+        return await cls._aread_versions(household_id)
+
+    # ===== ETAGS =====
+
+    @classmethod
+    async def aetag(cls, household_id: str, view: str, state: Optional[HouseholdState] = None) -> str:
+        """
+        Strong ETag for a view of a household's state.
+
+        Made of the versions of the segments the view reads
+        (VIEW_DEPENDENCIES), today's date and the epoch token. Without a
+        state it costs one version MGET — nothing is loaded or decoded, so
+        a matching If-None-Match can be answered with a 304 straight away.
+
+        Args:
+            household_id: Household
+            view: View name (a key of VIEW_DEPENDENCIES)
+            state: The state being served, to tag the response with its own
+                versions (they may trail Redis by a concurrent write)
+        """
+        versions = state.versions if state is not None else await cls._aread_versions(household_id)
+        epoch = await cls._aetag_epoch()
+        counters = ".".join(str(versions[seg]) for seg in VIEW_DEPENDENCIES[view])
+        return f'"{view}-{epoch}-{date.today():%Y%m%d}-{counters}"'
+
+    @classmethod
+    async def _aetag_epoch(cls) -> str:
+        """Epoch token shared by all workers (created in Redis on first use)."""
+        if not async_redis_client:
+            return cls._local_epoch
+
+        cached = cls._etag_epoch
+        now = time.monotonic()
+        if cached is not None and now - cached[1] < cls.ETAG_EPOCH_TTL:
+            return cached[0]
+
+        try:
+            pipe = async_redis_client.pipeline(transaction=False)
+            pipe.set(cls.ETAG_EPOCH_KEY, uuid.uuid4().hex[:12], nx=True)
+            pipe.get(cls.ETAG_EPOCH_KEY)
+            _, token = await pipe.execute()
+            token = token.decode() if isinstance(token, bytes) else token
+        except Exception as e:
+            logger.warning(f"ETag epoch read error: {e}")
+            return cls._local_epoch
+
+        cls._etag_epoch = (token, now)
+        return token
+
+    # ===== ASYNC PATH =====
+    #
+    # Same cache protocol as above, for async route handlers: Redis through
+    # redis.asyncio, the database through get_async_db(). L1, version
+    # counters and in-flight loads are shared with the sync path, so both
+    # can serve the same process. Encoding and decoding cache blobs is
+    # CPU-bound and runs in a worker thread to keep the event loop free.
+
+    @classmethod
+    async def aget_state(cls, household_id: str) -> HouseholdState:
+        """Async get_state(): same caching, without blocking the event loop."""
+        local = cls._l1_get(household_id)
+        if local is not None and local.versions == await cls._aread_versions(household_id):
+            logger.debug(f"⚡ L1 HIT for household {household_id}")
+            return cls._serve(local)
+
+        state = await cls._asingle_flight(household_id, lambda: cls._abuild_state(household_id, local))
+        return cls._serve(state)
+
+    @classmethod
+    async def _asingle_flight(cls, household_id: str, build):
+        """
+        Async _single_flight(): `build` is a coroutine function.
+
+        Shares the in-flight table with the sync path, so a coroutine can
+        wait for a load started by a thread and vice versa.
+        """
+        with cls._l1_lock:
+            flight = cls._inflight.get(household_id)
+            leader = flight is None
+            if leader:
+                flight = cls._inflight[household_id] = Future()
+
+        if not leader:
+            logger.info(f"⏳ Waiting for in-flight load of household {household_id}")
+            try:
+                # shield: a timeout must not cancel the leader's future
+                state = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(flight)), cls.LOAD_WAIT)
+                if state.versions == await cls._aread_versions(household_id):
+                    return state
+            except Exception as e:
+                logger.warning(f"In-flight load failed, loading again: {e}")
+            return await build()
+
+        try:
+            state = await build()
+            flight.set_result(state)
+            return state
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with cls._l1_lock:
+                if cls._inflight.get(household_id) is flight:
+                    del cls._inflight[household_id]
+
+    @classmethod
+    async def _abuild_state(cls, household_id: str, local: Optional[HouseholdState]) -> HouseholdState:
+        """Async _build_state()."""
+        if local is None:
+            segments, versions, derived, loaded_at = await cls._aread_cache(household_id, list(SEGMENTS))
+        else:
+            versions = await cls._aread_versions(household_id)
+            segments, loaded_at = cls._l1_leftovers(local, versions)
+            stale = [seg for seg in SEGMENTS if seg not in segments]
+            cached, _, derived, cached_loaded_at = await cls._aread_cache(household_id, stale, versions)
+            segments.update(cached)
+            loaded_at.update(cached_loaded_at)
+
+        missing = [seg for seg in SEGMENTS if seg not in segments]
+        if not missing:
+            logger.info(f"💰 Cache HIT for household {household_id}")
+            state = cls._assemble(household_id, segments, versions, derived, loaded_at)
+            cls._l1_put(state)
+            return state
+
+        lock = await cls._aacquire_load_lock(household_id)
+        try:
+            if lock is not None and lock.waited:
+                # Another worker just loaded this household - use what it cached
+                cached, _, fresh_derived, cached_loaded_at = await cls._aread_cache(household_id, missing, versions)
+                segments.update(cached)
+                loaded_at.update(cached_loaded_at)
+                derived = fresh_derived or derived
+                missing = [seg for seg in missing if seg not in cached]
+
+            if missing:
+                logger.info(f"📀 Cache MISS ({', '.join(missing)}) - Loading household {household_id} from database")
+                loaded = await cls._aload_segments(household_id, missing)
+                derived = cls._merge_loaded(segments, loaded_at, derived, loaded)
+
+            state = cls._assemble(household_id, segments, versions, derived, loaded_at)
+
+            if missing:
+                await cls._astore(state, missing)
+            cls._l1_put(state)
+            return state
+        finally:
+            await cls._arelease_load_lock(lock)
+
+    @classmethod
+    async def _aacquire_load_lock(cls, household_id: str):
+        """Async _acquire_load_lock()."""
+        if not async_redis_client:
+            return None
+        try:
+            lock = async_redis_client.lock(cls._lock_key(household_id), timeout=cls.LOAD_LOCK_LEASE)
+            lock.waited = False
+            if await lock.acquire(blocking=False):
+                return lock
+
+            logger.info(f"⏳ Household {household_id} is being loaded by another worker, waiting")
+            lock.waited = True
+            if await lock.acquire(blocking=True, blocking_timeout=cls.LOAD_WAIT):
+                return lock
+        except Exception as e:
+            logger.warning(f"Cache lock error: {e}")
+        return None
+
+    @staticmethod
+    async def _arelease_load_lock(lock):
+        if lock is None:
+            return
+        try:
+            await lock.release()
+        except Exception as e:
+            logger.warning(f"Cache lock release error: {e}")
+
+    @classmethod
+    async def _aread_versions(cls, household_id: str) -> Dict[str, int]:
+        """Async _read_versions()."""
+        if async_redis_client:
+            try:
+                counters = await async_redis_client.mget([cls._version_key(household_id, seg) for seg in SEGMENTS])
+                return {seg: int(v or 0) for seg, v in zip(SEGMENTS, counters)}
+            except Exception as e:
+                logger.warning(f"Cache version read error: {e}")
+
+        with cls._l1_lock:
+            return dict(cls._local_versions.get(household_id) or dict.fromkeys(SEGMENTS, 0))
+
+    @classmethod
+    async def _aread_cache(cls, household_id: str, names: List[str], versions: Optional[Dict[str, int]] = None):
+        """Async _read_cache()."""
+        if not async_redis_client:
+            return {}, versions or await cls._aread_versions(household_id), None, {}
+
+        try:
+            values = await async_redis_client.mget(cls._cache_keys(household_id, names, versions is None))
+        except Exception as e:
+            logger.warning(f"Cache read error: {e}")
+            values = None
+        if not values or not any(values[:len(names) + 1]):
+            # Nothing to decode - skip the thread hop
+            return cls._decode_cache(household_id, names, versions, values)
+        return await asyncio.to_thread(cls._decode_cache, household_id, names, versions, values)
+
+    @classmethod
+    async def _aget_cached_state(cls, household_id: str) -> Optional[HouseholdState]:
+        """Async _get_cached_state()."""
+        local = cls._l1_get(household_id)
+        if local is not None and local.versions == await cls._aread_versions(household_id):
+            return local
+
+        segments, versions, derived, loaded_at = await cls._aread_cache(household_id, list(SEGMENTS))
+        if len(segments) < len(SEGMENTS):
+            return None
+        return cls._assemble(household_id, segments, versions, derived, loaded_at)
+
+    @classmethod
+    async def _astore(cls, state: HouseholdState, segments):
+        """Async _store()."""
+        if not async_redis_client:
+            return
+        try:
+            snapshot = state.copy()
+            entries = await asyncio.to_thread(cls._cache_entries, snapshot, segments)
+            if not entries:
+                return
+            pipe = async_redis_client.pipeline(transaction=False)
+            for key, blob in entries:
+                pipe.setex(key, cls.HARD_TTL, blob)
+            await pipe.execute()
+            state.unsaved_derived.difference_update(snapshot.unsaved_derived)
+            logger.info(f"💾 Cached {', '.join(segments) or 'derived'} for household {state.household_id} "
+                        f"(versions {state.versions})")
+        except Exception as e:
+            logger.warning(f"Cache write error: {e}")
+
+    @classmethod
+    async def _abump_versions(cls, household_id: str, segments) -> Optional[Dict[str, int]]:
+        """Async _bump_versions()."""
+        segments = list(segments)
+        if not segments:
+            return None
+        if not async_redis_client:
+            return cls._bump_versions(household_id, segments)
+
+        try:
+            pipe = async_redis_client.pipeline(transaction=False)
+            for seg in segments:
+                pipe.incr(cls._version_key(household_id, seg))
+            return {seg: int(v) for seg, v in zip(segments, await pipe.execute())}
+        except Exception as e:
+            logger.warning(f"Cache version bump error: {e}")
+            cls._l1_evict(household_id)
+            return None
+
+    @classmethod
+    async def _adrop_segments(cls, household_id: str, segments):
+        """Async _drop_segments()."""
+        if not async_redis_client or not segments:
+            return
+        try:
+            await async_redis_client.delete(*(cls._segment_key(household_id, seg) for seg in segments))
+        except Exception as e:
+            logger.warning(f"Cache delete error: {e}")
+
+    @classmethod
+    async def _aload_segments(cls, household_id: str, segments) -> Dict[str, list]:
+        """Async _load_segments(): one batch, or the queries concurrently on the async provider."""
+        db = await get_async_db()
+        try:
+            batch = await db.get_household_rows(household_id, list(segments), date.today().isoformat())
+        except Exception as e:
+            logger.warning(f"Batch load failed, loading segments one by one: {e}")
+            batch = None
+        if batch is not None:
+            return cls._parse_batch(household_id, batch)
+
+        queries = cls._segment_queries(db, household_id)
+
+        async def load(seg):
+            try:
+                return cls._parse_segment(household_id, seg, await queries[seg]())
+            except Exception as e:
+                logger.warning(f"Could not load {seg}: {e}")
+                return []
+
+        results = await asyncio.gather(*(load(seg) for seg in segments))
+        return dict(zip(segments, results))
+
+    @classmethod
+    async def ainvalidate(cls, household_id: str, segments=None):
+        """Async invalidate()."""
+        segments = list(segments or SEGMENTS)
+        await cls._abump_versions(household_id, segments)
+        await cls._adrop_segments(household_id, segments)
+        logger.info(f"🗑️ Cache invalidated ({', '.join(segments)}) for household {household_id}")
+
+    @classmethod
+    async def aupdate_and_apply(cls, household_id: str, update_function, delta: Optional[StateDelta] = None):
+        """
+        Async update_and_apply(): `update_function` is a coroutine function.
+
+        Example:
+            async def update():
+                rows = await db.pantry.create_item(data)
+                return StateChange(result=rows[0]['id']).pantry_item(rows[0], locations=[])
+
+            item_id, state = await StateManager.aupdate_and_apply(household_id, update)
+        """
+        logger.info(f"📝 Executing update for household {household_id}")
+        change = await update_function()
+        if not isinstance(change, StateChange):
+            change = StateChange(result=change).rebuild()
+
+        segments = change.segments
+        if not segments:
+            if delta is not None:
+                delta.applied = True
+            return change.result, await cls.aget_state(household_id)
+
+        cached = await cls._aget_cached_state(household_id) if change.patchable else None
+        new_versions = await cls._abump_versions(household_id, segments)
+
+        if (cached is not None and new_versions is not None and
+                all(new_versions[seg] == cached.versions[seg] + 1 for seg in segments)):
+            if delta is None and await cls._ahas_subscribers(household_id):
+                delta = StateDelta()
+
+            # Patch a copy (see update_and_apply); it is encoded off the
+            # event loop before anyone else can see it
+            state = cached.copy()
+            try:
+                if state.apply_change(change, delta):
+                    state.versions.update(new_versions)
+                    await cls._astore(state, segments)
+                    cls._l1_put(state)
+                    logger.info(f"✏️ Patched cached {', '.join(segments)} for household {household_id}")
+                    if delta is not None:
+                        delta.applied = True
+                    await cls._apublish(household_id, cls._state_event(household_id, segments, state.versions, delta))
+                    return change.result, state
+            except Exception as e:
+                logger.warning(f"Could not patch cached state, reloading: {e}")
+
+        await cls._adrop_segments(household_id, segments)
+
+        state = await cls.aget_state(household_id)
+        await cls._apublish(household_id, cls._state_event(household_id, segments, state.versions))
+        return change.result, state
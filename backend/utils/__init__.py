@@ -3,9 +3,17 @@ Peachy Pantry - Utilities
 Python Age 5.0
 """
 
-from .supabase_client import get_supabase, supabase
+from .supabase_client import get_supabase
 from .auth import get_current_user, get_current_household
 
+
+def __getattr__(name):
+    # The client itself is created on first use (see supabase_client)
+    if name == "supabase":
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     'get_supabase',
     'supabase',
@@ -2,59 +2,257 @@
 Authentication Middleware - Python Age 5.0
 
 Validates Supabase JWT tokens and extracts user/household info.
+
+Access tokens are verified locally — HS256 with the project's JWT secret
+(SUPABASE_JWT_SECRET), or asymmetric keys from the project's JWKS — so a
+request doesn't wait on Supabase Auth. Verified users are kept in a small
+LRU keyed by the token's hash for CLAIMS_CACHE_TTL seconds. Without a
+secret or a matching key — or for tokens Supabase didn't issue — we fall
+back to asking the auth provider, as before.
+
+A signature can't tell that a session was revoked: routes where that
+matters (membership changes, invites) depend on get_verified_user, which
+always asks Supabase.
 """
 
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import httpx
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from jose import jwt, JWTError
 
-from db import get_db
+from db import get_async_db
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+SUPABASE_URL = (os.getenv("SUPABASE_URL") or "").rstrip("/")
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+
+# Supabase signs user access tokens for this audience (the anon and
+# service keys carry none, so they are never accepted as a user)
+JWT_AUDIENCE = "authenticated"
+JWT_ISSUER = f"{SUPABASE_URL}/auth/v1" if SUPABASE_URL else None
+JWKS_URL = f"{SUPABASE_URL}/auth/v1/.well-known/jwks.json"
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+
+# Verified users kept per token (seconds, and never past the token's exp)
+CLAIMS_CACHE_TTL = 60
+CLAIMS_CACHE_SIZE = 1024
+
+# Signing keys are refetched this often, or sooner for an unknown kid
+JWKS_TTL = 600
+JWKS_MIN_REFRESH = 30
+
+# token hash -> (expires_at, user)
+_claims_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+_jwks = {"keys": {}, "fetched_at": 0.0}
+
+
+def _unauthorized() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid authentication token"
+    )
+
+
+# ===== CLAIMS CACHE =====
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _cached_user(token: str) -> Optional[dict]:
+    key = _token_key(token)
+    entry = _claims_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, user = entry
+    if expires_at <= time.time():
+        del _claims_cache[key]
+        return None
+    _claims_cache.move_to_end(key)
+    return user
+
+
+def _cache_user(token: str, user: dict, exp: Optional[float]):
+    expires_at = time.time() + CLAIMS_CACHE_TTL
+    if exp is not None:
+        expires_at = min(expires_at, exp)
+    key = _token_key(token)
+    _claims_cache[key] = (expires_at, user)
+    _claims_cache.move_to_end(key)
+    while len(_claims_cache) > CLAIMS_CACHE_SIZE:
+        _claims_cache.popitem(last=False)
+
+
+def forget_token(token: str):
+    """Drop a token's cached user (e.g. on sign-out)."""
+    _claims_cache.pop(_token_key(token), None)
+
+
+# ===== VERIFICATION =====
+
+async def _signing_key(kid: Optional[str]) -> Optional[dict]:
+    """JWK for kid from the project's JWKS (cached), or None."""
+    now = time.time()
+    keys = _jwks["keys"]
+    stale = now - _jwks["fetched_at"] > JWKS_TTL
+    missing = kid not in keys and now - _jwks["fetched_at"] > JWKS_MIN_REFRESH
+
+    if SUPABASE_URL and (stale or missing):
+        _jwks["fetched_at"] = now
+        try:
+            async with httpx.AsyncClient(timeout=5) as client:
+                response = await client.get(JWKS_URL)
+                response.raise_for_status()
+            _jwks["keys"] = keys = {key.get("kid"): key for key in response.json().get("keys", [])}
+            logger.info(f"🔑 Loaded {len(keys)} JWT signing key(s)")
+        except Exception as e:
+            logger.warning(f"JWKS fetch failed: {e}")
+
+    return keys.get(kid)
+
+
+async def _verify_locally(token: str) -> Optional[dict]:
+    """
+    Verify an access token's signature and claims without calling Supabase.
+
+    Returns:
+        dict: The token's claims, or None if it can't be checked here
+        (no secret / no matching key) — ask Supabase then
+
+    Raises:
+        HTTPException: If the token is malformed, forged or expired
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+        issuer = jwt.get_unverified_claims(token).get("iss")
+    except JWTError:
+        raise _unauthorized()
+
+    # Not a Supabase Auth token (DB_PROVIDER=sqlite issues its own): the
+    # provider checks it
+    if issuer is not None and not str(issuer).endswith("/auth/v1"):
+        return None
+
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not SUPABASE_JWT_SECRET:
+            return None
+        key = SUPABASE_JWT_SECRET
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        key = await _signing_key(header.get("kid"))
+        if key is None:
+            return None
+    else:
+        raise _unauthorized()
+
+    try:
+        claims = jwt.decode(
+            token, key, algorithms=[algorithm], audience=JWT_AUDIENCE, issuer=JWT_ISSUER
+        )
+    except JWTError as e:
+        logger.info(f"Token rejected: {e}")
+        raise _unauthorized()
+
+    if not claims.get("sub"):
+        raise _unauthorized()
+    return claims
+
+
+async def _verify_remotely(token: str) -> dict:
+    """Validate a token with Supabase Auth (sees revoked sessions)."""
+    try:
+        db = await get_async_db()
+        user_response = await db.auth.get_user(token)
+    except Exception as e:
+        logger.error(f"Token validation failed: {str(e)}")
+        raise _unauthorized()
+
+    if not user_response or not user_response.get('user'):
+        raise _unauthorized()
+
+    user = user_response['user']
+    return {
+        "id": user['id'],
+        "email": user['email'],
+        "role": user.get('role')
+    }
+
+
+def _token_exp(token: str) -> Optional[float]:
+    try:
+        return jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
     """
-    Validate JWT token using Supabase API and return user info.
+    Validate JWT token and return user info.
+
+    Verified locally when possible (see module docstring), otherwise with
+    the Supabase API; either way the result is cached briefly per token.
 
     Raises:
         HTTPException: If token is invalid or expired
 
     Returns:
-        dict: User info from Supabase
+        dict: User info (id, email, role)
     """
     token = credentials.credentials
-    db = get_db()
 
-    try:
-        user_response = db.auth.get_user(token)
+    user = _cached_user(token)
+    if user is not None:
+        return user
 
-        if not user_response or not user_response.get('user'):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication token"
-            )
+    claims = await _verify_locally(token)
+    if claims is not None:
+        user = {
+            "id": claims['sub'],
+            "email": claims.get('email'),
+            "role": claims.get('role')
+        }
+        exp = claims.get("exp")
+    else:
+        user = await _verify_remotely(token)
+        exp = _token_exp(token)
 
-        user = user_response['user']
+    _cache_user(token, user, exp)
+    return user
 
-        return {
-            "id": user['id'],
-            "email": user['email'],
-            "role": user.get('role')
-        }
 
-    except Exception as e:
-        # Log the error for debugging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(f"Token validation failed: {str(e)}")
+async def get_verified_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict:
+    """
+    get_current_user() that always asks Supabase.
 
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication token"
-        )
+    For revocation-sensitive routes: a signed-out or deleted user's token
+    still verifies locally until it expires.
+
+    Raises:
+        HTTPException: If token is invalid, expired or revoked
+    """
+    token = credentials.credentials
+    try:
+        user = await _verify_remotely(token)
+    except HTTPException:
+        forget_token(token)
+        raise
+
+    _cache_user(token, user, _token_exp(token))
+    return user
 
 
 async def get_current_household(
@@ -74,13 +272,13 @@ async def get_current_household(
     Returns:
         str: Household ID (UUID)
     """
-    db = get_db()
+    db = await get_async_db()
 
     # Check for explicit household selection via header
     requested_hid = request.headers.get('X-Household-Id')
 
     # Get all household memberships
-    memberships = db.households.get_memberships(user['id'])
+    memberships = await db.households.get_memberships(user['id'])
 
     if not memberships:
         raise HTTPException(
@@ -0,0 +1,207 @@
+"""
+Cache Codec - Python Age 5.0
+
+Binary encoding for cached household state.
+
+Every blob is framed with a 3-byte header:
+
+    [schema version][serializer id][compression id] + payload
+
+The schema version is bumped whenever the cached shape changes (model
+fields, derived layout), so entries written by an older deploy are
+rejected as misses instead of being half-decoded. The serializer and
+compression ids are read back from the header, so switching CACHE_CODEC
+or CACHE_COMPRESSION doesn't break entries that are already in Redis.
+
+Configuration (environment):
+    CACHE_CODEC        orjson | msgpack | json   (default: orjson if installed)
+    CACHE_COMPRESSION  zstd | none               (default: none)
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+# Bump when the cached layout changes; older entries become misses.
+CACHE_SCHEMA_VERSION = 3
+
+HEADER_SIZE = 3
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+
+
+class CacheCodecError(ValueError):
+    """Blob can't be decoded (other schema version, unknown serializer, corrupt)."""
+
+
+def _encode_default(value):
+    """Encode dates for serializers that don't handle them natively."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+# ===== SERIALIZERS =====
+
+class Serializer(ABC):
+    """Turns plain Python data (dicts, lists, scalars, dates) into bytes and back."""
+
+    id = 0
+    name = ""
+
+    @abstractmethod
+    def dumps(self, obj) -> bytes:
+        """Encode obj to bytes."""
+        ...
+
+    @abstractmethod
+    def loads(self, payload: bytes):
+        """Decode bytes produced by dumps()."""
+        ...
+
+
+class JsonSerializer(Serializer):
+    """Standard library json - always available, slowest."""
+
+    id = 1
+    name = "json"
+
+    def dumps(self, obj) -> bytes:
+        return json.dumps(obj, default=_encode_default, separators=(",", ":")).encode()
+
+    def loads(self, payload: bytes):
+        return json.loads(payload)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson - JSON with native date/datetime support, several times faster."""
+
+    id = 2
+    name = "orjson"
+
+    def dumps(self, obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, payload: bytes):
+        return orjson.loads(payload)
+
+
+class MsgpackSerializer(Serializer):
+    """MessagePack - compact binary encoding."""
+
+    id = 3
+    name = "msgpack"
+
+    def dumps(self, obj) -> bytes:
+        return msgpack.packb(obj, default=_encode_default, use_bin_type=True)
+
+    def loads(self, payload: bytes):
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+
+
+def available_serializers() -> dict:
+    """Serializers whose library is installed: name -> Serializer."""
+    serializers = [JsonSerializer()]
+    if orjson is not None:
+        serializers.append(OrjsonSerializer())
+    if msgpack is not None:
+        serializers.append(MsgpackSerializer())
+    return {s.name: s for s in serializers}
+
+
+_SERIALIZERS_BY_ID = {s.id: s for s in available_serializers().values()}
+
+
+# ===== CODEC =====
+
+class CacheCodec:
+    """
+    Serializer + optional compression + schema header.
+
+    Usage:
+        codec = get_codec()
+        blob = codec.encode({"version": 3, "items": [...]})
+        data = codec.decode(blob)  # raises CacheCodecError on old/foreign blobs
+    """
+
+    def __init__(self, serializer: Serializer, compress: bool = False, level: int = 3):
+        if compress and zstandard is None:
+            logger.warning("⚠️ zstandard not installed - cache compression disabled")
+            compress = False
+
+        self.serializer = serializer
+        self.compression = COMPRESSION_ZSTD if compress else COMPRESSION_NONE
+        self._header = bytes((CACHE_SCHEMA_VERSION, serializer.id, self.compression))
+        self._compressor = zstandard.ZstdCompressor(level=level) if compress else None
+
+    @property
+    def name(self) -> str:
+        return self.serializer.name + ("+zstd" if self._compressor else "")
+
+    def encode(self, obj) -> bytes:
+        payload = self.serializer.dumps(obj)
+        if self._compressor:
+            payload = self._compressor.compress(payload)
+        return self._header + payload
+
+    @staticmethod
+    def decode(blob: bytes):
+        """Decode any blob written by a codec of the current schema version."""
+        if not blob or len(blob) < HEADER_SIZE:
+            raise CacheCodecError("empty cache entry")
+
+        schema, serializer_id, compression = blob[0], blob[1], blob[2]
+        if schema != CACHE_SCHEMA_VERSION:
+            raise CacheCodecError(f"cache schema v{schema}, expected v{CACHE_SCHEMA_VERSION}")
+
+        serializer = _SERIALIZERS_BY_ID.get(serializer_id)
+        if serializer is None:
+            raise CacheCodecError(f"unknown cache serializer id {serializer_id}")
+
+        payload = memoryview(blob)[HEADER_SIZE:]
+        if compression == COMPRESSION_ZSTD:
+            if zstandard is None:
+                raise CacheCodecError("zstd-compressed entry but zstandard is not installed")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif compression != COMPRESSION_NONE:
+            raise CacheCodecError(f"unknown cache compression id {compression}")
+
+        try:
+            return serializer.loads(bytes(payload))
+        except Exception as e:
+            raise CacheCodecError(f"corrupt cache entry: {e}") from e
+
+
+def get_codec() -> CacheCodec:
+    """Codec configured via CACHE_CODEC / CACHE_COMPRESSION."""
+    serializers = available_serializers()
+    default = "orjson" if "orjson" in serializers else "json"
+    name = os.getenv("CACHE_CODEC", default).lower()
+
+    if name not in serializers:
+        logger.warning(f"⚠️ Cache codec '{name}' not available - using {default}")
+        name = default
+
+    compress = os.getenv("CACHE_COMPRESSION", "none").lower() == "zstd"
+    return CacheCodec(serializers[name], compress=compress)
@@ -0,0 +1,70 @@
+"""
+Delta Responses - Python Age 5.0
+
+Opt-in "just what changed" bodies for the mutation endpoints.
+
+A client that keeps its own copy of the lists asks for a delta with
+`?response=delta` or the `X-Response-Mode: delta` header. Instead of the
+full pantry_items / shopping_list / ready recipes lists it gets the
+entities the write added, changed and removed (see StateDelta) plus the
+new segment versions, so the payload grows with the change, not with
+the household:
+
+    {
+        "id": "...",                       # whatever the route adds
+        "delta": true,
+        "versions": {"pantry": 12, "recipes": 3, "meals": 7, "manual": 2},
+        "last_updated": "2026-10-17T18:03:11.512034",
+        "changes": {
+            "pantry_items": {"added": [], "changed": [{...}], "removed": []},
+            "shopping_list": {"added": [], "changed": [], "removed": ["Milk|gallon"]},
+            "ready_to_cook_recipe_ids": {"added": ["r12"], "changed": [], "removed": []}
+        }
+    }
+
+When the state had to be reloaded rather than patched there is no delta;
+the route answers with its usual full body, which has no "delta" key.
+
+    delta = start_delta(request)
+    item_id, state = await StateManager.aupdate_and_apply(household_id, update, delta)
+    if delta and delta.applied:
+        return delta_response(state, delta, id=item_id)
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+from state_manager import HouseholdState, StateDelta
+from utils.json_response import dumps, json_response
+
+DELTA_HEADER = "x-response-mode"
+
+
+def wants_delta(request: Request) -> bool:
+    """True if the client asked for a delta body."""
+    return (request.query_params.get("response") == "delta" or
+            request.headers.get(DELTA_HEADER, "").lower() == "delta")
+
+
+def start_delta(request: Request) -> Optional[StateDelta]:
+    """A StateDelta to pass to aupdate_and_apply if the client wants one, else None."""
+    return StateDelta() if wants_delta(request) else None
+
+
+def delta_response(state: HouseholdState, delta: StateDelta, **fields) -> Response:
+    """
+    Encode a delta body.
+
+    Args:
+        state: State after the write
+        delta: The applied StateDelta
+        fields: Extra top-level fields (id, message, ...)
+    """
+    return json_response(dumps({
+        **fields,
+        "delta": True,
+        "versions": state.versions,
+        "last_updated": state.last_updated,
+        "changes": delta.to_dict()
+    }))
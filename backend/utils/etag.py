@@ -0,0 +1,53 @@
+"""
+ETag Helpers - Python Age 5.0
+
+Conditional GETs for the state-backed endpoints. Tags come from
+StateManager.aetag (segment versions, no state load), so a client whose
+copy is current gets a 304 before anything is read or serialized.
+
+    @router.get("/")
+    async def get_pantry(request: Request, household_id=...):
+        not_modified = await check_not_modified(request, household_id, 'pantry')
+        if not_modified:
+            return not_modified
+        state = await StateManager.aget_state(household_id)
+        response = json_response(state.view('pantry', build_pantry))
+        await set_etag(response, household_id, 'pantry', state)
+        return response
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+from state_manager import HouseholdState, StateManager
+
+# Let browsers keep the payload but revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def check_not_modified(request: Request, household_id: str, view: str) -> Optional[Response]:
+    """A 304 response if the client's copy of the view is current, else None."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+
+    etag = await StateManager.aetag(household_id, view)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    return None
+
+
+async def set_etag(response: Response, household_id: str, view: str, state: HouseholdState):
+    """Tag a full response with the versions of the state it was built from."""
+    response.headers["ETag"] = await StateManager.aetag(household_id, view, state)
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,75 @@
+"""
+JSON Responses - Python Age 5.0
+
+Pre-encoded JSON for the state-backed endpoints.
+
+HouseholdState keeps each collection (pantry items, recipes, meal plans,
+shopping list, ...) encoded as a JSON array per version of its inputs
+(see HouseholdState.encoded). Routes splice those fragments into the
+response body and return it as-is, so a request does no model_dump()
+and FastAPI does no jsonable_encoder pass:
+
+    state = await StateManager.aget_state(household_id)
+    return json_response(json_object({
+        "id": item_id,                               # encoded here
+        "pantry_items": state.encoded('pantry_items'),  # bytes: spliced
+    }))
+
+Encoding uses orjson when it's installed, else the standard library.
+Both write dates as ISO strings, like FastAPI does.
+"""
+
+from datetime import date, datetime
+import json
+from typing import Optional
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _encode_default(value):
+    """Models (dumped) and dates for the fallback json encoder."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _orjson_default(value):
+    """Models are dumped inside the encoder pass; orjson handles the rest."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError
+
+
+def dumps(obj) -> bytes:
+    """Compact JSON bytes; pydantic models inside obj are dumped on the way."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=_encode_default, separators=(",", ":")).encode()
+
+
+def json_object(fields: dict) -> bytes:
+    """
+    Encode a JSON object whose bytes values are already-encoded JSON.
+
+    Args:
+        fields: key -> value; bytes are spliced in verbatim, anything else
+                goes through dumps()
+    """
+    parts = [
+        dumps(key) + b":" + (value if isinstance(value, bytes) else dumps(value))
+        for key, value in fields.items()
+    ]
+    return b"{" + b",".join(parts) + b"}"
+
+
+def json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    """Send encoded JSON as-is (no response_model / jsonable_encoder pass)."""
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -3,8 +3,20 @@ Ingredient Normalization — Python Age 5.0
 
 Normalizes ingredient names and units so the pipeline matches
 "chicken breasts" to "chicken breast" and "oz" to "ounce".
+
+The normalizers are memoized (bounded LRU) and return interned strings:
+a household repeats the same few thousand names and units on every
+request, so repeat calls are a dict hit and equal keys compare by
+identity first. Models compute their key once when they are built
+(PantryItem.norm_key, RecipeIngredient.norm_key).
 """
 
+import sys
+from functools import lru_cache
+
+# Distinct strings remembered per normalizer (least recently used go first)
+NORMALIZE_CACHE_SIZE = 8192
+
 # Unit alias map — maps common abbreviations to canonical form
 UNIT_ALIASES = {
     # Weight
@@ -59,12 +71,14 @@ UNIT_ALIASES = {
 }
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_unit(unit: str) -> str:
     """Normalize a unit string to its canonical form."""
     lower = unit.strip().lower()
-    return UNIT_ALIASES.get(lower, lower)
+    return sys.intern(UNIT_ALIASES.get(lower, lower))
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_name(name: str) -> str:
     """Normalize an ingredient name.
 
@@ -89,15 +103,17 @@ def normalize_name(name: str) -> str:
         else:
             lower = lower[:-1]
 
-    return lower
+    return sys.intern(lower)
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_ingredient(name: str, unit: str) -> tuple:
     """Return a normalized (name, unit) tuple for consistent matching."""
     return (normalize_name(name), normalize_unit(unit))
 
 
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_key(name: str, unit: str) -> str:
     """Return a normalized 'name|unit' key string for consistent matching."""
     n, u = normalize_ingredient(name, unit)
-    return f"{n}|{u}"
+    return sys.intern(f"{n}|{u}")
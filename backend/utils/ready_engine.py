@@ -0,0 +1,114 @@
+"""
+Ready-to-Cook Engine - Python Age 5.0
+
+Vectorized recipe feasibility over a sparse recipe × ingredient matrix.
+
+Every normalized "name|unit" key used by a recipe gets a column; each
+recipe is a row holding the largest single quantity it needs per key
+(CSR layout: indptr / indices / data). Given an availability vector —
+on hand minus reserved, one entry per column — a single comparison over
+all non-zero entries says which recipes are ready, how many ingredients
+each one is missing and what share it already has.
+
+The matrix only depends on the recipes, so HouseholdState builds it once
+and rebuilds it only when the recipes segment changes; pantry and meal
+changes just produce a new availability vector.
+
+NumPy is optional. Without it (or for small households, where the plain
+loop is faster) HouseholdState keeps using its per-recipe loop.
+"""
+
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+# Below this many recipes the Python loop beats building arrays
+VECTORIZE_MIN_RECIPES = 64
+
+
+def available() -> bool:
+    """True if NumPy is installed."""
+    return np is not None
+
+
+class RecipeMatrix:
+    """
+    Sparse recipe × ingredient requirement matrix.
+
+    Usage:
+        matrix = RecipeMatrix(recipe_ids, recipe_needs)
+        supply = matrix.supply_vector(lambda key: on_hand(key) - reserved(key))
+        ready = matrix.ready_ids(supply)
+    """
+
+    def __init__(self, recipe_ids: List[str], recipe_needs: Dict[str, Dict[str, float]]):
+        """
+        Args:
+            recipe_ids: Row order (recipe IDs)
+            recipe_needs: recipe_id -> normalized "name|unit" -> quantity needed
+        """
+        self.recipe_ids = list(recipe_ids)
+        self.columns: Dict[str, int] = {}
+
+        indptr = [0]
+        indices = []
+        data = []
+        for recipe_id in self.recipe_ids:
+            for key, quantity in recipe_needs.get(recipe_id, {}).items():
+                indices.append(self.columns.setdefault(key, len(self.columns)))
+                data.append(quantity)
+            indptr.append(len(indices))
+
+        self.keys = list(self.columns)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.counts = np.diff(self.indptr)
+        # Row of every non-zero entry (for per-recipe reductions)
+        self.rows = np.repeat(np.arange(len(self.recipe_ids)), self.counts)
+
+    def supply_vector(self, available_for_key) -> 'np.ndarray':
+        """Availability per column: available_for_key("name|unit") -> quantity."""
+        return np.fromiter((available_for_key(key) for key in self.keys),
+                           dtype=np.float64, count=len(self.keys))
+
+    def _short_entries(self, supply) -> 'np.ndarray':
+        """Per non-zero entry: True if the supply doesn't cover it."""
+        return supply[self.indices] < self.data
+
+    def ready_mask(self, supply) -> 'np.ndarray':
+        """Boolean per recipe: every ingredient covered by the supply."""
+        missing = np.bincount(self.rows, weights=self._short_entries(supply), minlength=len(self.recipe_ids))
+        return missing == 0
+
+    def ready_ids(self, supply) -> List[str]:
+        """IDs of the recipes that can be made, in row order."""
+        mask = self.ready_mask(supply)
+        return [recipe_id for recipe_id, ready in zip(self.recipe_ids, mask.tolist()) if ready]
+
+    def availability(self, supply) -> List[dict]:
+        """
+        Per recipe: share of ingredients on hand and what's short.
+
+        Returns:
+            [{"recipe_id", "percent_available", "missing": {"name|unit": short}}]
+            in row order; recipes without ingredients count as 100% available.
+        """
+        short = self._short_entries(supply)
+        have = self.counts - np.bincount(self.rows, weights=short, minlength=len(self.recipe_ids))
+        percent = np.where(self.counts > 0, have * 100.0 / np.maximum(self.counts, 1), 100.0)
+
+        missing = [{} for _ in self.recipe_ids]
+        entries = np.flatnonzero(short)
+        amounts = self.data[entries] - supply[self.indices[entries]]
+        for row, column, amount in zip(self.rows[entries].tolist(), self.indices[entries].tolist(), amounts.tolist()):
+            missing[row][self.keys[column]] = round(amount, 2)
+
+        return [
+            {"recipe_id": recipe_id, "percent_available": round(pct), "missing": short_keys}
+            for recipe_id, pct, short_keys in zip(self.recipe_ids, percent.tolist(), missing)
+        ]
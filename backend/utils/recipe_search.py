@@ -0,0 +1,422 @@
+"""
+Recipe Search Index - Python Age 5.0
+
+In-memory full-text index over a household's recipes, kept on the
+HouseholdState next to the other recipe indexes.
+
+    tokens    token -> recipe_id -> field weight   (name > tags > instructions)
+    tiers     token -> field weight -> recipe_ids  (same postings, by weight)
+    trigrams  trigram -> tokens                    (over the vocabulary)
+    leading   first 1-2 letters -> tokens          (for very short terms)
+    tags      lowercase tag -> recipe_ids
+
+A query term matches a token exactly, as a prefix ("chick" -> chicken),
+inside it ("ken" -> chicken) or within a small edit distance ("chiken").
+Candidates come from the trigram postings, so a lookup only touches
+tokens that share letters with the term — cost grows with the
+vocabulary, which levels off quickly, not with the number of recipes.
+
+Recipes must match every query term. Their score is the sum, per term,
+of the best match quality times the field weight, plus bonuses for the
+whole query appearing in the name and for favorites.
+
+When only the best few are wanted, match() walks each term's postings
+from the highest match quality x weight down and stops as soon as no
+recipe it has not reached yet could beat the current top — broad queries
+then score a couple of tiers instead of every hit. The number of hits
+comes from set unions, without scoring, and recipes are scored a tier
+at a time with set operations rather than one by one.
+"""
+
+import heapq
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Field weights: where a token appears
+NAME_WEIGHT = 3.0
+TAG_WEIGHT = 2.0
+INSTRUCTIONS_WEIGHT = 1.0
+
+# Match quality per kind of match
+EXACT = 1.0
+PREFIX = 0.75
+INFIX = 0.5
+FUZZY = 0.4
+
+PHRASE_BONUS = 2.0
+FAVORITE_BONUS = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase alphanumeric tokens."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def trigrams(token: str) -> Set[str]:
+    """Trigrams of a token padded with ^ and $ (so short tokens still have some)."""
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(term: str) -> int:
+    """Edit distance tolerated for a query term of this length."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance counting an adjacent swap as one typo (optimal string
+    alignment), giving up with limit + 1 once every path exceeds limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+class RecipeSearchIndex:
+    """
+    Token, trigram and tag postings for one household's recipes.
+
+    Usage:
+        index = RecipeSearchIndex(state.recipes)
+        scores, total = index.match("chiken soup", top=20)   # recipe_id -> score
+        ranked = index.rank(scores)
+        index.add(recipe) / index.remove(recipe_id)  # on writes
+    """
+
+    def __init__(self, recipes: Iterable = ()):
+        self._tokens: Dict[str, Dict[str, float]] = defaultdict(dict)
+        self._tiers: Dict[str, Dict[float, Set[str]]] = defaultdict(dict)
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._leading: Dict[str, Set[str]] = defaultdict(set)
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
+        self._names: Dict[str, str] = {}          # recipe_id -> lowercase name
+        self._sort_keys: Dict[str, Tuple[str, str]] = {}  # recipe_id -> (name, id) for ties
+        self._by_name: List[Tuple[str, str]] = []          # every sort key, in order
+        self._favorites: Set[str] = set()
+        self._doc_tokens: Dict[str, Set[str]] = {}  # recipe_id -> its tokens
+        self._doc_tags: Dict[str, Set[str]] = {}
+        for recipe in recipes:
+            self._add(recipe)
+        self._by_name = sorted(self._sort_keys.values())
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def copy(self) -> 'RecipeSearchIndex':
+        """An independent copy: add/remove on it leave this index untouched."""
+        clone = RecipeSearchIndex()
+        clone._tokens = defaultdict(dict, {token: dict(postings) for token, postings in self._tokens.items()})
+        clone._tiers = defaultdict(dict, {token: {weight: set(ids) for weight, ids in tiers.items()}
+                                          for token, tiers in self._tiers.items()})
+        clone._trigrams = defaultdict(set, {gram: set(tokens) for gram, tokens in self._trigrams.items()})
+        clone._leading = defaultdict(set, {lead: set(tokens) for lead, tokens in self._leading.items()})
+        clone._tags = defaultdict(set, {tag: set(ids) for tag, ids in self._tags.items()})
+        clone._names = dict(self._names)
+        clone._sort_keys = dict(self._sort_keys)
+        clone._by_name = list(self._by_name)
+        clone._favorites = set(self._favorites)
+        # Per-recipe sets are replaced on add, never mutated
+        clone._doc_tokens = dict(self._doc_tokens)
+        clone._doc_tags = dict(self._doc_tags)
+        return clone
+
+    # ===== MAINTENANCE =====
+
+    def add(self, recipe):
+        """Index a recipe (replaces an existing entry with the same id)."""
+        if recipe.id in self._names:
+            self.remove(recipe.id)
+        self._add(recipe)
+        insort(self._by_name, self._sort_keys[recipe.id])
+
+    def _add(self, recipe):
+        """Index a recipe that isn't indexed yet, except in the name order."""
+        weights: Dict[str, float] = {}
+        for weight, text in ((INSTRUCTIONS_WEIGHT, recipe.instructions),
+                             (TAG_WEIGHT, " ".join(recipe.tags)),
+                             (NAME_WEIGHT, recipe.name)):
+            for token in tokenize(text):
+                weights[token] = max(weights.get(token, 0), weight)
+
+        for token, weight in weights.items():
+            if token not in self._tokens:
+                for gram in trigrams(token):
+                    self._trigrams[gram].add(token)
+                for lead in {token[:1], token[:2]}:
+                    self._leading[lead].add(token)
+            self._tokens[token][recipe.id] = weight
+            self._tiers[token].setdefault(weight, set()).add(recipe.id)
+
+        tags = {tag.strip().lower() for tag in recipe.tags if tag.strip()}
+        for tag in tags:
+            self._tags[tag].add(recipe.id)
+
+        self._names[recipe.id] = recipe.name.lower()
+        self._sort_keys[recipe.id] = (self._names[recipe.id], recipe.id)
+        self._doc_tokens[recipe.id] = set(weights)
+        self._doc_tags[recipe.id] = tags
+        if recipe.is_favorite:
+            self._favorites.add(recipe.id)
+
+    def remove(self, recipe_id: str):
+        """Drop a recipe from the index (no-op if absent)."""
+        if recipe_id not in self._names:
+            return
+
+        for token in self._doc_tokens.pop(recipe_id):
+            postings = self._tokens[token]
+            weight = postings.pop(recipe_id)
+            tier = self._tiers[token][weight]
+            tier.discard(recipe_id)
+            if not tier:
+                del self._tiers[token][weight]
+            if not postings:
+                del self._tokens[token]
+                del self._tiers[token]
+                for gram in trigrams(token):
+                    grams = self._trigrams[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self._trigrams[gram]
+                for lead in {token[:1], token[:2]}:
+                    leading = self._leading[lead]
+                    leading.discard(token)
+                    if not leading:
+                        del self._leading[lead]
+
+        for tag in self._doc_tags.pop(recipe_id):
+            ids = self._tags[tag]
+            ids.discard(recipe_id)
+            if not ids:
+                del self._tags[tag]
+
+        del self._names[recipe_id]
+        del self._by_name[bisect_left(self._by_name, self._sort_keys.pop(recipe_id))]
+        self._favorites.discard(recipe_id)
+
+    # ===== QUERIES =====
+
+    def with_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Recipe IDs carrying any of the tags (case-insensitive)."""
+        ids = set()
+        for tag in tags:
+            ids |= self._tags.get(tag.strip().lower(), set())
+        return ids
+
+    def match(self, query: str, top: Optional[int] = None,
+              within: Optional[Set[str]] = None) -> Tuple[Dict[str, float], int]:
+        """
+        Recipes matching every term of the query, with their relevance score.
+
+        Args:
+            query: Free text
+            top: Only score as far as needed to know the best `top` recipes
+            within: Only consider these recipe IDs (e.g. after tag filters)
+
+        Returns:
+            (recipe_id -> score for the best `top` or all matches, number of matches)
+        """
+        words = tokenize(query)
+        if not words:
+            return {}, 0
+        terms = list(dict.fromkeys(words))
+
+        # Per term: the tokens it matches and its postings as (quality x weight, ids)
+        term_tokens: List[Dict[str, float]] = []
+        term_levels: List[List[Tuple[float, Set[str]]]] = []
+        matched: Optional[Set[str]] = None
+        for term in terms:
+            tokens = dict(self._expand(term))
+            levels = sorted(((quality * weight, ids)
+                             for token, quality in tokens.items()
+                             for weight, ids in self._tiers[token].items()),
+                            key=lambda level: -level[0])
+            hits = set().union(*(ids for _, ids in levels))
+            matched = hits if matched is None else matched & hits
+            if within is not None:
+                matched &= within
+            if not matched:
+                return {}, 0
+            term_tokens.append(tokens)
+            term_levels.append(levels)
+
+        phrased = self._phrase_hits(matched, words, dict(zip(terms, term_tokens)))
+        if top is None or top >= len(matched):
+            scores: Dict[str, float] = {}
+            for score, ids in self._scored(matched, term_levels, phrased).items():
+                scores.update(dict.fromkeys(ids, score))
+            return scores, len(matched)
+
+        # Threshold walk: always take the term whose next tier scores highest.
+        # A recipe not reached yet scores at most the sum of every term's next
+        # tier, plus the bonuses some recipe not reached yet still has; once
+        # the top-th best reached beats that, stop.
+        groups: Dict[float, Set[str]] = defaultdict(set)
+        reached_all: Set[str] = set()
+        positions = [0] * len(terms)
+        phrased_left = set(phrased)
+        favorites_left = matched & self._favorites
+        while all(pos < len(levels) for pos, levels in zip(positions, term_levels)):
+            heads = [levels[pos][0] for pos, levels in zip(positions, term_levels)]
+            if len(reached_all) >= top:
+                bound = sum(heads)
+                if phrased_left:
+                    bound += PHRASE_BONUS
+                if favorites_left:
+                    bound += FAVORITE_BONUS
+                if self._nth_best(groups, top) > bound + 1e-9:
+                    break
+
+            t = max(range(len(terms)), key=heads.__getitem__)
+            level, ids = term_levels[t][positions[t]]
+            positions[t] += 1
+            reached = (ids & matched) - reached_all
+            if not reached:
+                continue
+            reached_all |= reached
+            phrased_left -= reached
+            favorites_left -= reached
+            # This tier gives term t's score for everything it reached
+            levels = term_levels[:t] + [[(level, reached)]] + term_levels[t + 1:]
+            for score, ids in self._scored(reached, levels, phrased).items():
+                groups[score] |= ids
+
+        best: Dict[str, float] = {}
+        for score in sorted(groups, reverse=True):
+            wanted = top - len(best)
+            if wanted <= 0:
+                break
+            ids = groups[score]
+            best.update(dict.fromkeys(self._first_by_name(ids, wanted) if len(ids) > wanted else ids, score))
+        return best, len(matched)
+
+    def rank(self, scores: Dict[str, float], top: Optional[int] = None) -> List[str]:
+        """Recipe IDs by descending score (ties by name, then id); only the first `top` if given."""
+        key = lambda recipe_id: (-scores[recipe_id], self._sort_keys[recipe_id])
+        if top is not None and top < len(scores):
+            return heapq.nsmallest(top, scores, key=key)
+        return sorted(scores, key=key)
+
+    @staticmethod
+    def _nth_best(groups: Dict[float, Set[str]], n: int) -> float:
+        """The n-th highest score in score -> ids groups."""
+        count = 0
+        for score in sorted(groups, reverse=True):
+            count += len(groups[score])
+            if count >= n:
+                return score
+        return float("-inf")
+
+    def _first_by_name(self, recipe_ids: Set[str], count: int) -> List[str]:
+        """The first `count` of these recipes in name order."""
+        # A big tie (a broad query's best tier) is quicker to pick out of the
+        # name-ordered list, which yields one of them every len/ties entries
+        if count * len(self._by_name) < len(recipe_ids) ** 2:
+            picked = []
+            for _, recipe_id in self._by_name:
+                if recipe_id in recipe_ids:
+                    picked.append(recipe_id)
+                    if len(picked) == count:
+                        break
+            return picked
+        return heapq.nsmallest(count, recipe_ids, key=self._sort_keys.__getitem__)
+
+    def _scored(self, recipe_ids: Set[str], term_levels: List[List[Tuple[float, Set[str]]]],
+                phrased: Set[str]) -> Dict[float, Set[str]]:
+        """
+        Score recipes that match every term, as score -> recipe_ids.
+
+        Each term's score is its highest tier holding the recipe, found by
+        splitting the set tier by tier (levels are sorted, highest first).
+        """
+        # (score per term so far) -> recipe_ids
+        classes: Dict[tuple, Set[str]] = {(): recipe_ids}
+        for levels in term_levels:
+            split: Dict[tuple, Set[str]] = {}
+            for parts, rest in classes.items():
+                for level, ids in levels:
+                    part = rest & ids
+                    if part:
+                        key = parts + (level,)
+                        split[key] = split[key] | part if key in split else part
+                        rest = rest - part
+                        if not rest:
+                            break
+            classes = split
+
+        groups: Dict[float, Set[str]] = defaultdict(set)
+        for parts, ids in classes.items():
+            score = sum(parts)
+            phrase_ids, favorite_ids = ids & phrased, ids & self._favorites
+            for bonus_ids, bonus_score in ((ids - phrase_ids - favorite_ids, score),
+                                           (phrase_ids - favorite_ids, score + PHRASE_BONUS),
+                                           (favorite_ids - phrase_ids, score + FAVORITE_BONUS),
+                                           (phrase_ids & favorite_ids, score + PHRASE_BONUS + FAVORITE_BONUS)):
+                if bonus_ids:
+                    groups[bonus_score] |= bonus_ids
+        return groups
+
+    def _phrase_hits(self, recipe_ids: Set[str], words: List[str],
+                     term_tokens: Dict[str, Dict[str, float]]) -> Set[str]:
+        """The recipes whose name contains the whole query."""
+        candidates = recipe_ids
+        # A word of 3+ letters inside the name is inside one of its tokens,
+        # which _expand returns as an exact, prefix or infix match
+        for word in dict.fromkeys(words):
+            if len(word) >= 3:
+                in_name = set().union(*(self._tiers[token].get(NAME_WEIGHT, ())
+                                        for token, quality in term_tokens[word].items()
+                                        if quality >= INFIX))
+                candidates = candidates & in_name
+        if len(words) == 1 and len(words[0]) >= 3:
+            return candidates
+        phrase, names = " ".join(words), self._names
+        return {recipe_id for recipe_id in candidates if phrase in names[recipe_id]}
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """Vocabulary tokens a query term matches, with the match quality."""
+        if len(term) < 3:
+            return [(token, EXACT if token == term else PREFIX)
+                    for token in self._leading.get(term, ())]
+
+        # Candidate tokens by shared trigrams: a token containing the term has
+        # all of its len - 2 inner trigrams, and each typo (or swap) breaks at most 4
+        typos = max_typos(term)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in trigrams(term):
+            for token in self._trigrams.get(gram, ()):
+                shared[token] += 1
+        needed = max(1, min(len(term) - 2, len(term) - 4 * typos))
+
+        matches = []
+        for token, count in shared.items():
+            if count < needed:
+                continue
+            elif token == term:
+                matches.append((token, EXACT))
+            elif token.startswith(term):
+                matches.append((token, PREFIX))
+            elif term in token:
+                matches.append((token, INFIX))
+            elif typos and (edit_distance(term, token, typos) <= typos or
+                            edit_distance(term, token[:len(term)], typos) <= typos):
+                matches.append((token, FUZZY))
+        return matches
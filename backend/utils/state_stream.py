@@ -0,0 +1,129 @@
+"""
+State Stream - Python Age 5.0
+
+Fan-out of household state events to the open /api/stream connections of
+this worker.
+
+Every write publishes one event per household (StateManager._state_event)
+on a Redis pub/sub channel. Each worker holds a single pub/sub connection,
+subscribed to the channels of the households that have a stream open
+here, and hands every message to those streams' queues. Without Redis,
+StateManager calls the hub directly — one process, same result.
+
+    queue = await state_stream.subscribe(household_id)
+    try:
+        payload = await queue.get()   # encoded event (bytes)
+    finally:
+        await state_stream.unsubscribe(household_id, queue)
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+import state_manager
+from state_manager import StateManager
+
+logger = logging.getLogger(__name__)
+
+# Events a slow client may fall behind by before it's told to resync
+QUEUE_SIZE = 100
+
+# Sent instead of the dropped events when a client's queue overflows
+RESYNC = b'{"reload":true,"resync":true}'
+
+
+class StateStreamHub:
+    """Per-process registry of stream queues, fed from Redis pub/sub."""
+
+    def __init__(self):
+        self._queues: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        StateManager.add_event_listener(self.publish_local)
+        StateManager.add_event_watcher(self.watching)
+
+    async def subscribe(self, household_id: str) -> asyncio.Queue:
+        """A queue receiving the household's events until unsubscribed."""
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        first = not self._queues[household_id]
+        self._queues[household_id].add(queue)
+
+        redis = state_manager.async_redis_client
+        if first and redis is not None:
+            try:
+                if self._pubsub is None:
+                    self._pubsub = redis.pubsub()
+                await self._pubsub.subscribe(StateManager.events_channel(household_id))
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read())
+            except Exception as e:
+                logger.warning(f"State stream subscribe error: {e}")
+        return queue
+
+    async def unsubscribe(self, household_id: str, queue: asyncio.Queue):
+        queues = self._queues.get(household_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if queues:
+            return
+
+        del self._queues[household_id]
+        if self._pubsub is not None:
+            try:
+                await self._pubsub.unsubscribe(StateManager.events_channel(household_id))
+            except Exception as e:
+                logger.warning(f"State stream unsubscribe error: {e}")
+
+    def watching(self, household_id: str) -> bool:
+        """Whether a stream of this process follows the household."""
+        return bool(self._queues.get(household_id))
+
+    def publish_local(self, household_id: str, payload: bytes):
+        """StateManager listener for events published without Redis (any thread)."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(household_id, payload)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, household_id, payload)
+
+    def _dispatch(self, household_id: str, payload: bytes):
+        for queue in self._queues.get(household_id, ()):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Too far behind to catch up event by event — start over
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+    async def _read(self):
+        """Pump pub/sub messages into the queues while any stream is open."""
+        prefix = StateManager.events_channel("")
+        while self._queues:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"State stream read error: {e}")
+                await asyncio.sleep(1)
+                continue
+            if message and message["type"] == "message":
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                self._dispatch(channel[len(prefix):], message["data"])
+
+
+state_stream = StateStreamHub()
@@ -3,10 +3,15 @@ Supabase Client - Python Age 5.0
 
 Connection to Supabase for database operations.
 Python handles all logic, Supabase handles storage.
+
+The client is created on first use, so the app (and anything importing
+utils) starts without Supabase credentials when DB_PROVIDER doesn't need
+them; asking for the client without them raises.
 """
 
-from supabase import create_client, Client
+from supabase import create_client, create_async_client, Client, AsyncClient
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,19 +19,51 @@ load_dotenv()
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError(
-        "Missing Supabase configuration! "
-        "Please set SUPABASE_URL and SUPABASE_SERVICE_KEY in .env file"
-    )
+_supabase: Optional[Client] = None
+
+
+def supabase_configured() -> bool:
+    """True if SUPABASE_URL and SUPABASE_SERVICE_KEY are set."""
+    return bool(SUPABASE_URL and SUPABASE_KEY)
 
-# Initialize Supabase client (singleton)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def _require_config():
+    if not supabase_configured():
+        raise ValueError(
+            "Missing Supabase configuration! "
+            "Please set SUPABASE_URL and SUPABASE_SERVICE_KEY in .env file"
+        )
 
 
 def get_supabase() -> Client:
     """
-    Get Supabase client instance.
+    Get Supabase client instance (created on first use).
     Use this in API endpoints for dependency injection.
     """
-    return supabase
+    global _supabase
+    if _supabase is None:
+        _require_config()
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase
+
+
+def __getattr__(name):
+    # `from utils.supabase_client import supabase` still works, lazily
+    if name == "supabase":
+        return get_supabase()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_async_supabase: Optional[AsyncClient] = None
+
+
+async def get_async_supabase() -> AsyncClient:
+    """
+    Get the async Supabase client (created on first use, inside the event loop).
+    Used by db.get_async_db() for the request hot path.
+    """
+    global _async_supabase
+    if _async_supabase is None:
+        _require_config()
+        _async_supabase = await create_async_client(SUPABASE_URL, SUPABASE_KEY)
+    return _async_supabase
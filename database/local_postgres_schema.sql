@@ -0,0 +1,129 @@
+-- Local Postgres schema for DB_PROVIDER=postgres
+-- The app tables as the backend reads and writes them (see schema_snapshot.md),
+-- for running against a plain local Postgres instead of Supabase.
+--
+--   createdb peachy && psql peachy -f database/local_postgres_schema.sql
+--   DB_PROVIDER=postgres DATABASE_URL=postgresql://localhost/peachy
+--
+-- Users still sign in through Supabase Auth, so there is no auth.users here
+-- and user ids are plain uuids.
+
+CREATE TABLE IF NOT EXISTS households (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    name text NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    created_by uuid
+);
+
+CREATE TABLE IF NOT EXISTS household_members (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid REFERENCES households(id) ON DELETE CASCADE,
+    user_id uuid,
+    role text DEFAULT 'member',
+    created_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS household_invites (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid REFERENCES households(id) ON DELETE CASCADE,
+    code text NOT NULL,
+    expires_at timestamptz NOT NULL,
+    created_at timestamptz DEFAULT now(),
+    created_by uuid,
+    used_at timestamptz,
+    used_by uuid,
+    role text DEFAULT 'member'
+);
+
+CREATE TABLE IF NOT EXISTS household_settings (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+    locations jsonb DEFAULT '["Pantry", "Refrigerator", "Freezer", "Cabinet", "Counter"]',
+    categories jsonb DEFAULT '["Meat", "Dairy", "Produce", "Pantry", "Frozen", "Spices", "Beverages", "Snacks", "Other"]',
+    category_emojis jsonb DEFAULT '{}',
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS pantry_items (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid REFERENCES households(id) ON DELETE CASCADE,
+    created_by uuid,
+    name text NOT NULL,
+    category text DEFAULT 'pantry',
+    quantity numeric DEFAULT 1,
+    unit text DEFAULT '',
+    expiration_date date,
+    notes text,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    item_category text,
+    reserved_quantity numeric DEFAULT 0,
+    min_threshold numeric DEFAULT 0,
+    preferred_store text
+);
+
+CREATE TABLE IF NOT EXISTS pantry_locations (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    pantry_item_id uuid NOT NULL REFERENCES pantry_items(id) ON DELETE CASCADE,
+    location_name text NOT NULL,
+    quantity numeric NOT NULL DEFAULT 0,
+    expiration_date date,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS recipes (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid REFERENCES households(id) ON DELETE CASCADE,
+    created_by uuid,
+    name text NOT NULL,
+    servings integer DEFAULT 4,
+    category text,
+    image_url text,
+    photo text,
+    instructions text,
+    ingredients jsonb DEFAULT '[]',
+    tags jsonb DEFAULT '[]',
+    favorite boolean DEFAULT false
+);
+
+CREATE TABLE IF NOT EXISTS meal_plans (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    household_id uuid REFERENCES households(id) ON DELETE CASCADE,
+    week text,
+    day_of_week text,
+    recipe_ids jsonb DEFAULT '[]',
+    planned_date date,
+    created_at timestamptz DEFAULT now(),
+    updated_at timestamptz DEFAULT now(),
+    meal_type text,
+    is_cooked boolean DEFAULT false,
+    recipe_id uuid REFERENCES recipes(id) ON DELETE SET NULL,
+    serving_multiplier numeric DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS shopping_list_manual (
+    id bigserial PRIMARY KEY,
+    household_id uuid NOT NULL REFERENCES households(id) ON DELETE CASCADE,
+    name text NOT NULL,
+    quantity numeric DEFAULT 1,
+    unit text,
+    category text DEFAULT 'Other',
+    checked boolean DEFAULT false,
+    checked_at timestamptz,
+    checked_by uuid,
+    created_at timestamptz DEFAULT now()
+);
+
+-- The lookups every request and every household load makes
+CREATE INDEX IF NOT EXISTS idx_household_members_user ON household_members (user_id);
+CREATE INDEX IF NOT EXISTS idx_household_members_household ON household_members (household_id);
+CREATE INDEX IF NOT EXISTS idx_household_settings_household ON household_settings (household_id);
+CREATE INDEX IF NOT EXISTS idx_household_invites_code ON household_invites (code);
+CREATE INDEX IF NOT EXISTS idx_pantry_items_household ON pantry_items (household_id);
+CREATE INDEX IF NOT EXISTS idx_pantry_locations_item ON pantry_locations (pantry_item_id);
+CREATE INDEX IF NOT EXISTS idx_recipes_household ON recipes (household_id);
+CREATE INDEX IF NOT EXISTS idx_meal_plans_household_date ON meal_plans (household_id, planned_date);
+CREATE INDEX IF NOT EXISTS idx_shopping_list_manual_household ON shopping_list_manual (household_id);
@@ -95,6 +95,20 @@ class API {
     localStorage.setItem('active_household_id', id);
   }
 
+  /**
+   * Per-tab client id, sent as X-Client-Id and echoed back as the "origin"
+   * of live sync events caused by this tab's writes
+   */
+  static getClientId() {
+    let id = sessionStorage.getItem('ck-client-id');
+    if (!id) {
+      id = (crypto.randomUUID && crypto.randomUUID()) ||
+        `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+      sessionStorage.setItem('ck-client-id', id);
+    }
+    return id;
+  }
+
   /**
    * Make API call
    */
@@ -126,12 +140,8 @@ class API {
     if (householdId) {
       headers['X-Household-Id'] = householdId;
     }
-
-    // Mark local write for Realtime debounce (skip GET requests)
-    const method = (options.method || 'GET').toUpperCase();
-    if (method !== 'GET' && typeof window.markLocalWrite === 'function') {
-      window.markLocalWrite();
-    }
+    // Lets live sync recognise (and skip) the echo of this tab's own writes
+    headers['X-Client-Id'] = this.getClientId();
 
     const fetchOptions = { ...options, headers };
     delete fetchOptions.rawBody;
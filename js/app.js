@@ -49,32 +49,7 @@ function renderPantryList(items) {
     return;
   }
 
-  // Transform backend data format to frontend format
-  // Backend uses: min_threshold, quantity, expiration_date
-  // Frontend expects: min, totalQty, locations with qty/expiry
-  const transformedItems = items.map(item => {
-    // Transform locations
-    const locations = (item.locations || []).map(loc => ({
-      id: loc.id,
-      location: loc.location || loc.location_name || 'Unknown',
-      qty: loc.quantity || loc.qty || 0,
-      expiry: loc.expiration_date || loc.expiry || null
-    }));
-
-    // Calculate total quantity from locations
-    const totalQty = locations.reduce((sum, loc) => sum + (loc.qty || 0), 0);
-
-    return {
-      id: item.id,
-      name: item.name,
-      category: item.category || 'Other',
-      unit: item.unit || 'unit',
-      min: item.min_threshold || item.min || 0,
-      preferredStore: item.preferred_store || '',
-      totalQty: totalQty,
-      locations: locations
-    };
-  });
+  const transformedItems = items.map(toPantryView);
 
   // Store transformed items globally for other scripts to access
   window.pantry = transformedItems;
@@ -83,6 +58,35 @@ function renderPantryList(items) {
   if (typeof window.renderPantryLedger === 'function') window.renderPantryLedger();
 }
 
+/**
+ * Transform a backend pantry item to the frontend format.
+ * Backend uses: min_threshold, quantity, expiration_date
+ * Frontend expects: min, totalQty, locations with qty/expiry
+ */
+function toPantryView(item) {
+  // Transform locations
+  const locations = (item.locations || []).map(loc => ({
+    id: loc.id,
+    location: loc.location || loc.location_name || 'Unknown',
+    qty: loc.quantity || loc.qty || 0,
+    expiry: loc.expiration_date || loc.expiry || null
+  }));
+
+  // Calculate total quantity from locations
+  const totalQty = locations.reduce((sum, loc) => sum + (loc.qty || 0), 0);
+
+  return {
+    id: item.id,
+    name: item.name,
+    category: item.category || 'Other',
+    unit: item.unit || 'unit',
+    min: item.min_threshold || item.min || 0,
+    preferredStore: item.preferred_store || '',
+    totalQty: totalQty,
+    locations: locations
+  };
+}
+
 /* ============================================================================
    RECIPE FUNCTIONS
 ============================================================================ */
@@ -142,30 +146,7 @@ function renderRecipeList(recipes) {
     return;
   }
 
-  // Transform backend data format to frontend format
-  // Backend uses: photo_url, quantity (in ingredients)
-  // Frontend expects: photo, qty (in ingredients), servings, cookTime, category, isFavorite
-  const transformedRecipes = recipes.map(recipe => {
-    // Transform ingredients
-    const ingredients = (recipe.ingredients || []).map(ing => ({
-      name: ing.name || '',
-      qty: ing.quantity || ing.qty || 0,
-      unit: ing.unit || ''
-    }));
-
-    return {
-      id: recipe.id,
-      name: recipe.name || 'Untitled Recipe',
-      servings: recipe.servings || recipe.yield || 4,
-      cookTime: recipe.cook_time || recipe.cookTime || recipe.time || '30min',
-      category: recipe.category || 'Uncategorized',
-      photo: recipe.photo_url || recipe.photo || '',
-      tags: recipe.tags || [],
-      isFavorite: recipe.is_favorite || recipe.isFavorite || false,
-      instructions: recipe.instructions || recipe.method || '',
-      ingredients: ingredients
-    };
-  });
+  const transformedRecipes = recipes.map(toRecipeView);
 
   // Store transformed recipes globally (needed by meals page for recipe names)
   window.recipes = transformedRecipes;
@@ -174,6 +155,33 @@ function renderRecipeList(recipes) {
   if (typeof window.refreshRecipeView === 'function') window.refreshRecipeView();
 }
 
+/**
+ * Transform a backend recipe to the frontend format.
+ * Backend uses: photo_url, quantity (in ingredients)
+ * Frontend expects: photo, qty (in ingredients), servings, cookTime, category, isFavorite
+ */
+function toRecipeView(recipe) {
+  // Transform ingredients
+  const ingredients = (recipe.ingredients || []).map(ing => ({
+    name: ing.name || '',
+    qty: ing.quantity || ing.qty || 0,
+    unit: ing.unit || ''
+  }));
+
+  return {
+    id: recipe.id,
+    name: recipe.name || 'Untitled Recipe',
+    servings: recipe.servings || recipe.yield || 4,
+    cookTime: recipe.cook_time || recipe.cookTime || recipe.time || '30min',
+    category: recipe.category || 'Uncategorized',
+    photo: recipe.photo_url || recipe.photo || '',
+    tags: recipe.tags || [],
+    isFavorite: recipe.is_favorite || recipe.isFavorite || false,
+    instructions: recipe.instructions || recipe.method || '',
+    ingredients: ingredients
+  };
+}
+
 /* ============================================================================
    RESERVED INGREDIENTS CALCULATION
 ============================================================================ */
@@ -196,24 +204,14 @@ async function loadMealPlans() {
     // Frontend expects: { '2026-01-19': [{ id, recipeId, mealType, cooked }] }
     const plannerByDate = {};
     meals.forEach(meal => {
-      // Get date string (backend uses 'date' or 'planned_date')
-      const dateStr = meal.date || meal.planned_date;
-      if (!dateStr) return;
-
-      // Normalize date format to YYYY-MM-DD
-      const dateKey = typeof dateStr === 'string' ? dateStr.split('T')[0] : dateStr;
+      const dateKey = plannerDateKey(meal);
+      if (!dateKey) return;
 
       if (!plannerByDate[dateKey]) {
         plannerByDate[dateKey] = [];
       }
 
-      plannerByDate[dateKey].push({
-        id: meal.id,
-        recipeId: meal.recipe_id || meal.recipeId,
-        mealType: meal.meal_type || meal.mealType || 'Dinner',
-        cooked: meal.cooked || meal.is_cooked || false,
-        servingMultiplier: meal.serving_multiplier || meal.servingMultiplier || 1
-      });
+      plannerByDate[dateKey].push(toPlannerEntry(meal));
     });
 
     // Store globally for meal planning script
@@ -233,6 +231,31 @@ async function loadMealPlans() {
   }
 }
 
+/**
+ * Planner date key (YYYY-MM-DD) of a backend meal plan, or null.
+ */
+function plannerDateKey(meal) {
+  // Get date string (backend uses 'date' or 'planned_date')
+  const dateStr = meal.date || meal.planned_date;
+  if (!dateStr) return null;
+
+  // Normalize date format to YYYY-MM-DD
+  return typeof dateStr === 'string' ? dateStr.split('T')[0] : dateStr;
+}
+
+/**
+ * Transform a backend meal plan to a planner entry.
+ */
+function toPlannerEntry(meal) {
+  return {
+    id: meal.id,
+    recipeId: meal.recipe_id || meal.recipeId,
+    mealType: meal.meal_type || meal.mealType || 'Dinner',
+    cooked: meal.cooked || meal.is_cooked || false,
+    servingMultiplier: meal.serving_multiplier || meal.servingMultiplier || 1
+  };
+}
+
 async function deleteMealPlan(mealId) {
   if (!confirm('Remove this meal from calendar?')) return;
 
@@ -285,7 +308,6 @@ async function deleteShoppingItem(itemId) {
   const itemName = item?.name;
 
   try {
-    if (typeof markLocalWrite === 'function') markLocalWrite();
     await API.call(`/shopping-list/items/${itemId}`, {
       method: 'DELETE'
     });
@@ -558,8 +580,6 @@ async function toggleShoppingItem(itemKey, itemId, checked) {
     itemElement.classList.toggle('checked', checked);
   }
 
-  if (typeof markLocalWrite === 'function') markLocalWrite();
-
   if (itemId) {
     // Manual item with ID - update backend
     try {
@@ -1,9 +1,17 @@
 /* ============================================================================
-   SUPABASE REALTIME SYNC
+   LIVE SYNC (server-sent state diffs from /api/stream)
    ============================================================================ */
 
-let _supabaseClient = null;
-let _realtimeChannel = null;
+// The backend streams one event per write to this household, carrying the
+// new segment versions and what was added, changed and removed. Events are
+// patched straight into window.pantry / recipes / planner / shoppingList;
+// a segment is re-fetched only when we missed a version or the server could
+// not produce a diff. fetch() is used rather than EventSource because the
+// stream needs the Authorization and X-Household-Id headers.
+
+let _streamController = null;      // AbortController of the open stream
+let _streamVersions = null;        // segment versions we hold: {pantry, recipes, meals, manual}
+let _stallTimer = null;
 
 // Reconnection state
 let _reconnectAttempts = 0;
@@ -15,20 +23,18 @@ let _initInProgress = false;       // guard against concurrent initRealtime() ca
 let _stableTimer = null;           // delays resetting _reconnectAttempts until connection proves stable
 const MAX_RECONNECT_ATTEMPTS = 5;
 const RECONNECT_DELAYS = [2000, 4000, 8000, 16000, 30000];
+// The server sends a keepalive every 15s; three missed ones means the
+// connection is dead even if the socket hasn't noticed (mobile networks).
+const STREAM_STALL_MS = 45000;
 // Only show "Live sync restored" toast if we were down for more than this long.
-// Suppresses the noisy toast on mobile OS briefly killing the WebSocket.
+// Suppresses the noisy toast on mobile OS briefly killing the connection.
 const RESTORED_TOAST_MIN_OUTAGE_MS = 8000;
 // Minimum gap between "restored" / "offline" status toasts to prevent spam.
 const STATUS_TOAST_COOLDOWN_MS = 15000;
 let _lastStatusToastAt = 0;
 
-// Track our own recent writes so we don't double-reload on our own changes
-let _lastLocalWrite = 0;
-const LOCAL_WRITE_DEBOUNCE = 2000; // ignore events within 2s of our own write
-
-function markLocalWrite() {
-  _lastLocalWrite = Date.now();
-}
+// Backend state segment -> section to re-fetch when it can't be patched
+const SEGMENT_SECTIONS = { pantry: 'pantry', recipes: 'recipes', meals: 'meals', manual: 'shopping' };
 
 async function initRealtime() {
   // Prevent concurrent init calls (e.g. reconnect timer + visibilitychange firing simultaneously)
@@ -36,152 +42,157 @@ async function initRealtime() {
   _initInProgress = true;
 
   try {
-    // Use cached realtime config to avoid extra API call on page switches
-    let config;
-    const cachedConfig = sessionStorage.getItem('ck-realtime-config');
-    if (cachedConfig) {
-      config = JSON.parse(cachedConfig);
-    } else {
-      config = await API.call('/realtime/config');
-      if (config && config.supabase_url) {
-        sessionStorage.setItem('ck-realtime-config', JSON.stringify(config));
-      }
-    }
-    if (!config || !config.supabase_url || !config.anon_key) {
-      console.warn('Realtime not configured on backend.');
-      return;
-    }
-
-    const { createClient } = window.supabase;
-    if (!createClient) {
-      console.warn('Supabase JS client not loaded.');
+    const householdId = API.getActiveHouseholdId();
+    if (!householdId) {
+      console.warn('No active household for live sync.');
       return;
     }
 
-    // Clean up any dead channel before re-subscribing.
-    // IMPORTANT: set _intentionalClose = true first so the CLOSED callback that fires
-    // asynchronously for the old channel does not trigger a second reconnect chain.
-    if (_realtimeChannel && _supabaseClient) {
+    // Close any previous stream first. _intentionalClose keeps its read
+    // loop from scheduling a second reconnect chain when it ends.
+    if (_streamController) {
       _intentionalClose = true;
-      try { _supabaseClient.removeChannel(_realtimeChannel); } catch (e) {}
-      _realtimeChannel = null;
-    }
-
-    // Only create the Supabase client once — recreating it on every reconnect
-    // triggers a "Multiple GoTrueClient instances" warning from the SDK.
-    if (!_supabaseClient) {
-      _supabaseClient = createClient(config.supabase_url, config.anon_key, {
-        auth: { persistSession: false, autoRefreshToken: false, storageKey: 'ck-realtime' }
-      });
-    }
-
-    // ── CRITICAL: authenticate Realtime with the user's JWT ──────────────────
-    // Without this, the Supabase channel subscribes as the anonymous role.
-    // RLS policies block postgres_changes events for the anon role, so the
-    // channel shows SUBSCRIBED but events are silently never delivered.
-    const userToken = API.getToken();
-    if (userToken) {
-      _supabaseClient.realtime.setAuth(userToken);
+      _streamController.abort();
+      _streamController = null;
     }
-    // ─────────────────────────────────────────────────────────────────────────
 
-    const householdId = API.getActiveHouseholdId();
-    if (!householdId) {
-      console.warn('No active household for Realtime subscriptions.');
+    if (API.isTokenExpiring() && !(await API.refreshAccessToken())) {
+      _scheduleReconnect('auth');
       return;
     }
 
+    const headers = {
+      'Accept': 'text/event-stream',
+      'X-Household-Id': householdId,
+      'X-Client-Id': API.getClientId()
+    };
+    const token = API.getToken();
+    if (token) headers['Authorization'] = `Bearer ${token}`;
+
+    const controller = new AbortController();
+    _streamController = controller;
     _intentionalClose = false;
 
-    // Subscribe to all core tables for this household.
-    // Note: pantry_locations has no household_id column so it is intentionally
-    // excluded — pantry_items events cover all data consumers need.
-    _realtimeChannel = _supabaseClient
-      .channel(`household-${householdId}`)
-      .on('postgres_changes', { event: '*', schema: 'public', table: 'pantry_items', filter: `household_id=eq.${householdId}` }, (payload) => {
-        handleRealtimeEvent('pantry', payload);
-      })
-      .on('postgres_changes', { event: '*', schema: 'public', table: 'recipes', filter: `household_id=eq.${householdId}` }, (payload) => {
-        handleRealtimeEvent('recipes', payload);
-      })
-      .on('postgres_changes', { event: '*', schema: 'public', table: 'meal_plans', filter: `household_id=eq.${householdId}` }, (payload) => {
-        handleRealtimeEvent('meals', payload);
-      })
-      .on('postgres_changes', { event: '*', schema: 'public', table: 'shopping_list_manual', filter: `household_id=eq.${householdId}` }, (payload) => {
-        handleRealtimeEvent('shopping', payload);
-      })
-      .subscribe((status) => {
-        if (status === 'SUBSCRIBED') {
-          if (_reconnectTimer) {
-            clearTimeout(_reconnectTimer);
-            _reconnectTimer = null;
-          }
-          // Don't reset _reconnectAttempts immediately — wait 10s to confirm the
-          // connection is stable. A flapping connection (SUBSCRIBED → CHANNEL_ERROR
-          // within seconds) would otherwise reset the backoff counter every cycle,
-          // defeating exponential backoff entirely.
-          if (_stableTimer) clearTimeout(_stableTimer);
-          _stableTimer = setTimeout(() => {
-            _reconnectAttempts = 0;
-            _stableTimer = null;
-          }, 10000);
-
-          const now = Date.now();
-          if (!sessionStorage.getItem('ck-realtime-connected')) {
-            sessionStorage.setItem('ck-realtime-connected', '1');
-            showToast('Live sync connected', 'success', 2000);
-            _lastStatusToastAt = now;
-          } else if (_wasDisconnected && (now - _disconnectedAt) >= RESTORED_TOAST_MIN_OUTAGE_MS
-                     && (now - _lastStatusToastAt) >= STATUS_TOAST_COOLDOWN_MS) {
-            // Only announce "restored" if the outage was long enough to matter
-            // and we haven't just shown another status toast (prevents spam on flap)
-            showToast('Live sync restored', 'success', 2000);
-            _lastStatusToastAt = now;
-          }
-          // Clear the smart banner if realtime was previously lost
-          if (window._notifyRealtimeState) window._notifyRealtimeState(false);
-          _wasDisconnected = false;
-          _disconnectedAt = 0;
-        } else if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT') {
-          if (_stableTimer) { clearTimeout(_stableTimer); _stableTimer = null; }
-          console.warn(`Realtime ${status} — scheduling reconnect`);
-          _scheduleReconnect(status);
-        } else if (status === 'CLOSED' && !_intentionalClose) {
-          if (_stableTimer) { clearTimeout(_stableTimer); _stableTimer = null; }
-          console.warn('Realtime CLOSED unexpectedly — scheduling reconnect');
-          _scheduleReconnect('CLOSED');
-        }
-      });
+    const response = await fetch(`${API_BASE}/stream`, {
+      headers,
+      cache: 'no-store',
+      signal: controller.signal
+    });
+    if (!response.ok || !response.body) {
+      if (response.status === 401) await API.refreshAccessToken();
+      throw new Error(`stream ${response.status}`);
+    }
+
+    _onStreamOpen();
+    // Read in the background; initRealtime() returns once we're connected
+    _readStream(response.body, controller);
 
   } catch (error) {
-    console.error('Failed to initialize Realtime:', error);
+    if (error.name === 'AbortError') return;
+    console.error('Failed to initialize live sync:', error);
+    _streamController = null;
     _scheduleReconnect('init-error');
   } finally {
     _initInProgress = false;
   }
 }
 
+function _onStreamOpen() {
+  if (_reconnectTimer) {
+    clearTimeout(_reconnectTimer);
+    _reconnectTimer = null;
+  }
+  // Don't reset _reconnectAttempts immediately — wait 10s to confirm the
+  // connection is stable. A flapping connection (open → error within
+  // seconds) would otherwise reset the backoff counter every cycle,
+  // defeating exponential backoff entirely.
+  if (_stableTimer) clearTimeout(_stableTimer);
+  _stableTimer = setTimeout(() => {
+    _reconnectAttempts = 0;
+    _stableTimer = null;
+  }, 10000);
+
+  const now = Date.now();
+  if (!sessionStorage.getItem('ck-realtime-connected')) {
+    sessionStorage.setItem('ck-realtime-connected', '1');
+    showToast('Live sync connected', 'success', 2000);
+    _lastStatusToastAt = now;
+  } else if (_wasDisconnected && (now - _disconnectedAt) >= RESTORED_TOAST_MIN_OUTAGE_MS
+             && (now - _lastStatusToastAt) >= STATUS_TOAST_COOLDOWN_MS) {
+    // Only announce "restored" if the outage was long enough to matter
+    // and we haven't just shown another status toast (prevents spam on flap)
+    showToast('Live sync restored', 'success', 2000);
+    _lastStatusToastAt = now;
+  }
+  // Clear the smart banner if live sync was previously lost
+  if (window._notifyRealtimeState) window._notifyRealtimeState(false);
+  _wasDisconnected = false;
+  _disconnectedAt = 0;
+}
+
+async function _readStream(body, controller) {
+  const reader = body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = '';
+  let reason = 'CLOSED';
+
+  const resetStall = () => {
+    if (_stallTimer) clearTimeout(_stallTimer);
+    _stallTimer = setTimeout(() => {
+      reason = 'TIMED_OUT';
+      controller.abort();
+    }, STREAM_STALL_MS);
+  };
+
+  try {
+    resetStall();
+    while (true) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      resetStall();
+      buffer += value;
+
+      // Frames are separated by a blank line
+      let end;
+      while ((end = buffer.indexOf('\n\n')) !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        _handleFrame(frame);
+      }
+    }
+  } catch (err) {
+    if (err.name !== 'AbortError') {
+      reason = 'CHANNEL_ERROR';
+      console.warn('Live sync stream error:', err);
+    }
+  } finally {
+    if (_stallTimer) { clearTimeout(_stallTimer); _stallTimer = null; }
+  }
+
+  // Only the current stream may reconnect; a replaced or closed one just ends
+  if (_streamController !== controller || (_intentionalClose && reason === 'CLOSED')) return;
+  _streamController = null;
+  if (_stableTimer) { clearTimeout(_stableTimer); _stableTimer = null; }
+  console.warn(`Live sync ${reason} — scheduling reconnect`);
+  _scheduleReconnect(reason);
+}
+
 function _scheduleReconnect(reason) {
   if (!_wasDisconnected) {
     _wasDisconnected = true;
     _disconnectedAt = Date.now();
   }
 
-  // Remove the dead channel
-  if (_realtimeChannel && _supabaseClient) {
-    try { _supabaseClient.removeChannel(_realtimeChannel); } catch (e) {}
-    _realtimeChannel = null;
-  }
+  if (_reconnectTimer) return;
 
   if (_reconnectAttempts >= MAX_RECONNECT_ATTEMPTS) {
-    console.warn('Realtime: max reconnect attempts reached');
+    console.warn('Live sync: max reconnect attempts reached');
     if (window._notifyRealtimeState) window._notifyRealtimeState(true);
     return;
   }
 
   const delay = RECONNECT_DELAYS[_reconnectAttempts] || 30000;
   _reconnectAttempts++;
-  console.warn(`Realtime ${reason} — reconnect attempt ${_reconnectAttempts}/${MAX_RECONNECT_ATTEMPTS} in ${delay}ms`);
+  console.warn(`Live sync ${reason} — reconnect attempt ${_reconnectAttempts}/${MAX_RECONNECT_ATTEMPTS} in ${delay}ms`);
 
   _reconnectTimer = setTimeout(() => {
     _reconnectTimer = null;
@@ -189,16 +200,202 @@ function _scheduleReconnect(reason) {
   }, delay);
 }
 
+/* ----------------------------------------------------------------------------
+   Events
+   ---------------------------------------------------------------------------- */
+
+function _handleFrame(frame) {
+  let event = 'message';
+  const data = [];
+  for (const line of frame.split('\n')) {
+    if (line.startsWith(':')) continue;              // keepalive comment
+    if (line.startsWith('event:')) event = line.slice(6).trim();
+    else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+  }
+  if (!data.length) return;
+
+  let payload;
+  try {
+    payload = JSON.parse(data.join('\n'));
+  } catch (e) {
+    console.warn('Live sync: bad event', e);
+    return;
+  }
+
+  if (event === 'hello') handleStreamHello(payload);
+  else if (event === 'state') handleStateEvent(payload);
+}
+
+/**
+ * First event of every stream: the current versions. After a reconnect,
+ * re-fetch whatever changed while we were away.
+ */
+function handleStreamHello({ versions }) {
+  const previous = _streamVersions;
+  _streamVersions = { ...versions };
+  if (!previous) return;
+
+  for (const segment of Object.keys(versions)) {
+    if (previous[segment] !== versions[segment]) {
+      scheduleSectionReload(SEGMENT_SECTIONS[segment], { quiet: true });
+    }
+  }
+}
+
+/**
+ * A write happened. Patch it in if we hold the version right before it,
+ * otherwise re-fetch the segments it touched.
+ */
+function handleStateEvent(event) {
+  if (event.resync) {
+    // We fell too far behind; a fresh stream says which segments to re-fetch
+    initRealtime();
+    return;
+  }
+
+  const segments = event.segments || [];
+  const held = _streamVersions || {};
+  const inOrder = segments.every(s => held[s] !== undefined && event.versions[s] === held[s] + 1);
+  _streamVersions = { ...held, ...event.versions };
+
+  // Our own write — its response already updated this tab
+  if (event.origin && event.origin === API.getClientId()) return;
+
+  if (event.changes && inOrder) {
+    applyStateChanges(event.changes);
+    _showChangeToast(segments, event.changes);
+  } else {
+    for (const segment of segments) {
+      scheduleSectionReload(SEGMENT_SECTIONS[segment]);
+    }
+  }
+}
+
+/**
+ * Patch a list with one collection's {added, changed, removed}.
+ * keyOf must give the same key for the backend entity and the list entry.
+ */
+function patchList(list, change, keyOf, transform = (entity) => entity) {
+  const removed = new Set((change.removed || []).map(String));
+  const upserts = new Map();
+  for (const entity of [...(change.added || []), ...(change.changed || [])]) {
+    upserts.set(String(keyOf(entity)), transform(entity));
+  }
+
+  const patched = [];
+  for (const entry of list) {
+    const key = String(keyOf(entry));
+    if (removed.has(key)) continue;
+    if (upserts.has(key)) {
+      patched.push(upserts.get(key));
+      upserts.delete(key);
+    } else {
+      patched.push(entry);
+    }
+  }
+  return patched.concat([...upserts.values()]);
+}
+
+/**
+ * Apply a state event's "changes" to the lists this page holds and
+ * re-render. Lists the page never loaded are left alone.
+ */
+function applyStateChanges(changes) {
+  const byId = (entity) => entity.id;
+
+  if (changes.pantry_items && Array.isArray(window.pantry)) {
+    window.pantry = patchList(window.pantry, changes.pantry_items, byId, toPantryView);
+  }
+
+  if (changes.reserved_ingredients && window.reservedIngredients) {
+    const { added = {}, changed = {}, removed = [] } = changes.reserved_ingredients;
+    const reserved = { ...window.reservedIngredients, ...added, ...changed };
+    removed.forEach(key => delete reserved[key]);
+    window.reservedIngredients = reserved;
+  }
+
+  if (changes.pantry_items || changes.reserved_ingredients) {
+    if (window.renderPantryLedger) window.renderPantryLedger();
+  }
+
+  if (changes.recipes && Array.isArray(window.recipes)) {
+    window.recipes = patchList(window.recipes, changes.recipes, byId, toRecipeView);
+    if (typeof window.refreshRecipeView === 'function') window.refreshRecipeView();
+  }
+
+  if (changes.meal_plans && window.planner) {
+    const { added = [], changed = [], removed = [] } = changes.meal_plans;
+    const drop = new Set([...removed, ...changed.map(byId)].map(String));
+    const planner = {};
+    for (const [dateKey, meals] of Object.entries(window.planner)) {
+      const kept = meals.filter(meal => !drop.has(String(meal.id)));
+      if (kept.length) planner[dateKey] = kept;
+    }
+    for (const meal of [...added, ...changed]) {
+      const dateKey = plannerDateKey(meal);
+      if (!dateKey) continue;
+      (planner[dateKey] = planner[dateKey] || []).push(toPlannerEntry(meal));
+    }
+    window.planner = planner;
+  }
+
+  if (changes.meal_plans || changes.recipes) {
+    if (window.reloadCalendar) window.reloadCalendar();
+  }
+
+  if (changes.shopping_list && Array.isArray(window.shoppingList)) {
+    const list = patchList(window.shoppingList, changes.shopping_list,
+                           (item) => item.id || `${item.name}|${item.unit}`);
+    // Same order the backend serves the list in
+    const key = (item) => [item.category || '', item.name || '', item.unit || ''];
+    list.sort((a, b) => {
+      const ka = key(a), kb = key(b);
+      for (let i = 0; i < ka.length; i++) {
+        if (ka[i] !== kb[i]) return ka[i] < kb[i] ? -1 : 1;
+      }
+      return 0;
+    });
+    renderShoppingList(list);
+  }
+}
+
+function _showChangeToast(segments, changes) {
+  const first = (change) => change && ([...(change.added || []), ...(change.changed || [])][0]);
+  const onlyRemoved = (change) => change && !first(change) && (change.removed || []).length > 0;
+  let msg = null;
+
+  if (segments.includes('pantry')) {
+    const item = first(changes.pantry_items);
+    msg = item ? `${item.name} updated in the Pantry`
+               : (onlyRemoved(changes.pantry_items) ? 'Pantry item removed' : 'Pantry updated');
+  } else if (segments.includes('recipes')) {
+    const recipe = first(changes.recipes);
+    msg = recipe ? `"${recipe.name}" updated`
+                 : (onlyRemoved(changes.recipes) ? 'Recipe removed' : 'Recipes updated');
+  } else if (segments.includes('meals')) {
+    const meal = (changes.meal_plans?.added || [])[0];
+    const recipe = meal ? (window.recipes || []).find(r => r.id === meal.recipe_id) : null;
+    msg = recipe ? `${recipe.name} added to the Meal Plan` : 'Meal plan updated';
+  } else if (segments.includes('manual')) {
+    const item = (changes.shopping_list?.added || [])[0];
+    msg = item ? `${item.name} added to the Shopping List` : 'Shopping list updated';
+  }
+
+  if (msg) showToast(msg, 'sync', 3000);
+}
+
+/* ----------------------------------------------------------------------------
+   Re-fetch fallback
+   ---------------------------------------------------------------------------- */
+
 // Debounce reload calls per section to avoid rapid-fire reloads
 const _realtimeReloadTimers = {};
-const _realtimeLastPayloads = {};
+const _realtimeReloadQuiet = {};
 
-function handleRealtimeEvent(section, payload) {
-  // Skip if this was our own write (within debounce window)
-  if (Date.now() - _lastLocalWrite < LOCAL_WRITE_DEBOUNCE) return;
-
-  // Keep the latest payload so the toast can reference the changed record
-  _realtimeLastPayloads[section] = payload;
+function scheduleSectionReload(section, { quiet = false } = {}) {
+  if (!section) return;
+  // One toast is enough: stay quiet only if every batched request was quiet
+  _realtimeReloadQuiet[section] = (_realtimeReloadQuiet[section] ?? true) && quiet;
 
   // Debounce: if multiple events fire for the same section within 500ms, batch them
   if (_realtimeReloadTimers[section]) {
@@ -206,55 +403,37 @@ function handleRealtimeEvent(section, payload) {
   }
 
   _realtimeReloadTimers[section] = setTimeout(() => {
-    const latestPayload = _realtimeLastPayloads[section];
+    const isQuiet = _realtimeReloadQuiet[section];
     delete _realtimeReloadTimers[section];
-    delete _realtimeLastPayloads[section];
-    reloadSection(section, latestPayload.eventType, latestPayload.new || latestPayload.old);
+    delete _realtimeReloadQuiet[section];
+    reloadSection(section, { quiet: isQuiet });
   }, 500);
 }
 
-async function reloadSection(section, eventType, record) {
-  const isDelete = eventType === 'DELETE';
+async function reloadSection(section, { quiet = false } = {}) {
   try {
     switch (section) {
       case 'pantry': {
         await Promise.all([loadPantry(), loadShoppingList({ fromRealtime: true })]);
-        const name = record?.name;
-        const msg = name
-          ? (isDelete ? `${name} removed from the Pantry` : `${name} updated in the Pantry`)
-          : (isDelete ? 'Pantry item removed' : 'Pantry updated');
-        showToast(msg, 'sync', 3000);
+        if (!quiet) showToast('Pantry updated', 'sync', 3000);
         break;
       }
       case 'recipes': {
         await loadRecipes();
         // Refresh the meal calendar if open so recipe name changes are reflected
         if (window.reloadCalendar) window.reloadCalendar();
-        const name = record?.name;
-        const msg = name
-          ? (isDelete ? `"${name}" removed from Recipes` : `"${name}" updated`)
-          : (isDelete ? 'Recipe removed' : 'Recipes updated');
-        showToast(msg, 'sync', 3000);
+        if (!quiet) showToast('Recipes updated', 'sync', 3000);
         break;
       }
       case 'meals': {
         await Promise.all([loadMealPlans(), loadShoppingList({ fromRealtime: true })]);
         if (window.renderPantryLedger) window.renderPantryLedger();
-        const recipeId = record?.recipe_id;
-        const recipe = recipeId ? (window.recipes || []).find(r => r.id === recipeId) : null;
-        const msg = recipe
-          ? (isDelete ? `${recipe.name} removed from the Meal Plan` : `${recipe.name} added to the Meal Plan`)
-          : (isDelete ? 'Meal plan updated' : 'Meal plan updated');
-        showToast(msg, 'sync', 3000);
+        if (!quiet) showToast('Meal plan updated', 'sync', 3000);
         break;
       }
       case 'shopping': {
         await loadShoppingList({ fromRealtime: true });
-        const name = record?.name;
-        const msg = name
-          ? (isDelete ? `${name} removed from the Shopping List` : `${name} added to the Shopping List`)
-          : 'Shopping list updated';
-        showToast(msg, 'sync', 3000);
+        if (!quiet) showToast('Shopping list updated', 'sync', 3000);
         break;
       }
     }
@@ -269,14 +448,15 @@ function cleanupRealtime() {
     clearTimeout(_reconnectTimer);
     _reconnectTimer = null;
   }
-  if (_realtimeChannel && _supabaseClient) {
-    _supabaseClient.removeChannel(_realtimeChannel);
-    _realtimeChannel = null;
+  if (_streamController) {
+    _streamController.abort();
+    _streamController = null;
   }
+  _streamVersions = null;
 }
 
 // ── Visibility Change Fallback ──────────────────────────────────────────────
-// When the user returns to the tab, refresh stale data and restart Realtime
+// When the user returns to the tab, refresh stale data and restart live sync
 // if the connection was lost while the tab was hidden.
 let _lastVisibilityReload = 0;
 const VISIBILITY_RELOAD_COOLDOWN = 10000; // 10s — tightened from 30s
@@ -289,13 +469,15 @@ function setupVisibilityReload() {
     if (document.visibilityState !== 'visible') return;
     if (!API.getToken()) return;
 
-    // Restart Realtime if the channel died while we were away and no reconnect
-    // is already queued (the pending timer will fire soon anyway if one exists)
-    if (!_realtimeChannel && !_reconnectTimer) {
+    // Restart live sync if the stream died while we were away and no reconnect
+    // is already queued (the pending timer will fire soon anyway if one exists).
+    // The new stream's hello re-fetches whatever changed meanwhile.
+    if (!_streamController && !_reconnectTimer) {
       _reconnectAttempts = 0;
       _wasDisconnected = false;
       _disconnectedAt = 0;
       initRealtime();
+      return;
     }
 
     if (Date.now() - _lastVisibilityReload < VISIBILITY_RELOAD_COOLDOWN) return;
@@ -315,6 +497,3 @@ function setupVisibilityReload() {
     }
   });
 }
-
-// Expose globally
-window.markLocalWrite = markLocalWrite;
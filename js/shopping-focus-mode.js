@@ -691,9 +691,6 @@ class ShoppingFocusMode {
 
       if (!item) return;
 
-      // Mark local write so realtime ignores our own change
-      if (window.markLocalWrite) window.markLocalWrite();
-
       if (item.id) {
         if (this._offline) {
           this._queueOfflineCheck(item.id, checked);
@@ -983,7 +980,6 @@ class ShoppingFocusMode {
     }
 
     try {
-      if (window.markLocalWrite) window.markLocalWrite();
       await API.call('/shopping-list/clear-checked', { method: 'POST' });
       if (typeof clearLocalCheckedItems === 'function') clearLocalCheckedItems();
 
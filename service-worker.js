@@ -18,7 +18,7 @@
  * - SW skips waiting, activates, controllerchange fires, app reloads cleanly
  */
 
-const CACHE_NAME = 'peachy-pantry-v9';
+const CACHE_NAME = 'peachy-pantry-v10';
 const API_CACHE = 'peachy-pantry-api-v3';
 
 const BASE_PATH = self.location.pathname.replace(/\/[^/]*$/, '');